@@ -0,0 +1,279 @@
+# ads_store.py
+"""Incremental store for the scraped ads, replacing the ever-growing master workbook.
+
+Layout under config.ADS_STORE_DIR:
+    scrape_date=YYYY-MM-DD/<batch>.parquet   new rows of one scrape batch
+    _index/<batch>.npy                       uint64 hashes of their DEDUP_KEYS
+
+Appending a batch hashes its DEDUP_KEYS, drops rows already in the index and writes
+the rest as one new file per scrape date, so nothing existing is rewritten. The index
+is kept in memory and only segments written since the last append are read; appends
+are serialized across processes by a lock file in the store. An ad is
+stored under the first scrape that saw it, which is never before its start date; a
+window starting on day D therefore only needs the partitions from D on.
+
+The master workbook is the source of truth for the ads it holds: when it changes,
+stored rows whose values differ from its row for the same DEDUP_KEYS (refreshed
+reach, GPT cluster labels, ...) are replaced by the workbook's row, in place, so
+they keep their partition and order. Stored ads the workbook lacks are kept.
+"""
+import contextlib
+import glob
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+import config
+
+PARTITION_PREFIX = "scrape_date="
+INDEX_DIRNAME = "_index"
+# Running row number across batches; keeps the original row order when reading back
+ORDER_COLUMN = "_ingest_order"
+# mtime and size of the master workbook at its last import
+MASTER_MARKER = "master_file.txt"
+LOCK_FILENAME = "ingest.lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; only this process' appends are serialized
+    fcntl = None
+
+_LOCK = threading.Lock()
+# store_dir -> (names of the index segments read, their hashes sorted)
+_index_cache = {}
+
+
+def _normalize_key(values: pd.Series) -> pd.Series:
+    """Key column as text, so ids read as int, float or str hash the same."""
+    if "date" in str(values.name).lower():
+        dates = pd.to_datetime(values, errors="coerce")
+        return dates.dt.strftime("%Y-%m-%d").fillna("")
+    return values.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+
+def dedup_hashes(df: pd.DataFrame) -> np.ndarray:
+    """uint64 hash of config.DEDUP_KEYS per row."""
+    keys = pd.DataFrame({key: _normalize_key(df[key]) for key in config.DEDUP_KEYS})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
+def _index_dir(store_dir: str) -> str:
+    return os.path.join(store_dir, INDEX_DIRNAME)
+
+
+def load_index(store_dir: str = None) -> np.ndarray:
+    """Hashes of every row already in the store."""
+    paths = sorted(glob.glob(os.path.join(_index_dir(store_dir or config.ADS_STORE_DIR), "*.npy")))
+    if not paths:
+        return np.empty(0, dtype=np.uint64)
+    return np.concatenate([np.load(p) for p in paths])
+
+
+@contextlib.contextmanager
+def _store_lock(store_dir: str):
+    """Exclusive lock on the store, across threads and processes."""
+    with _LOCK:
+        os.makedirs(store_dir, exist_ok=True)
+        with open(os.path.join(store_dir, LOCK_FILENAME), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _known_hashes(store_dir: str) -> np.ndarray:
+    """Sorted hashes of every row in the store. Call with the store locked.
+
+    Only the index segments written since the last call (by any process) are read.
+    """
+    index_dir = _index_dir(store_dir)
+    names = sorted(n for n in os.listdir(index_dir) if n.endswith(".npy")) if os.path.isdir(index_dir) else []
+    key = os.path.abspath(store_dir)
+    loaded, hashes = _index_cache.get(key, (frozenset(), np.empty(0, dtype=np.uint64)))
+    if not loaded <= set(names):
+        # Segments were removed (store rebuilt): start over
+        loaded, hashes = frozenset(), np.empty(0, dtype=np.uint64)
+    new = [n for n in names if n not in loaded]
+    if new:
+        hashes = _merge(hashes, np.concatenate([np.load(os.path.join(index_dir, n)) for n in new]))
+        loaded = loaded | set(new)
+        _index_cache[key] = (loaded, hashes)
+    return hashes
+
+
+def _merge(hashes: np.ndarray, added: np.ndarray) -> np.ndarray:
+    added = np.sort(added)
+    return np.insert(hashes, np.searchsorted(hashes, added), added)
+
+
+def _contains(hashes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values in hashes, for sorted hashes."""
+    if not len(hashes):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(hashes, values)
+    return hashes[np.minimum(pos, len(hashes) - 1)] == values
+
+
+def store_exists(store_dir: str = None) -> bool:
+    return os.path.isdir(_index_dir(store_dir or config.ADS_STORE_DIR))
+
+
+def _scrape_dates(batch: pd.DataFrame, scrape_date) -> pd.Series:
+    if scrape_date is not None:
+        return pd.Series(pd.Timestamp(scrape_date).strftime("%Y-%m-%d"), index=batch.index)
+    # Unknown scrape date (e.g. importing the old workbook): the ad's start date is the earliest it could be
+    return _normalize_key(batch["startDateFormatted"].rename("startDateFormatted"))
+
+
+def append_batch(batch: pd.DataFrame, scrape_date=None, store_dir: str = None) -> int:
+    """Append the rows of batch that are not in the store yet. Returns how many were added.
+
+    scrape_date defaults to each ad's start date.
+    """
+    store_dir = store_dir or config.ADS_STORE_DIR
+    if batch is None or batch.empty:
+        return 0
+    with _store_lock(store_dir):
+        return _append_batch(batch, scrape_date, store_dir)
+
+
+def _append_batch(batch: pd.DataFrame, scrape_date, store_dir: str) -> int:
+    hashes = dedup_hashes(batch)
+    index = _known_hashes(store_dir)
+    new = ~_contains(index, hashes)
+    # Keep the first of any duplicates within the batch as well
+    new &= ~pd.Series(hashes).duplicated().to_numpy()
+    if not new.any():
+        return 0
+
+    rows = batch[new].copy()
+    rows[ORDER_COLUMN] = np.arange(len(index), len(index) + len(rows), dtype=np.int64)
+    partitions = _scrape_dates(rows, scrape_date)
+    batch_id = f"{time.strftime('%Y%m%dT%H%M%S')}_{time.time_ns() % 1_000_000_000:09d}"
+
+    for day, part in rows.groupby(partitions, sort=True):
+        folder = os.path.join(store_dir, f"{PARTITION_PREFIX}{day or 'unknown'}")
+        os.makedirs(folder, exist_ok=True)
+        part.to_parquet(os.path.join(folder, f"{batch_id}.parquet"), index=False)
+
+    # Index last, so a failed write never hides rows; load_ads drops rows stored twice by a retry
+    os.makedirs(_index_dir(store_dir), exist_ok=True)
+    np.save(os.path.join(_index_dir(store_dir), f"{batch_id}.npy"), hashes[new])
+    key = os.path.abspath(store_dir)
+    loaded, _ = _index_cache.get(key, (frozenset(), None))
+    _index_cache[key] = (loaded | {f"{batch_id}.npy"}, _merge(index, hashes[new]))
+    return int(new.sum())
+
+
+def import_master_file(path: str = None, store_dir: str = None) -> int:
+    """Append the rows of the master workbook that are not in the store yet."""
+    return append_batch(pd.read_excel(path or config.MASTER_XLSX), store_dir=store_dir)
+
+
+def _row_hashes(df: pd.DataFrame, columns) -> np.ndarray:
+    """uint64 hash of the values of columns per row, as text so dtypes do not matter."""
+    values = pd.DataFrame({c: df[c].astype(str) if c in df.columns else "" for c in columns}, index=df.index)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def _update_rows(master: pd.DataFrame, store_dir: str) -> int:
+    """Replace stored rows that differ from master's row for the same key. Returns rows replaced.
+
+    Call with the store locked. Only the partition files holding such rows are rewritten.
+    """
+    master = master[~pd.Series(dedup_hashes(master), index=master.index).duplicated()]
+    keys = pd.Index(dedup_hashes(master))
+    values = _row_hashes(master, master.columns)
+    replaced = 0
+    for path in sorted(glob.glob(os.path.join(store_dir, f"{PARTITION_PREFIX}*", "*.parquet"))):
+        stored = pd.read_parquet(path)
+        rows = keys.get_indexer(dedup_hashes(stored))
+        found = rows >= 0
+        changed = np.zeros(len(stored), dtype=bool)
+        changed[found] = _row_hashes(stored[found], master.columns) != values[rows[found]]
+        if not changed.any():
+            continue
+        updates = master.iloc[rows[changed]].copy()
+        updates.index = stored.index[changed]
+        if ORDER_COLUMN in stored.columns:
+            updates[ORDER_COLUMN] = stored.loc[changed, ORDER_COLUMN]
+        rewritten = pd.concat([stored[~changed], updates]).sort_index()
+        tmp = f"{path}.tmp"
+        rewritten.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        replaced += int(changed.sum())
+    return replaced
+
+
+def sync_master_file(path: str = None, store_dir: str = None) -> int:
+    """Import the master workbook if it changed since the last import. Returns rows added or replaced.
+
+    New ads are appended; stored ones the workbook has different values for are
+    replaced by its rows (see the module docstring). Only stats the workbook when it
+    is unchanged, so it is cheap to call on every run. The import runs under the
+    store lock, so concurrent sessions import it once.
+    """
+    path = path or config.MASTER_XLSX
+    store_dir = store_dir or config.ADS_STORE_DIR
+    if not os.path.exists(path):
+        return 0
+    stat = os.stat(path)
+    signature = f"{stat.st_mtime_ns} {stat.st_size}"
+    marker = os.path.join(_index_dir(store_dir), MASTER_MARKER)
+
+    def imported() -> bool:
+        if not (store_exists(store_dir) and os.path.exists(marker)):
+            return False
+        with open(marker) as f:
+            return f.read() == signature
+
+    if imported():
+        return 0
+    with _store_lock(store_dir):
+        # Another session may have imported it while we waited
+        if imported():
+            return 0
+        master = pd.read_excel(path)
+        synced = _update_rows(master, store_dir) if store_exists(store_dir) else 0
+        synced += _append_batch(master, None, store_dir)
+        os.makedirs(_index_dir(store_dir), exist_ok=True)
+        with open(marker, "w") as f:
+            f.write(signature)
+    return synced
+
+
+def _partitions(store_dir: str, since=None) -> list:
+    folders = sorted(glob.glob(os.path.join(store_dir, f"{PARTITION_PREFIX}*")))
+    if since is None:
+        return folders
+    since = pd.Timestamp(since).strftime("%Y-%m-%d")
+    return [f for f in folders if os.path.basename(f)[len(PARTITION_PREFIX):] >= since]
+
+
+def store_version(since=None, store_dir: str = None) -> tuple:
+    """(file, mtime) of every partition file load_ads would read; changes when a batch lands."""
+    store_dir = store_dir or config.ADS_STORE_DIR
+    files = []
+    for folder in _partitions(store_dir, since):
+        for path in sorted(glob.glob(os.path.join(folder, "*.parquet"))):
+            files.append((path, os.path.getmtime(path)))
+    return tuple(files)
+
+
+def load_ads(since=None, store_dir: str = None) -> pd.DataFrame:
+    """Stored ads from the partitions scraped on or after since (all when None), in ingestion order."""
+    store_dir = store_dir or config.ADS_STORE_DIR
+    paths = [p for folder in _partitions(store_dir, since) for p in sorted(glob.glob(os.path.join(folder, "*.parquet")))]
+    if not paths:
+        return pd.DataFrame()
+    # Read file by file: batches may disagree on the type of sparse columns
+    df = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+    if ORDER_COLUMN in df.columns:
+        df = df.sort_values(ORDER_COLUMN, kind="stable").drop(columns=ORDER_COLUMN)
+    df = df[~pd.Series(dedup_hashes(df), index=df.index).duplicated()]
+    return df.reset_index(drop=True)
@@ -0,0 +1,126 @@
+# cards.py
+"""HTML cards for the dashboard, rendered a grid at a time.
+
+Templates are compiled once and every card is memoized on its values, so a rerun
+only formats cards whose numbers changed. card_grid sends a whole list of cards as
+one markdown element instead of one per card.
+"""
+import functools
+from string import Template
+import streamlit as st
+
+_BOX = 'border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin: 10px 0; background-color: #f9f9f9;'
+_REACH = (
+    '<div style="text-align: right;$margin">'
+    '<h3 style="margin: 0; color: #2E8B57;">$reach</h3>'
+    '<p style="margin: 0; color: #666; font-size: 12px;">reach</p>'
+    '</div>'
+)
+
+_AD_CARD = Template(
+    f'<div style="{_BOX}">'
+    '<div style="display: flex; justify-content: space-between; align-items: center;">'
+    '<div>'
+    '<h4 style="margin: 0; color: #333;">$brand</h4>'
+    '<p style="margin: 5px 0; color: #666; font-size: 14px;">'
+    '<a href="$url" target="_blank" style="color: #1E90FF; text-decoration: none;">$caption</a>'
+    '</p>'
+    '</div>'
+    f'{_REACH}'
+    '</div>'
+    '</div>'
+)
+_CLUSTER_CARD = Template(
+    f'<div style="{_BOX}">'
+    '<div style="display: flex; justify-content: space-between; align-items: $align;">'
+    '<div style="flex: 1;">'
+    '<h4 style="margin: 0; color: #333;">$cluster</h4>'
+    '<p style="margin: 5px 0; color: #666; font-size: 14px;">$ads_count ads</p>'
+    '$examples'
+    '</div>'
+    f'{_REACH}'
+    '</div>'
+    '</div>'
+)
+_EXAMPLES = Template(
+    "<div style='margin-top: 10px; padding-top: 10px; border-top: 1px solid #eee;'>"
+    "<p style='margin: 0 0 5px 0; color: #888; font-size: 12px; font-weight: bold;'>Examples:</p>"
+    "$items"
+    "</div>"
+)
+_EXAMPLE = Template("<p style='margin: 2px 0; color: #666; font-size: 12px; font-style: italic;'>• $text</p>")
+_CHANGE_CARD = Template(
+    '<div style="border: 2px solid black; padding: 20px; border-radius: 10px; margin: 10px 0;">'
+    '<h3 style="color: $color; margin: 0;">$title</h3>'
+    '<p style="color: $color; font-size: 18px; margin: 5px 0;">$change vs previous week</p>'
+    '<p style="color: gray; font-size: 14px; margin: 0;">$previous</p>'
+    '</div>'
+)
+_GRID = Template(
+    '<div style="display: grid; grid-template-columns: repeat($columns, minmax(0, 1fr)); column-gap: 1rem;">'
+    '$cards'
+    '</div>'
+)
+
+
+def get_color_for_change(change):
+    """Get color based on percentage change"""
+    if change > 0:
+        return "green"
+    elif change < 0:
+        return "red"
+    else:
+        return "black"
+
+
+@functools.lru_cache(maxsize=4096)
+def create_ad_card(brand, reach, caption, ad_id):
+    """Create a card-style display for an ad"""
+    truncated_caption = caption[:100] + "..." if len(caption) > 100 else caption
+    return _AD_CARD.substitute(
+        brand=brand,
+        url=f"https://www.facebook.com/ads/library/?id={ad_id}",
+        caption=truncated_caption,
+        reach=f"{int(reach):,}",
+        margin="",
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def create_cluster_card(cluster_name, ads_count, total_reach, rank):
+    """Create a card-style display for a cluster"""
+    return _CLUSTER_CARD.substitute(
+        align="center", cluster=cluster_name, ads_count=ads_count, examples="",
+        reach=f"{int(total_reach):,}", margin="",
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _cluster_card_with_examples(cluster_name, ads_count, total_reach, examples):
+    examples_html = ""
+    if examples:
+        examples_html = _EXAMPLES.substitute(items="".join(_EXAMPLE.substitute(text=e) for e in examples))
+    return _CLUSTER_CARD.substitute(
+        align="flex-start", cluster=cluster_name, ads_count=ads_count, examples=examples_html,
+        reach=f"{int(total_reach):,}", margin=" margin-left: 15px;",
+    )
+
+
+def create_cluster_card_with_examples(cluster_name, ads_count, total_reach, examples):
+    """Create a card-style display for a cluster with examples"""
+    return _cluster_card_with_examples(cluster_name, ads_count, total_reach, tuple(examples or ()))
+
+
+@functools.lru_cache(maxsize=4096)
+def create_change_card(title, change, previous):
+    """Week-over-week card: title (current value), change in % and a line about the previous week."""
+    return _CHANGE_CARD.substitute(
+        color=get_color_for_change(change), title=title, change=f"{change:+.1f}%", previous=previous,
+    )
+
+
+def card_grid(cards, columns=1):
+    """Render cards (HTML from the functions above) as one grid in a single markdown element."""
+    cards = list(cards)
+    if cards:
+        st.markdown(_GRID.substitute(columns=columns, cards="".join(cards)), unsafe_allow_html=True)
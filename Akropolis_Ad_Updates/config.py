@@ -18,6 +18,11 @@ else:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 TIMEZONE = "Europe/Vilnius"
+
+# === DASHBOARD WINDOWS ===
+# Last day of the analysed period (YYYY-MM-DD); None = today in TIMEZONE
+AS_OF_DATE = "2025-09-16"
+WINDOW_DAYS = 7           # current week vs the week before
 DAYS_BACK = 24            # today + yesterday
 MAX_ADS = 50
 MAX_WORKERS = 8          # number of parallel scraping threads
@@ -26,10 +31,12 @@ MAX_WORKERS = 8          # number of parallel scraping threads
 if STREAMLIT_HOSTING:
     # Streamlit Cloud - direct repository root deployment
     MASTER_XLSX = "./data/ads_master_file.xlsx"
+    ADS_STORE_DIR = "./data/ads_store"
     SUMMARIES_XLSX = "./data/summaries.xlsx"
 else:
     # Local development - "Akropolis_Ad_Updates" folder structure
     MASTER_XLSX = "./Akropolis_Ad_Updates/data/ads_master_file.xlsx"
+    ADS_STORE_DIR = "./Akropolis_Ad_Updates/data/ads_store"
     SUMMARIES_XLSX = "./Akropolis_Ad_Updates/data/summaries.xlsx"
 
 # === GPT Labeling Configuration ===
@@ -2,7 +2,7 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from datetime import datetime, timedelta
+from datetime import timedelta
 import numpy as np
 
 st.set_page_config(page_title="Ad Intelligence – Last 7 Days", layout="wide")
@@ -41,12 +41,35 @@ SUBSETS_WITH_RETAIL = {
 
 # ---- Load data from master file ----
 import config
+import ads_store
+from comparison import compare_windows, CURRENT, PREVIOUS
+from windows import default_as_of, period_windows, sort_by_date, split_windows, PERIOD
+from ranking import top_ads, top_clusters, cluster_comparison, OVERALL, BY_BRAND
+from cards import create_ad_card, create_cluster_card, create_cluster_card_with_examples, create_change_card, card_grid
 MASTER_FILE_PATH = config.MASTER_XLSX
 
+COMPARISON_METRICS = {"ads": ("ad_id", "nunique"), "reach": ("reach", "sum")}
+
+def ads_version():
+    """Bring the ingestion store up to date with the master file and return its version."""
+    try:
+        ads_store.sync_master_file(MASTER_FILE_PATH)
+    except ImportError:
+        # No Parquet engine installed; load_data reads the workbook instead
+        return None
+    return ads_store.store_version()
+
+def read_ads(since, version):
+    """Ads scraped on or after since, from the ingestion store (or the master file without one)"""
+    if version is None:
+        return pd.read_excel(MASTER_FILE_PATH)
+    return ads_store.load_ads(since=since)
+
 @st.cache_data(show_spinner=False)
-def load_data():
-    """Load and process data from the master file for September 3–16, 2025"""
-    df = pd.read_excel(MASTER_FILE_PATH)
+def load_data(version=None, since=None):
+    """Load and process the ads scraped on or after since, sorted by start date"""
+    # Only the store partitions that can hold ads from the analysed period are read
+    df = read_ads(since, version)
 
     # Rename columns
     df = df.rename(columns={
@@ -59,137 +82,42 @@ def load_data():
 
     df["date"] = pd.to_datetime(df["start_date"], errors="coerce")
     df["reach"] = pd.to_numeric(df["reach"], errors="coerce").fillna(0)
+    return sort_by_date(df)
 
-    # --- fixed inclusive bounds ---
-    start_date_fixed = datetime(2025, 9, 3).date()
-    end_date_fixed   = datetime(2025, 9, 16).date()
-
-    # define comparison windows inside that period
-    prev_7_days_start = datetime(2025, 9, 3).date()
-    prev_7_days_end   = datetime(2025, 9, 9).date()
-    current_7_days_start = datetime(2025, 9, 10).date()
-    current_7_days_end   = datetime(2025, 9, 16).date()
-
-    # full 3–16 range for overall 14-day analysis
-    df_14_days = df[
-        (df["date"].dt.date >= start_date_fixed)
-        & (df["date"].dt.date <= end_date_fixed)
-    ].copy()
 
-    # comparison subsets
-    df_previous = df[
-        (df["date"].dt.date >= prev_7_days_start)
-        & (df["date"].dt.date <= prev_7_days_end)
-    ].copy()
-
-    df_current = df[
-        (df["date"].dt.date >= current_7_days_start)
-        & (df["date"].dt.date <= current_7_days_end)
-    ].copy()
+@st.cache_data(show_spinner=False)
+def load_windows(version, as_of, days=config.WINDOW_DAYS):
+    """Period of 2 x days ending on as_of (inclusive), split into previous and current windows.
 
-    return df_14_days, df_current, df_previous, start_date_fixed, end_date_fixed
+    Cached per (data version, as_of, days); calling it ahead of time pre-warms a window.
+    """
+    since = period_windows(as_of, days)[PERIOD].left
+    return split_windows(load_data(version, since), as_of, days)
 
 
-def calculate_comparison_stats(current_df, previous_df, akropolis_brands):
+def calculate_comparison_stats(df, akropolis_brands, windows):
     """Calculate comparison statistics between current and previous week"""
-    # Current week stats for Akropolis brands
-    current_akropolis = current_df[current_df["brand"].isin(akropolis_brands)]
-    current_ads = current_akropolis["ad_id"].nunique()
-    current_reach = current_akropolis["reach"].sum()
-    
-    # Previous week stats for Akropolis brands
-    previous_akropolis = previous_df[previous_df["brand"].isin(akropolis_brands)]
-    previous_ads = previous_akropolis["ad_id"].nunique()
-    previous_reach = previous_akropolis["reach"].sum()
-    
-    # Calculate percentage changes
-    ads_change = ((current_ads - previous_ads) / previous_ads * 100) if previous_ads > 0 else 0
-    reach_change = ((current_reach - previous_reach) / previous_reach * 100) if previous_reach > 0 else 0
-    
+    akropolis = df[df["brand"].isin(akropolis_brands)]
+    stats = compare_windows(
+        akropolis, "date", windows, COMPARISON_METRICS, by=None, change_from_zero=0
+    )
+    ads = stats["ads"].reindex(["All"], fill_value=0).iloc[0]
+    reach = stats["reach"].reindex(["All"], fill_value=0).iloc[0]
+
     return {
-        "current_ads": current_ads,
-        "current_reach": current_reach,
-        "previous_ads": previous_ads,
-        "previous_reach": previous_reach,
-        "ads_change": ads_change,
-        "reach_change": reach_change
+        "current_ads": int(ads["current"]),
+        "current_reach": reach["current"],
+        "previous_ads": int(ads["previous"]),
+        "previous_reach": reach["previous"],
+        "ads_change": ads["change_pct"],
+        "reach_change": reach["change_pct"]
     }
 
-def get_color_for_change(change):
-    """Get color based on percentage change"""
-    if change > 0:
-        return "green"
-    elif change < 0:
-        return "red"
-    else:
-        return "black"
-
-def create_ad_card(brand, reach, caption, ad_id):
-    """Create a card-style display for an ad"""
-    truncated_caption = caption[:100] + "..." if len(caption) > 100 else caption
-    ad_url = f"https://www.facebook.com/ads/library/?id={ad_id}"
-    return f"""
-    <div style="border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin: 10px 0; background-color: #f9f9f9;">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <h4 style="margin: 0; color: #333;">{brand}</h4>
-                <p style="margin: 5px 0; color: #666; font-size: 14px;">
-                    <a href="{ad_url}" target="_blank" style="color: #1E90FF; text-decoration: none;">{truncated_caption}</a>
-                </p>
-            </div>
-            <div style="text-align: right;">
-                <h3 style="margin: 0; color: #2E8B57;">{int(reach):,}</h3>
-                <p style="margin: 0; color: #666; font-size: 12px;">reach</p>
-            </div>
-        </div>
-    </div>
-    """
-
-def create_cluster_card(cluster_name, ads_count, total_reach, rank):
-    """Create a card-style display for a cluster"""
-    return f"""
-    <div style="border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin: 10px 0; background-color: #f9f9f9;">
-        <div style="display: flex; justify-content: space-between; align-items: center;">
-            <div>
-                <h4 style="margin: 0; color: #333;">{cluster_name}</h4>
-                <p style="margin: 5px 0; color: #666; font-size: 14px;">{ads_count} ads</p>
-            </div>
-            <div style="text-align: right;">
-                <h3 style="margin: 0; color: #2E8B57;">{int(total_reach):,}</h3>
-                <p style="margin: 0; color: #666; font-size: 12px;">reach</p>
-            </div>
-        </div>
-    </div>
-    """
-
-def create_cluster_card_with_examples(cluster_name, ads_count, total_reach, examples):
-    """Create a card-style display for a cluster with examples"""
-    examples_html = ""
-    if examples:
-        examples_html = "<div style='margin-top: 10px; padding-top: 10px; border-top: 1px solid #eee;'>"
-        examples_html += "<p style='margin: 0 0 5px 0; color: #888; font-size: 12px; font-weight: bold;'>Examples:</p>"
-        for example in examples:
-            examples_html += f"<p style='margin: 2px 0; color: #666; font-size: 12px; font-style: italic;'>• {example}</p>"
-        examples_html += "</div>"
-    
-    return f"""
-    <div style="border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin: 10px 0; background-color: #f9f9f9;">
-        <div style="display: flex; justify-content: space-between; align-items: flex-start;">
-            <div style="flex: 1;">
-                <h4 style="margin: 0; color: #333;">{cluster_name}</h4>
-                <p style="margin: 5px 0; color: #666; font-size: 14px;">{ads_count} ads</p>
-                {examples_html}
-            </div>
-            <div style="text-align: right; margin-left: 15px;">
-                <h3 style="margin: 0; color: #2E8B57;">{int(total_reach):,}</h3>
-                <p style="margin: 0; color: #666; font-size: 12px;">reach</p>
-            </div>
-        </div>
-    </div>
-    """
-
-# Load data
-df_14_days, df_current, df_previous, start_date, end_date = load_data()
+# Load data for the period ending on the selected day
+as_of = st.sidebar.date_input("Analysis end date", value=default_as_of())
+ad_windows = load_windows(ads_version(), as_of)
+df_14_days, df_current, df_previous = ad_windows[PERIOD], ad_windows[CURRENT], ad_windows[PREVIOUS]
+start_date, end_date = ad_windows["start"], ad_windows["end"]
 
 # Load summaries if available
 @st.cache_data(show_spinner=False)
@@ -209,7 +137,7 @@ def load_summaries():
 summaries = load_summaries()
 
 # ---- UI controls ----
-st.title("Brand Intelligence – Last 14 Days Analysis")
+st.title(f"Brand Intelligence – Last {2 * config.WINDOW_DAYS} Days Analysis")
 
 # Date range display
 st.caption(f"Analysis period: {start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}")
@@ -243,59 +171,32 @@ all_brands = sorted(list(brands_universe))
 # Create tabs for each brand
 if all_brands:
     performance_tabs = st.tabs(all_brands)
+
+    # Both weeks for every brand in one pass; 100% increase when the previous week had nothing
+    brand_stats = compare_windows(
+        df_14_days[df_14_days["brand"].isin(brands_universe)],
+        "date",
+        ad_windows["windows"],
+        COMPARISON_METRICS,
+        change_from_zero=100,
+    )
+    ads_stats = brand_stats["ads"].reindex(all_brands, fill_value=0)
+    reach_stats = brand_stats["reach"].reindex(all_brands, fill_value=0)
     
     for i, brand in enumerate(all_brands):
         with performance_tabs[i]:
-            # Calculate stats for this specific brand
-            brand_current = df_current[df_current["brand"] == brand]
-            brand_previous = df_previous[df_previous["brand"] == brand]
-            
-            current_ads = brand_current["ad_id"].nunique()
-            current_reach = brand_current["reach"].sum()
-            previous_ads = brand_previous["ad_id"].nunique()
-            previous_reach = brand_previous["reach"].sum()
-            
-            # Calculate percentage changes - handle 0 previous week case
-            if previous_ads > 0:
-                ads_change = ((current_ads - previous_ads) / previous_ads * 100)
-            elif current_ads > 0:
-                ads_change = 100  # 100% increase from 0
-            else:
-                ads_change = 0  # Both are 0
-            
-            if previous_reach > 0:
-                reach_change = ((current_reach - previous_reach) / previous_reach * 100)
-            elif current_reach > 0:
-                reach_change = 100  # 100% increase from 0
-            else:
-                reach_change = 0  # Both are 0
+            current_ads = int(ads_stats.at[brand, "current"])
+            previous_ads = int(ads_stats.at[brand, "previous"])
+            ads_change = ads_stats.at[brand, "change_pct"]
+            current_reach = reach_stats.at[brand, "current"]
+            previous_reach = reach_stats.at[brand, "previous"]
+            reach_change = reach_stats.at[brand, "change_pct"]
             
             # Create comparison cards for this brand
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                ads_color = get_color_for_change(ads_change)
-                st.markdown(f"""
-                <div style="border: 2px solid black; padding: 20px; border-radius: 10px; margin: 10px 0;">
-                    <h3 style="color: {ads_color}; margin: 0;">📈 Total Ads: {current_ads}</h3>
-                    <p style="color: {ads_color}; font-size: 18px; margin: 5px 0;">
-                        {ads_change:+.1f}% vs previous week
-                    </p>
-                    <p style="color: gray; font-size: 14px; margin: 0;">Previous week: {previous_ads} ads</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                reach_color = get_color_for_change(reach_change)
-                st.markdown(f"""
-                <div style="border: 2px solid black; padding: 20px; border-radius: 10px; margin: 10px 0;">
-                    <h3 style="color: {reach_color}; margin: 0;">👥 Total Reach: {int(current_reach):,}</h3>
-                    <p style="color: {reach_color}; font-size: 18px; margin: 5px 0;">
-                        {reach_change:+.1f}% vs previous week
-                    </p>
-                    <p style="color: gray; font-size: 14px; margin: 0;">Previous week: {int(previous_reach):,} reach</p>
-                </div>
-                """, unsafe_allow_html=True)
+            card_grid([
+                create_change_card(f"📈 Total Ads: {current_ads}", ads_change, f"Previous week: {previous_ads} ads"),
+                create_change_card(f"👥 Total Reach: {int(current_reach):,}", reach_change, f"Previous week: {int(previous_reach):,} reach"),
+            ], columns=2)
             
             # Show info if no data available
             if current_ads == 0 and previous_ads == 0:
@@ -353,7 +254,7 @@ brands_universe = set(ak_selected) | set(SUBSETS_WITH_RETAIL.get(subset_name, []
 df_f = df_14_days[df_14_days["brand"].isin(brands_universe)].copy()
 df_f_current = df_current[df_current["brand"].isin(brands_universe)].copy()
 
-st.subheader("Ad Intelligence (Last 14 Days)")
+st.subheader(f"Ad Intelligence (Last {2 * config.WINDOW_DAYS} Days)")
 st.caption(
     f"{df_f['brand'].nunique()} brands · {df_f['ad_id'].nunique()} ads · {int(df_f['reach'].sum()):,} total reach"
 )
@@ -384,7 +285,7 @@ with tab1:
     daily_ads["date"] = pd.to_datetime(daily_ads["date_only"])
     
     if daily_ads.empty:
-        st.info("No ads found for these brands in the last 14 days.")
+        st.info(f"No ads found for these brands in the last {2 * config.WINDOW_DAYS} days.")
     else:
         # Choose chart type based on selection
         if chart_type == "Bar Chart":
@@ -425,7 +326,7 @@ with tab2:
     daily_reach["date"] = pd.to_datetime(daily_reach["date_only"])
     
     if daily_reach.empty:
-        st.info("No reach data found for these brands in the last 14 days.")
+        st.info(f"No reach data found for these brands in the last {2 * config.WINDOW_DAYS} days.")
     else:
         # Choose chart type based on selection
         if chart_type == "Bar Chart":
@@ -456,141 +357,63 @@ with tab2:
 
 # ---- 2) Top 3 ads by reach ----
 st.markdown("#### Top 3 Ads by Reach")
-ad_rollup = (
-    df_f.groupby(["ad_id", "brand"], as_index=False)
-    .agg(reach=("reach", "max"), caption=("caption", "first"))
-)
+ad_ranking = top_ads(df_f)
 
-if ad_rollup.empty:
+if not ad_ranking[OVERALL]:
     st.info("No ads to show.")
 else:
-    brands_in_view = sorted(ad_rollup["brand"].unique())
+    brands_in_view = list(ad_ranking[BY_BRAND])
     tabs = st.tabs(["Overall"] + brands_in_view)
     
-    def top3(d):
-        return d.sort_values("reach", ascending=False).head(3).reset_index(drop=True)
-    
-    with tabs[0]:
-        top3_overall = top3(ad_rollup)
-        for idx, row in top3_overall.iterrows():
-            st.markdown(create_ad_card(row["brand"], row["reach"], row["caption"], row["ad_id"]), unsafe_allow_html=True)
-    
-    for i, b in enumerate(brands_in_view, start=1):
-        with tabs[i]:
-            top3_brand = top3(ad_rollup[ad_rollup["brand"] == b])
-            for idx, row in top3_brand.iterrows():
-                st.markdown(create_ad_card(row["brand"], row["reach"], row["caption"], row["ad_id"]), unsafe_allow_html=True)
+    for tab, ads in zip(tabs, [ad_ranking[OVERALL]] + list(ad_ranking[BY_BRAND].values())):
+        with tab:
+            card_grid(create_ad_card(ad["brand"], ad["reach"], ad["caption"], ad["ad_id"]) for ad in ads)
 
 # ---- 3) Top 3 clusters by reach ----
 st.markdown("#### Top 3 Clusters by Reach")
+cluster_ranking = top_clusters(df_f)
 
-# Filter for ads with cluster_1 data
-df_with_clusters = df_f[df_f["cluster_1"].notna() & (df_f["cluster_1"] != "")]
-
-if df_with_clusters.empty:
+if not cluster_ranking[OVERALL]:
     st.info("No cluster data available.")
 else:
-    cluster_rollup = (
-        df_with_clusters.groupby(["cluster_1", "brand"], as_index=False)
-        .agg(
-            ads_count=("ad_id", "nunique"),
-            total_reach=("reach", "sum")
-        )
-    )
-    
-    brands_with_clusters = sorted(cluster_rollup["brand"].unique())
+    brands_with_clusters = list(cluster_ranking[BY_BRAND])
     cluster_tabs = st.tabs(["Overall"] + brands_with_clusters)
     
-    def top3_clusters(d):
-        return d.sort_values("total_reach", ascending=False).head(3).reset_index(drop=True)
-    
-    with cluster_tabs[0]:
-        top3_clusters_overall = top3_clusters(cluster_rollup)
-        for idx, row in top3_clusters_overall.iterrows():
-            st.markdown(create_cluster_card(row["cluster_1"], row["ads_count"], row["total_reach"], 0), unsafe_allow_html=True)
-    
-    for i, b in enumerate(brands_with_clusters, start=1):
-        with cluster_tabs[i]:
-            top3_clusters_brand = top3_clusters(cluster_rollup[cluster_rollup["brand"] == b])
-            for idx, row in top3_clusters_brand.iterrows():
-                st.markdown(create_cluster_card(row["cluster_1"], row["ads_count"], row["total_reach"], 0), unsafe_allow_html=True)
+    for tab, clusters in zip(cluster_tabs, [cluster_ranking[OVERALL]] + list(cluster_ranking[BY_BRAND].values())):
+        with tab:
+            card_grid(create_cluster_card(c["cluster_1"], c["ads_count"], c["total_reach"], 0) for c in clusters)
 
 # ---- 4) Top 3 ad clusters comparison ----
 st.markdown("#### Top 3 Ad Clusters: This Week vs Previous Week")
 
-# Current week clusters
-df_current_clusters = df_current[df_current["brand"].isin(brands_universe)]
-df_current_clusters = df_current_clusters[df_current_clusters["cluster_1"].notna() & (df_current_clusters["cluster_1"] != "")]
+cluster_windows = cluster_comparison({
+    CURRENT: df_current[df_current["brand"].isin(brands_universe)],
+    PREVIOUS: df_previous[df_previous["brand"].isin(brands_universe)],
+})
 
-# Previous week clusters
-df_prev_clusters = df_previous[df_previous["brand"].isin(brands_universe)]
-df_prev_clusters = df_prev_clusters[df_prev_clusters["cluster_1"].notna() & (df_prev_clusters["cluster_1"] != "")]
+def show_cluster_cards(clusters, empty_message):
+    if clusters:
+        card_grid(create_cluster_card_with_examples(c["cluster_1"], c["ads_count"], c["total_reach"], c["examples"]) for c in clusters)
+    else:
+        st.info(empty_message)
 
-if df_current_clusters.empty and df_prev_clusters.empty:
+if not cluster_windows[CURRENT][OVERALL] and not cluster_windows[PREVIOUS][OVERALL]:
     st.info("No cluster data available for comparison.")
 else:
     # Create comparison tabs
-    comparison_brands = sorted(set(df_current_clusters["brand"].unique()) | set(df_prev_clusters["brand"].unique()))
+    comparison_brands = sorted(set(cluster_windows[CURRENT][BY_BRAND]) | set(cluster_windows[PREVIOUS][BY_BRAND]))
     comparison_tabs = st.tabs(["Overall"] + comparison_brands)
     
-    def get_top_clusters_with_examples(df, brand_filter=None):
-        if brand_filter:
-            df_filtered = df[df["brand"] == brand_filter]
-        else:
-            df_filtered = df
-        
-        cluster_stats = (
-            df_filtered.groupby("cluster_1", as_index=False)
-            .agg(
-                ads_count=("ad_id", "nunique"),
-                total_reach=("reach", "sum")
-            )
-            .sort_values("ads_count", ascending=False)
-            .head(3)
-        )
-        
-        # Add examples for each cluster
-        cluster_examples = []
-        for _, row in cluster_stats.iterrows():
-            cluster_name = row["cluster_1"]
-            # Get up to 2 examples from ad_summary for this cluster
-            examples = (
-                df_filtered[df_filtered["cluster_1"] == cluster_name]
-                ["ad_summary"]
-                .dropna()
-                .head(2)
-                .tolist()
-            )
-            cluster_examples.append(examples)
-        
-        cluster_stats["examples"] = cluster_examples
-        
-        if not cluster_stats.empty:
-            total_ads = df_filtered["ad_id"].nunique()
-            cluster_stats["percentage"] = (cluster_stats["ads_count"] / total_ads * 100).round(1)
-        
-        return cluster_stats
-    
     with comparison_tabs[0]:
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("**This Week**")
-            current_overall = get_top_clusters_with_examples(df_current_clusters)
-            if not current_overall.empty:
-                for idx, row in current_overall.iterrows():
-                    st.markdown(create_cluster_card_with_examples(row["cluster_1"], row["ads_count"], row["total_reach"], row["examples"]), unsafe_allow_html=True)
-            else:
-                st.info("No data for this week")
+            show_cluster_cards(cluster_windows[CURRENT][OVERALL], "No data for this week")
         
         with col2:
             st.markdown("**Previous Week**")
-            prev_overall = get_top_clusters_with_examples(df_prev_clusters)
-            if not prev_overall.empty:
-                for idx, row in prev_overall.iterrows():
-                    st.markdown(create_cluster_card_with_examples(row["cluster_1"], row["ads_count"], row["total_reach"], row["examples"]), unsafe_allow_html=True)
-            else:
-                st.info("No data for previous week")
+            show_cluster_cards(cluster_windows[PREVIOUS][OVERALL], "No data for previous week")
     
     for i, b in enumerate(comparison_brands, start=1):
         with comparison_tabs[i]:
@@ -598,21 +421,11 @@ else:
             
             with col1:
                 st.markdown(f"**{b} - This Week**")
-                current_brand = get_top_clusters_with_examples(df_current_clusters, b)
-                if not current_brand.empty:
-                    for idx, row in current_brand.iterrows():
-                        st.markdown(create_cluster_card_with_examples(row["cluster_1"], row["ads_count"], row["total_reach"], row["examples"]), unsafe_allow_html=True)
-                else:
-                    st.info("No data for this week")
+                show_cluster_cards(cluster_windows[CURRENT][BY_BRAND].get(b, []), "No data for this week")
             
             with col2:
                 st.markdown(f"**{b} - Previous Week**")
-                prev_brand = get_top_clusters_with_examples(df_prev_clusters, b)
-                if not prev_brand.empty:
-                    for idx, row in prev_brand.iterrows():
-                        st.markdown(create_cluster_card_with_examples(row["cluster_1"], row["ads_count"], row["total_reach"], row["examples"]), unsafe_allow_html=True)
-                else:
-                    st.info("No data for previous week")
+                show_cluster_cards(cluster_windows[PREVIOUS][BY_BRAND].get(b, []), "No data for previous week")
 
 # ---- Optional totals by brand ----
 with st.expander("Totals by brand"):
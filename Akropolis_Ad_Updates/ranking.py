@@ -0,0 +1,109 @@
+# ranking.py
+"""Top-k ads and clusters for the dashboard cards.
+
+Every ranking is built for all brands at once: one groupby rollup, one stable sort,
+then head(k) for the overall list and groupby(...).head(k) for the per-brand lists.
+Rankings come back as {OVERALL: [record, ...], BY_BRAND: {brand: [record, ...]}}
+with brands sorted, so the cards render straight from the records.
+"""
+import pandas as pd
+
+OVERALL = "overall"
+BY_BRAND = "by_brand"
+
+CLUSTER_COLUMN = "cluster_1"
+AD_FIELDS = ["brand", "reach", "caption", "ad_id"]
+CLUSTER_FIELDS = [CLUSTER_COLUMN, "brand", "ads_count", "total_reach"]
+
+
+def with_clusters(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows that have a cluster_1 label."""
+    return df[df[CLUSTER_COLUMN].notna() & (df[CLUSTER_COLUMN] != "")]
+
+
+def _records(rows: pd.DataFrame, fields: list) -> list:
+    return rows[fields].to_dict("records")
+
+
+def _by_brand(rows: pd.DataFrame, fields: list) -> dict:
+    return {brand: _records(group, fields) for brand, group in rows.groupby("brand", sort=True)}
+
+
+def _ranking(table: pd.DataFrame, value: str, fields: list, k: int) -> dict:
+    """Top k rows of table by value, overall and per brand; ties keep the table order."""
+    ranked = table.sort_values(value, ascending=False, kind="stable")
+    return {
+        OVERALL: _records(ranked.head(k), fields),
+        BY_BRAND: _by_brand(ranked.groupby("brand", sort=False).head(k), fields),
+    }
+
+
+def top_ads(df: pd.DataFrame, k: int = 3) -> dict:
+    """Top k ads by reach (their highest reach seen), overall and per brand.
+
+    Records have brand, reach, caption and ad_id.
+    """
+    ads = (
+        df.groupby(["ad_id", "brand"], as_index=False)
+        .agg(reach=("reach", "max"), caption=("caption", "first"))
+    )
+    return _ranking(ads, "reach", AD_FIELDS, k)
+
+
+def top_clusters(df: pd.DataFrame, k: int = 3) -> dict:
+    """Top k (cluster, brand) pairs by total reach, overall and per brand.
+
+    Records have cluster_1, brand, ads_count and total_reach.
+    """
+    clusters = (
+        with_clusters(df).groupby([CLUSTER_COLUMN, "brand"], as_index=False)
+        .agg(ads_count=("ad_id", "nunique"), total_reach=("reach", "sum"))
+    )
+    return _ranking(clusters, "total_reach", CLUSTER_FIELDS, k)
+
+
+def _cluster_stats(rows: pd.DataFrame, keys: list, k: int, examples: int) -> pd.DataFrame:
+    """Top k clusters by ad count per keys group, with the first examples ad summaries of each."""
+    stats = (
+        rows.groupby(keys + [CLUSTER_COLUMN], as_index=False)
+        .agg(ads_count=("ad_id", "nunique"), total_reach=("reach", "sum"))
+        .sort_values("ads_count", ascending=False, kind="stable")
+        .groupby(keys, sort=False)
+        .head(k)
+    )
+    summaries = rows[rows["ad_summary"].notna()]
+    samples = (
+        summaries.groupby(keys + [CLUSTER_COLUMN], sort=False).head(examples)
+        .groupby(keys + [CLUSTER_COLUMN])["ad_summary"].agg(list)
+        .rename("examples")
+    )
+    stats = stats.join(samples, on=keys + [CLUSTER_COLUMN])
+    stats["examples"] = [e if isinstance(e, list) else [] for e in stats["examples"]]
+    return stats
+
+
+def cluster_comparison(windows: dict, k: int = 3, examples: int = 2) -> dict:
+    """Top k clusters by ad count in each window, overall and per brand, in one grouped pass.
+
+    Args:
+        windows: dict[window name] = ads of that window (rows without a cluster are ignored)
+        k: Clusters per list
+        examples: Ad summaries kept per cluster
+
+    Returns dict[window name] = {OVERALL: records, BY_BRAND: {brand: records}}; records have
+    cluster_1, ads_count, total_reach and examples (list of ad summaries).
+    """
+    fields = [CLUSTER_COLUMN, "ads_count", "total_reach", "examples"]
+    rows = pd.concat(
+        {name: with_clusters(df) for name, df in windows.items()}, names=["window"]
+    ).reset_index(level="window")
+    overall = _cluster_stats(rows, ["window"], k, examples)
+    per_brand = _cluster_stats(rows, ["window", "brand"], k, examples)
+
+    result = {}
+    for name in windows:
+        result[name] = {
+            OVERALL: _records(overall[overall["window"] == name], fields),
+            BY_BRAND: _by_brand(per_brand[per_brand["window"] == name], fields),
+        }
+    return result
@@ -0,0 +1,60 @@
+# windows.py
+"""Rolling analysis windows: the period ending on an "as of" day, split into two equal windows."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+
+import config
+from comparison import CURRENT, PREVIOUS, rolling_windows
+
+PERIOD = "period"
+
+
+def default_as_of():
+    """Last day of the analysed period: config.AS_OF_DATE, or today in config.TIMEZONE."""
+    if config.AS_OF_DATE:
+        return pd.Timestamp(config.AS_OF_DATE).date()
+    return datetime.now(ZoneInfo(config.TIMEZONE)).date()
+
+
+def period_windows(as_of, days: int = 7) -> dict:
+    """dict with the current window (the `days` days ending on as_of), the previous one and the whole period."""
+    windows = rolling_windows(as_of, days)
+    windows[PERIOD] = pd.Interval(windows[PREVIOUS].left, windows[CURRENT].right, closed="left")
+    return windows
+
+
+def sort_by_date(df: pd.DataFrame, date_col: str = "date") -> pd.DataFrame:
+    """df sorted by date (NaT last), keeping its index so slices can be put back in the original order."""
+    return df.sort_values(date_col, kind="stable", na_position="last")
+
+
+def slice_window(df_sorted: pd.DataFrame, interval: pd.Interval, date_col: str = "date") -> pd.DataFrame:
+    """Rows of a frame from sort_by_date inside a left-closed interval, in their original order.
+
+    Two binary searches on the sorted datetime64 values; no per-row comparisons.
+    """
+    dates = df_sorted[date_col].to_numpy(dtype="datetime64[ns]")
+    # NaT rows are sorted last and belong to no window
+    valid = len(dates) - int(np.isnat(dates).sum())
+    lo, hi = np.searchsorted(
+        dates[:valid],
+        [np.datetime64(interval.left, "ns"), np.datetime64(interval.right, "ns")],
+        side="left",
+    )
+    return df_sorted.iloc[lo:hi].sort_index()
+
+
+def split_windows(df_sorted: pd.DataFrame, as_of, days: int = 7, date_col: str = "date") -> dict:
+    """Period, current and previous rows for as_of, plus the period's first and last day.
+
+    Returns dict with PERIOD / CURRENT / PREVIOUS frames, 'windows' (the intervals for
+    comparison.compare_windows), 'start' and 'end' (dates, both included).
+    """
+    windows = period_windows(as_of, days)
+    split = {name: slice_window(df_sorted, interval, date_col) for name, interval in windows.items()}
+    split["windows"] = {CURRENT: windows[CURRENT], PREVIOUS: windows[PREVIOUS]}
+    split["start"] = windows[PERIOD].left.date()
+    split["end"] = (windows[PERIOD].right - pd.Timedelta(days=1)).date()
+    return split
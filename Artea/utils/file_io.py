@@ -1,12 +1,13 @@
 import os
 import pandas as pd
 import streamlit as st
+from utils.frame_cache import cached_frames
 from utils.config import DATA_ROOT  # <-- import here
 
 # ------------------------
 # 📄 Load Agility (News)
 # ------------------------
-@st.cache_data
+@cached_frames
 def load_agility_data(company_name: str):
     path = os.path.join(DATA_ROOT, "agility", f"{company_name.lower()}_agility.xlsx")
     if not os.path.exists(path):
@@ -32,7 +33,7 @@ def load_agility_data(company_name: str):
 # 📱 Load Social Media Data
 # ------------------------
 
-@st.cache_data
+@cached_frames
 def load_social_data(company_name: str, platform: str, use_consolidated: bool = True):
 	"""Load Facebook or LinkedIn file for a company, normalize date format.
 	
@@ -137,7 +138,7 @@ def load_all_social_data(brands, platform: str, use_consolidated: bool = False):
 # 📢 Load Ads Intelligence data
 # ------------------------
 
-@st.cache_data
+@cached_frames
 def load_ads_data():
 	"""
 	Load ads scraping Excel and normalize key fields.
@@ -0,0 +1,106 @@
+# utils/topics.py
+import numpy as np
+import pandas as pd
+
+TOPIC_COLUMNS = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
+
+
+def _group_codes(df: pd.DataFrame, by):
+    """Integer group code per row plus the group labels, in order of first appearance."""
+    if by is None:
+        return np.zeros(len(df), dtype=np.intp), pd.Index(["All"])
+    if isinstance(by, (list, tuple)):
+        codes, groups = pd.MultiIndex.from_frame(df[list(by)]).factorize()
+        return codes, groups.set_names(list(by))
+    codes, groups = pd.factorize(df[by])
+    return codes, pd.Index(groups, name=by)
+
+
+def topic_counts(df: pd.DataFrame, by=None, weight=None, columns=TOPIC_COLUMNS) -> pd.DataFrame:
+    """Count topic mentions across the cluster topic columns in one vectorized pass.
+
+    Args:
+        df: Articles with one or more topic columns
+        by: Optional column name (or list of names) to count per group
+        weight: Optional numeric column (e.g. 'Impressions', 'BMQ') to sum instead of counting
+        columns: Topic columns to stack
+
+    Returns a Topic x group matrix. Topics are stripped, empty values are ignored and
+    rows are in order of first mention, so ties keep a stable order.
+    """
+    present = [c for c in columns if c in df.columns]
+    group_codes, groups = _group_codes(df, by)
+    if not present or df.empty:
+        return pd.DataFrame(0, index=pd.Index([], name="Topic"), columns=groups)
+
+    # Column-major stacking: every row's Topic1, then every row's Topic2, ...
+    stacked = pd.Series(df[present].to_numpy(dtype=object).ravel(order="F"))
+    valid = stacked.notna().to_numpy()
+    topics = stacked[valid].astype(str).str.strip()
+    keep = (topics != "").to_numpy()
+    topics = topics[keep]
+
+    codes, uniques = pd.factorize(topics)
+    rows = np.tile(group_codes, len(present))[valid][keep]
+    if weight is not None:
+        weights = pd.to_numeric(df[weight], errors="coerce").fillna(0).to_numpy(dtype=float)
+        weights = np.tile(weights, len(present))[valid][keep]
+    else:
+        weights = None
+
+    n_topics = len(uniques)
+    flat = codes * len(groups) + rows
+    counts = np.bincount(flat, weights=weights, minlength=n_topics * len(groups)).reshape(n_topics, len(groups))
+    if weights is None:
+        counts = counts.astype(np.int64)
+    return pd.DataFrame(counts, index=pd.Index(uniques, name="Topic"), columns=groups)
+
+
+def count_topics(frames: dict, weight=None, columns=TOPIC_COLUMNS) -> pd.DataFrame:
+    """Topic x brand matrix for dict[brand] = DataFrame, counted in one pass."""
+    parts = []
+    for brand, df in frames.items():
+        present = [c for c in columns if c in df.columns]
+        part = df[present + ([weight] if weight is not None else [])].copy()
+        part["__brand__"] = brand
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(index=pd.Index([], name="Topic"))
+    counts = topic_counts(pd.concat(parts, ignore_index=True), by="__brand__", weight=weight, columns=columns)
+    counts.columns.name = None
+    return counts.reindex(columns=list(frames.keys()), fill_value=0)
+
+
+def merge_topic_counts(*matrices: pd.DataFrame) -> pd.DataFrame:
+    """Merge count matrices from batches of brands, keeping first-seen topic order.
+
+    Brands present in several batches are summed.
+    """
+    merged = None
+    for matrix in matrices:
+        if merged is None:
+            merged = matrix.copy()
+            continue
+        topics = merged.index.append(matrix.index[~matrix.index.isin(merged.index)])
+        brands = list(merged.columns) + [b for b in matrix.columns if b not in merged.columns]
+        merged = merged.reindex(index=topics, columns=brands, fill_value=0).add(
+            matrix.reindex(index=topics, columns=brands, fill_value=0)
+        )
+    if merged is None:
+        return pd.DataFrame(index=pd.Index([], name="Topic"))
+    return merged
+
+
+def top_topics(counts: pd.DataFrame, k: int = 5) -> dict:
+    """Top-k topics per brand and overall ('All') from a Topic x brand matrix.
+
+    Returns dict[brand] = {'top': [(topic, count), ...], 'total': total mentions}.
+    """
+    result = {}
+    columns = {"All": counts.sum(axis=1)}
+    columns.update({brand: counts[brand] for brand in counts.columns})
+    for brand, series in columns.items():
+        series = series[series > 0]
+        top = series.sort_values(ascending=False, kind="stable").head(k)
+        result[brand] = {"top": list(top.items()), "total": series.sum()}
+    return result
@@ -1,10 +1,14 @@
 import streamlit as st
+from utils import config
 from utils.date_utils import init_month_selector
+from utils.pr_context import build_pr_context
+from utils.lazy_tabs import lazy_tabs
 
 # --- Section Imports ---
 from sections.compos_matrix import render as render_matrix
 from sections.sentiment_analysis import render as render_sentiment
 from sections.topical_analysis import render as render_topics
+from sections.topic_insights import render as render_topic_insights
 from sections.volume_trends import render as render_volume
 from sections.media_coverage import render as render_media_shares
 from sections.top_3_archetypes import render_top_3_archetypes
@@ -22,57 +26,83 @@ from sections.social_media_ranking import render as render_social_media_ranking
 #from sections.content_pillar_analysis import render as render_pillars  # If implemented
 # from sections.audience_affinity import render as render_affinity     # Optional
 
+# --- Tenant ---
+# One engine serves every client; the tenant comes from the URL (?tenant=artea)
+tenant = st.query_params.get("tenant", config.DEFAULT_TENANT)
+try:
+    config.select_tenant(tenant)
+except ValueError as e:
+    st.error(f"[Tenant] {e}")
+    st.stop()
+
 # --- Sidebar ---
 st.sidebar.title("📁 Navigation")
-section = st.sidebar.radio("Go to", [
-    "Press Releases",
-    "Social Media",
-    "Audience Affinity",
-    "Content Pillars"
-])
+st.sidebar.caption(config.TENANTS[tenant])
+section = st.sidebar.radio("Go to", config.PAGES)
 
 # --- Month Filter ---
 init_month_selector()  # Sets start_date / end_date globally
 
+
+def render_archetype_tabs(source: str, title: str):
+    """Top 3 Archetypes in one tab per brand, for tenants that have them."""
+    brands = config.ARCHETYPE_TABS.get(source)
+    if not brands:
+        return
+    st.markdown(f"### Top 3 Archetypes ({title})")
+    lazy_tabs(brands, f"archetypes_{source}", lambda i, brand: render_top_3_archetypes(source, brand))
+
+
+AUDIENCE_AFFINITY_TABS = {"pr": "Press Releases", "linkedin": "LinkedIn", "facebook": "Facebook"}
+
+# Sections a tenant can list in PR_SECTIONS / SOCIAL_SECTIONS
+PR_SECTION_RENDERERS = {
+    "compos_matrix": render_matrix,
+    "pr_ranking": render_pr_ranking,
+    "archetypes": lambda context: render_archetype_tabs("pr", "PR"),
+    "sentiment": lambda context: render_sentiment(context, mode="by_company"),
+    "topics": render_topics,
+    "topic_insights": lambda context: render_topic_insights(),
+    "volume": lambda context: render_volume(context, mode="by_company"),
+    "media_coverage": lambda context: render_media_shares(context, mode="by_brand"),
+}
+SOCIAL_SECTION_RENDERERS = {
+    "social_media_ranking": render_social_media_ranking,
+    "archetypes": lambda: render_archetype_tabs("linkedin", "Social Media"),
+    "trends": lambda: render_social_trends(selected_platforms=config.SOCIAL_PLATFORMS),
+    "top_posts": lambda: render_top_posts(selected_platforms=config.SOCIAL_PLATFORMS),
+}
+
 # --- Section Routing ---
 if section == "Press Releases":
     st.title("📰 Press Release Dashboard")
-    render_matrix()
-    render_pr_ranking()
-    # Top 3 Archetypes for PR (tabs per brand)
-    st.markdown("### Top 3 Archetypes (PR)")
-    pr_brands = ["Kauno grudai", "Acme grupe", "Ignitis Group", "SBA", "Thermo Fisher"]
-    pr_tabs = st.tabs(pr_brands)
-    for i, brand in enumerate(pr_brands):
-        with pr_tabs[i]:
-            render_top_3_archetypes("pr", brand)
-    render_sentiment(mode="by_company")
-    render_topics()
-    render_volume(mode="by_company")
-    render_media_shares(mode="by_brand")
+    # Loaded and filtered once, then shared by every PR section below
+    pr_context = build_pr_context()
+    for name in config.PR_SECTIONS:
+        PR_SECTION_RENDERERS[name](pr_context)
 
 elif section == "Social Media":
     st.title("📱 Social Media Dashboard")
-    render_social_media_ranking()
-    # Top 3 Archetypes for Social Media (tabs per brand)
-    st.markdown("### Top 3 Archetypes (Social Media)")
-    sm_brands = ["Kauno grudai", "Acme grupe", "Ignitis", "SBA", "Thermo Fisher"]
-    sm_tabs = st.tabs(sm_brands)
-    for i, brand in enumerate(sm_brands):
-        with sm_tabs[i]:
-            render_top_3_archetypes("linkedin", brand)
-    render_social_trends(selected_platforms=["linkedin", "facebook"])
-    render_top_posts(selected_platforms=["linkedin", "facebook"])
+    for name in config.SOCIAL_SECTIONS:
+        SOCIAL_SECTION_RENDERERS[name]()
 
 elif section == "Audience Affinity":
     st.title("🎯 Audience Affinity Dashboard")
-    tab_pr, tab_li = st.tabs(["Press Releases", "LinkedIn"])
-    with tab_pr:
-        render_audience_affinity(source="pr")
-    with tab_li:
-        render_audience_affinity(source="linkedin")
+    sources = config.AUDIENCE_AFFINITY_SOURCES
+    if len(sources) == 1:
+        render_audience_affinity(source=sources[0])
+    else:
+        lazy_tabs(
+            [AUDIENCE_AFFINITY_TABS.get(s, s.title()) for s in sources],
+            "audience_affinity_sources",
+            lambda i, label: render_audience_affinity(source=sources[i]),
+        )
 
 elif section == "Content Pillars":
     st.title("🧱 Content Pillar Dashboard")
     render_content_pillars()
     #st.info("This section is under construction")
+
+elif section == "Ad Intelligence":
+    st.title("📣 Ad Intelligence Dashboard")
+    render_ads_dashboard()
@@ -2,104 +2,46 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from utils.date_utils import get_selected_date_range
-from utils.file_io import load_ads_data
-import ast
+from utils.file_io import load_ads_data, AD_PLATFORMS
+from utils.ads_rollup import load_weekly_ads_rollup, weekly_series, brand_totals, TOTAL
+from utils.comparison import compare_windows, midpoint_windows
 # NEW imports
 import os
 import glob
 from utils.file_io import load_agility_data
-from utils.config import BRANDS, DATA_ROOT, BRAND_COLORS
+from utils import config
+from utils.file_cache import file_cached, data_version, data_roots
+from utils.brands import BrandCanonicalizer
+from utils.cards import simple_metric_card, card_grid
+from utils.lazy_tabs import lazy_tabs, tab_figure
+from utils.figure_cache import px_figure
 
-BRAND_ORDER = list(BRAND_COLORS.keys())
 DEFAULT_COLOR = "#BDBDBD"  # used for any brand not in BRAND_COLORS
 
-ADS_COMPOS_DIR = os.path.join(DATA_ROOT, "ads", "compos")
-COMPOS_SUMMARY_PATH = os.path.join(DATA_ROOT, "ads", "compos", "compos_summary.xlsx")
+# Relative to the tenant's DATA_ROOT
+ADS_FILES = os.path.join("ads", "*.xlsx")
+ADS_COMPOS_DIR = os.path.join("ads", "compos")
+COMPOS_SUMMARY_FILE = os.path.join("ads", "compos", "compos_summary.xlsx")
+CREATIVITY_FILE = os.path.join("creativity", "creativity_ranking.xlsx")
+KEY_ADVANTAGES_FILE = os.path.join("key_advantages", "key_advantages.xlsx")
+KEY_ADVANTAGES_SUMMARY_FILE = os.path.join("key_advantages", "key_advantages_summary.xlsx")
 
 
-def _parse_platforms(val):
-    try:
-        if isinstance(val, str):
-            return ast.literal_eval(val)
-        elif isinstance(val, list):
-            return val
-    except Exception:
-        return []
-    return []
+def _brand_order() -> list:
+    return list(config.BRAND_COLORS.keys())
 
 
 # Added: brand normalization helper to align names across sources
-def _normalize_brand(name: str) -> str:
-    if not isinstance(name, str):
-        return ""
-    base = name.split("|")[0].strip()
-    cleaned = "".join(ch.lower() if (ch.isalnum() or ch.isspace()) else " " for ch in base)
-    return " ".join(cleaned.split())
-
-
-def _summary(df: pd.DataFrame, value_col: str, split_mid: datetime):
-    curr = df[df['startDateFormatted'] >= split_mid]
-    prev = df[df['startDateFormatted'] < split_mid]
-
-    curr_agg = curr.groupby('brand')[value_col].sum()
-    prev_agg = prev.groupby('brand')[value_col].sum()
-
-    rank_curr = curr_agg.sort_values(ascending=False).rank(ascending=False, method="min")
-    rank_prev = prev_agg.sort_values(ascending=False).rank(ascending=False, method="min")
-
-    result = pd.DataFrame({
-        'current': curr_agg,
-        'previous': prev_agg,
-        'change_pct': ((curr_agg - prev_agg) / prev_agg.replace(0, 1)) * 100,
-        'rank_now': rank_curr,
-        'rank_prev': rank_prev,
-        'rank_change': rank_curr - rank_prev
-    }).fillna(0)
-
-    return result
-
-
-def _format_metric_card(label, val, pct, rank_now, rank_change, debug=False):
-    if rank_change > 0:
-        arrow = "↓"
-        rank_color = "red"
-    elif rank_change < 0:
-        arrow = "↑"
-        rank_color = "green"
-    else:
-        arrow = "→"
-        rank_color = "gray"
-
-    pct_color = "green" if pct > 0 else "red" if pct < 0 else "gray"
-
-    st.markdown(f"""
-    <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-        <h5 style="margin:0;">{label}</h5>
-        <h3 style="margin:5px 0;">{val}</h3>
-        <p style="margin:0; color:{pct_color};">Δ {pct:.1f}%</p>
-        <p style="margin:0; color:{rank_color};">{arrow} Rank {int(rank_now)}</p>
-    """, unsafe_allow_html=True)
-
-    if debug:
-        st.markdown(f"""
-        <small style="color:#666;">
-        Debug: pct={pct:.2f}, rank_now={rank_now}, rank_change={rank_change}
-        </small>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown("</div>", unsafe_allow_html=True)
+_normalize_brand = BrandCanonicalizer()
 
 
 # --- New helpers pulled from LP dashboard (adapted to current data layout) ---
 
-@st.cache_data(ttl=0)
+@file_cached(CREATIVITY_FILE)
 def _load_creativity():
-    path = os.path.join(DATA_ROOT, "creativity", "creativity_ranking.xlsx")
+    path = os.path.join(config.DATA_ROOT, CREATIVITY_FILE)
     if not os.path.exists(path):
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
     try:
@@ -118,10 +60,12 @@ def _load_creativity():
 
 
 # New: Load brand strength from data/ads/compos (fallback to Agility if empty)
+@file_cached(os.path.join(ADS_COMPOS_DIR, "*.xlsx"))
 def _load_brand_strength_from_ads_compos():
     strength = {}
-    if os.path.isdir(ADS_COMPOS_DIR):
-        for path in glob.glob(os.path.join(ADS_COMPOS_DIR, "*.xlsx")):
+    compos_dir = os.path.join(config.DATA_ROOT, ADS_COMPOS_DIR)
+    if os.path.isdir(compos_dir):
+        for path in glob.glob(os.path.join(compos_dir, "*.xlsx")):
             fname = os.path.basename(path)
             if fname.startswith("~$"):
                 continue
@@ -145,7 +89,7 @@ def _load_brand_strength_from_ads_compos():
 def _compute_brand_strength_from_agility():
     """Return dict brand -> % of dominant archetype from Agility data."""
     strength = {}
-    for brand in BRANDS:
+    for brand in config.BRANDS:
         df_ag = load_agility_data(brand)
         if df_ag is None or df_ag.empty:
             continue
@@ -157,10 +101,12 @@ def _compute_brand_strength_from_agility():
 
 
 # New: Load top archetypes from data/ads/compos (fallback to Agility if empty)
+@file_cached(os.path.join(ADS_COMPOS_DIR, "*.xlsx"))
 def _load_top_archetypes_from_ads_compos():
     results = {}
-    if os.path.isdir(ADS_COMPOS_DIR):
-        for path in glob.glob(os.path.join(ADS_COMPOS_DIR, "*.xlsx")):
+    compos_dir = os.path.join(config.DATA_ROOT, ADS_COMPOS_DIR)
+    if os.path.isdir(compos_dir):
+        for path in glob.glob(os.path.join(compos_dir, "*.xlsx")):
             fname = os.path.basename(path)
             if fname.startswith("~$"):
                 continue
@@ -188,7 +134,7 @@ def _load_top_archetypes_from_ads_compos():
 def _load_top_archetypes_from_agility():
     """Return dict brand -> list of top 3 archetypes with percentage and count."""
     results = {}
-    for brand in BRANDS:
+    for brand in config.BRANDS:
         df_ag = load_agility_data(brand)
         if df_ag is None or df_ag.empty or 'Top Archetype' not in df_ag.columns:
             continue
@@ -208,9 +154,9 @@ def _load_top_archetypes_from_agility():
     return results
 
 
-@st.cache_data(ttl=0)
+@file_cached(KEY_ADVANTAGES_FILE)
 def _load_key_advantages():
-    path = os.path.join(DATA_ROOT, "key_advantages", "key_advantages.xlsx")
+    path = os.path.join(config.DATA_ROOT, KEY_ADVANTAGES_FILE)
     if not os.path.exists(path):
         return {}
     advantages = {}
@@ -230,8 +176,9 @@ def _load_key_advantages():
     return advantages
 
 
+@file_cached(KEY_ADVANTAGES_SUMMARY_FILE)
 def _load_key_advantages_summary():
-    path = os.path.join(DATA_ROOT, "key_advantages", "key_advantages_summary.xlsx")
+    path = os.path.join(config.DATA_ROOT, KEY_ADVANTAGES_SUMMARY_FILE)
     if not os.path.exists(path):
         return ""
     try:
@@ -250,32 +197,8 @@ def _load_key_advantages_summary():
         return ""
 
 
-def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
-    rank_color = "gray"
-    if rank_now is not None and total_ranks:
-        if int(rank_now) == 1:
-            rank_color = "green"
-        elif int(rank_now) == int(total_ranks):
-            rank_color = "red"
-    pct_color = None
-    if pct is not None:
-        pct_color = "green" if pct > 0 else "red" if pct < 0 else "gray"
-    pct_html = f'<p style="margin:0; color:{pct_color};">Δ {pct:.1f}%</p>' if pct is not None else ''
-    rank_html = f'<p style="margin:0; color:{rank_color};">Rank {int(rank_now)}</p>' if rank_now is not None else ''
-    st.markdown(
-        f"""
-        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-            <h5 style="margin:0;">{label}</h5>
-            <h3 style="margin:5px 0;">{val}</h3>
-            {pct_html}
-            {rank_html}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
 def _present_color_map(present_brands):
-    m = dict(BRAND_COLORS)
+    m = dict(config.BRAND_COLORS)
     for b in present_brands:
         if b not in m:
             m[b] = DEFAULT_COLOR
@@ -302,66 +225,87 @@ def render():
     fixed_start = pd.Timestamp(2025, 2, 1)
     fixed_end = pd.Timestamp(2025, 7, 31)
     df_fixed = df[(df['startDateFormatted'] >= fixed_start) & (df['startDateFormatted'] <= fixed_end)].copy()
+    # Weekly (brand, platform) totals of df_fixed, shared by the trend charts and cards
+    rollup = load_weekly_ads_rollup(fixed_start, fixed_end)
+    # Changes whenever an ads file does; keys the memoized tab figures
+    ads_version = data_version(ADS_FILES, roots=data_roots)
 
     # Pie charts and cards for selected months only
     st.markdown("### Ad Volume Share (Selected Months)")
-    sub_tabs = st.tabs(["Number of Ads", "Reach"])
-    with sub_tabs[0]:
+    # Built for the selected tab only; None when there is nothing to show
+    def build_ads_pie():
         ad_counts = df_filtered["brand"].value_counts().reset_index()
-        if not ad_counts.empty:
-            ad_counts.columns = ["brand", "count"]
-
-            # Build a color map that covers all present brands (unknowns -> gray)
-            color_map_ads = {**BRAND_COLORS}
-            for b in ad_counts["brand"].unique():
-                color_map_ads.setdefault(b, DEFAULT_COLOR)
-
-            fig = px.pie(
-                ad_counts,
-                values="count",
-                names="brand",
-                title=f'Ad Count Share – {start_date.strftime("%b %Y")} to {end_date.strftime("%b %Y")}',
-                color="brand",
-                color_discrete_map=color_map_ads,
-                category_orders={"brand": BRAND_ORDER},
-            )
-            st.plotly_chart(fig, use_container_width=True, key="pie_ads_selected")
-        else:
-            st.info("No ads in selected months.")
+        if ad_counts.empty:
+            return None
+        ad_counts.columns = ["brand", "count"]
+
+        # Build a color map that covers all present brands (unknowns -> gray)
+        color_map_ads = {**config.BRAND_COLORS}
+        for b in ad_counts["brand"].unique():
+            color_map_ads.setdefault(b, DEFAULT_COLOR)
+
+        return px_figure(
+            "pie",
+            ad_counts,
+            values="count",
+            names="brand",
+            title=f'Ad Count Share – {start_date.strftime("%b %Y")} to {end_date.strftime("%b %Y")}',
+            color="brand",
+            color_discrete_map=color_map_ads,
+            category_orders={"brand": _brand_order()},
+        )
 
-    with sub_tabs[1]:
+    def build_reach_pie():
         reach_totals = df_filtered.groupby("brand", as_index=False)["reach"].sum()
-        if not reach_totals.empty:
-
-            color_map_reach = {**BRAND_COLORS}
-            for b in reach_totals["brand"].unique():
-                color_map_reach.setdefault(b, DEFAULT_COLOR)
+        if reach_totals.empty:
+            return None
+
+        color_map_reach = {**config.BRAND_COLORS}
+        for b in reach_totals["brand"].unique():
+            color_map_reach.setdefault(b, DEFAULT_COLOR)
+
+        return px_figure(
+            "pie",
+            reach_totals,
+            values="reach",
+            names="brand",
+            title=f'Reach Share – {start_date.strftime("%b %Y")} to {end_date.strftime("%b %Y")}',
+            color="brand",
+            color_discrete_map=color_map_reach,
+            category_orders={"brand": _brand_order()},
+        )
 
-            fig = px.pie(
-                reach_totals,
-                values="reach",
-                names="brand",
-                title=f'Reach Share – {start_date.strftime("%b %Y")} to {end_date.strftime("%b %Y")}',
-                color="brand",
-                color_discrete_map=color_map_reach,
-                category_orders={"brand": BRAND_ORDER},
-            )
-            st.plotly_chart(fig, use_container_width=True, key="pie_reach_selected")
+    # (build, chart key, message without data) per tab
+    share_tabs = [
+        (build_ads_pie, "pie_ads_selected", "No ads in selected months."),
+        (build_reach_pie, "pie_reach_selected", "No reach data in selected months."),
+    ]
+
+    def render_share(i, label):
+        build, key, empty_message = share_tabs[i]
+        fig = tab_figure("ads_share", key, (ads_version, start_date, end_date), build)
+        if fig is None:
+            st.info(empty_message)
         else:
-            st.info("No reach data in selected months.")
+            st.plotly_chart(fig, use_container_width=True, key=key)
+
+    lazy_tabs(["Number of Ads", "Reach"], "ads_share", render_share)
 
     # Summary stats (midpoint split) for potential future use; old 4 cards removed
     mid_date = start_date + (end_date - start_date) / 2
-    reach_stats = _summary(df_filtered, 'reach', mid_date)
-    df_filtered['ad_count'] = 1
-    ads_stats = _summary(df_filtered, 'ad_count', mid_date)
-    duration_stats = _summary(df_filtered, 'duration_days', mid_date) if 'duration_days' in df_filtered.columns else None
+    summary_metrics = {'reach': ('reach', 'sum'), 'ad_count': ('reach', 'size')}
+    if 'duration_days' in df_filtered.columns:
+        summary_metrics['duration_days'] = ('duration_days', 'sum')
+    stats = compare_windows(df_filtered, 'startDateFormatted', midpoint_windows(start_date, end_date, mid=mid_date), summary_metrics)
+    reach_stats = stats['reach']
+    ads_stats = stats['ad_count']
+    duration_stats = stats.get('duration_days')
 
     # --- Brand Summary (cards + creativity analysis) ---
     st.markdown("### Brand Summary")
 
     # Compute 6-month reach totals and ranks using the fixed window
-    reach_6m = df_fixed.groupby('brand')['reach'].sum() if not df_fixed.empty else pd.Series(dtype=float)
+    reach_6m = brand_totals(rollup, 'reach') if not rollup.empty else pd.Series(dtype=float)
     reach_mean = reach_6m.mean() if len(reach_6m) else 0
     reach_ranks = reach_6m.rank(ascending=False, method="min") if len(reach_6m) else pd.Series(dtype=float)
 
@@ -371,7 +315,7 @@ def render():
         strength_map = _compute_brand_strength_from_agility()
     if strength_map:
         bs_df = pd.DataFrame({'brand': list(strength_map.keys()), 'strength': list(strength_map.values())})
-        bs_df['brand_norm'] = bs_df['brand'].apply(_normalize_brand)
+        bs_df['brand_norm'] = _normalize_brand.map(bs_df['brand'])
         bs_df['rank'] = bs_df['strength'].rank(ascending=False, method='min')
         bs_mean = bs_df['strength'].mean() if len(bs_df) else 0
         bs_df['delta_vs_mean_pct'] = ((bs_df['strength'] - bs_mean) / (bs_mean if bs_mean != 0 else 1)) * 100
@@ -409,75 +353,71 @@ def render():
     if not available_brands:
         st.info("No brands available to display.")
     else:
-        brand_tabs = st.tabs(available_brands)
-        for i, brand_name in enumerate(available_brands):
-            with brand_tabs[i]:
-                col1, col2, col3 = st.columns(3)
-
-                # Reach 6 months
-                with col1:
-                    total_reach = int(reach_6m.get(brand_name, 0)) if len(reach_6m) else 0
-                    delta_mean_pct = ((total_reach - (reach_mean if reach_mean != 0 else 1)) / (reach_mean if reach_mean != 0 else 1)) * 100 if reach_mean != 0 else 0
-                    rank_now = reach_ranks.get(brand_name, None) if len(reach_ranks) else None
-                    _format_simple_metric_card(
-                        label="Reach (6 months)",
-                        val=f"{total_reach:,}",
-                        pct=delta_mean_pct,
-                        rank_now=rank_now,
-                        total_ranks=len(reach_ranks) if len(reach_ranks) else None
-                    )
-
-                # Brand Strength
-                with col2:
-                    row = bs_df[bs_df['brand_norm'] == _normalize_brand(brand_name)]
-                    if not row.empty:
-                        strength = float(row['strength'].iloc[0])
-                        rank_bs = int(row['rank'].iloc[0])
-                        delta_bs = float(row['delta_vs_mean_pct'].iloc[0])
-                        _format_simple_metric_card(
-                            label="Brand Strength",
-                            val=f"{strength:.1f}%",
-                            pct=delta_bs,
-                            rank_now=rank_bs,
-                            total_ranks=len(bs_df)
-                        )
-                    else:
-                        _format_simple_metric_card("Brand Strength", "N/A")
-
-                # Creativity
-                with col3:
-                    cre_row = creativity_df[creativity_df['brand'].astype(str).str.lower() == brand_name.lower()] if not creativity_df.empty else pd.DataFrame()
-                    if not cre_row.empty:
-                        score = cre_row['originality_score'].iloc[0]
-                        rank_cre = int(cre_row['rank'].iloc[0]) if pd.notna(cre_row['rank'].iloc[0]) else None
-                        delta_cre = float(cre_row['delta_vs_mean_pct'].iloc[0]) if pd.notna(cre_row['delta_vs_mean_pct'].iloc[0]) else None
-                        _format_simple_metric_card(
-                            label="Creativity",
-                            val=f"{score:.2f}",
-                            pct=delta_cre,
-                            rank_now=rank_cre,
-                            total_ranks=creativity_df['brand'].nunique() if not creativity_df.empty else None
-                        )
-                    else:
-                        _format_simple_metric_card("Creativity", "N/A")
-
-                # Creativity Analysis section
-                if not creativity_df.empty:
-                    cre_row = creativity_df[creativity_df['brand'].astype(str).str.lower() == brand_name.lower()]
-                    if not cre_row.empty:
-                        score = cre_row['originality_score'].iloc[0]
-                        rank_cre = int(cre_row['rank'].iloc[0]) if pd.notna(cre_row['rank'].iloc[0]) else None
-                        just_text = str(cre_row['justification'].iloc[0]) if pd.notna(cre_row['justification'].iloc[0]) else ""
-                        examples_text = str(cre_row['examples'].iloc[0]) if pd.notna(cre_row['examples'].iloc[0]) else ""
-                        if just_text or examples_text:
-                            st.markdown("#### Creativity Analysis")
-                            st.markdown(f"""
-                            <div style=\"border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;\">
-                                <h5 style=\"margin:0;\">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
-                                {f'<p style=\"margin:8px 0 0; color:#444;\">{just_text}</p>' if just_text else ''}
-                                {f'<p style=\"margin:8px 0 0; color:#444;\">Examples: {examples_text}</p>' if examples_text else ''}
-                            </div>
-                            """, unsafe_allow_html=True)
+        def render_brand(i, brand_name):
+            # Reach 6 months
+            total_reach = int(reach_6m.get(brand_name, 0)) if len(reach_6m) else 0
+            delta_mean_pct = ((total_reach - (reach_mean if reach_mean != 0 else 1)) / (reach_mean if reach_mean != 0 else 1)) * 100 if reach_mean != 0 else 0
+            rank_now = reach_ranks.get(brand_name, None) if len(reach_ranks) else None
+            reach_card = simple_metric_card(
+                label="Reach (6 months)",
+                val=f"{total_reach:,}",
+                pct=delta_mean_pct,
+                rank_now=rank_now,
+                total_ranks=len(reach_ranks) if len(reach_ranks) else None
+            )
+
+            # Brand Strength
+            row = bs_df[bs_df['brand_norm'] == _normalize_brand(brand_name)]
+            if not row.empty:
+                strength = float(row['strength'].iloc[0])
+                rank_bs = int(row['rank'].iloc[0])
+                delta_bs = float(row['delta_vs_mean_pct'].iloc[0])
+                strength_card = simple_metric_card(
+                    label="Brand Strength",
+                    val=f"{strength:.1f}%",
+                    pct=delta_bs,
+                    rank_now=rank_bs,
+                    total_ranks=len(bs_df)
+                )
+            else:
+                strength_card = simple_metric_card("Brand Strength", "N/A")
+
+            # Creativity
+            cre_row = creativity_df[creativity_df['brand'].astype(str).str.lower() == brand_name.lower()] if not creativity_df.empty else pd.DataFrame()
+            if not cre_row.empty:
+                score = cre_row['originality_score'].iloc[0]
+                rank_cre = int(cre_row['rank'].iloc[0]) if pd.notna(cre_row['rank'].iloc[0]) else None
+                delta_cre = float(cre_row['delta_vs_mean_pct'].iloc[0]) if pd.notna(cre_row['delta_vs_mean_pct'].iloc[0]) else None
+                creativity_card = simple_metric_card(
+                    label="Creativity",
+                    val=f"{score:.2f}",
+                    pct=delta_cre,
+                    rank_now=rank_cre,
+                    total_ranks=creativity_df['brand'].nunique() if not creativity_df.empty else None
+                )
+            else:
+                creativity_card = simple_metric_card("Creativity", "N/A")
+            card_grid([reach_card, strength_card, creativity_card])
+
+            # Creativity Analysis section
+            if not creativity_df.empty:
+                cre_row = creativity_df[creativity_df['brand'].astype(str).str.lower() == brand_name.lower()]
+                if not cre_row.empty:
+                    score = cre_row['originality_score'].iloc[0]
+                    rank_cre = int(cre_row['rank'].iloc[0]) if pd.notna(cre_row['rank'].iloc[0]) else None
+                    just_text = str(cre_row['justification'].iloc[0]) if pd.notna(cre_row['justification'].iloc[0]) else ""
+                    examples_text = str(cre_row['examples'].iloc[0]) if pd.notna(cre_row['examples'].iloc[0]) else ""
+                    if just_text or examples_text:
+                        st.markdown("#### Creativity Analysis")
+                        st.markdown(f"""
+                        <div style=\"border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;\">
+                            <h5 style=\"margin:0;\">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
+                            {f'<p style=\"margin:8px 0 0; color:#444;\">{just_text}</p>' if just_text else ''}
+                            {f'<p style=\"margin:8px 0 0; color:#444;\">Examples: {examples_text}</p>' if examples_text else ''}
+                        </div>
+                        """, unsafe_allow_html=True)
+
+        lazy_tabs(available_brands, "ads_brands", render_brand)
 
     # --- Top Archetypes by Company ---
     st.markdown("### Top Archetypes by Company")
@@ -501,12 +441,17 @@ def render():
             overall_items.append({'archetype': archetype, 'percentage': pct, 'count': count})
 
         tab_labels = ["🌍 Overall"] + list(archetypes_data.keys())
-        company_tabs = st.tabs(tab_labels)
-        # Overall tab
-        with company_tabs[0]:
-            st.subheader("Overall - Top 3 Archetypes")
+        companies = list(archetypes_data.items())
+
+        def render_archetypes(i, label):
+            # Overall tab, then one tab per company
+            if i == 0:
+                title, items = "Overall", overall_items
+            else:
+                title, items = companies[i - 1]
+            st.subheader(f"{title} - Top 3 Archetypes")
             col1, col2, col3 = st.columns(3)
-            for j, archetype_info in enumerate(overall_items):
+            for j, archetype_info in enumerate(items):
                 col = col1 if j == 0 else col2 if j == 1 else col3
                 with col:
                     st.markdown(f"""
@@ -516,21 +461,8 @@ def render():
                         <p style="margin:0; color:#666; font-size:0.9em;">{archetype_info['count']} items</p>
                     </div>
                     """, unsafe_allow_html=True)
-        # Company tabs
-        for i, (company, archetypes) in enumerate(archetypes_data.items()):
-            with company_tabs[i + 1]:
-                st.subheader(f"{company} - Top 3 Archetypes")
-                col1, col2, col3 = st.columns(3)
-                for j, archetype_info in enumerate(archetypes):
-                    col = col1 if j == 0 else col2 if j == 1 else col3
-                    with col:
-                        st.markdown(f"""
-                        <div style="border:1px solid #ddd; border-radius:10px; padding:10px; margin-bottom:10px; text-align:center;">
-                            <h4 style="margin:0; color:#333;">{archetype_info['archetype']}</h4>
-                            <h2 style="margin:5px 0; color:#333; font-size:2.0em;">{archetype_info['percentage']:.1f}%</h2>
-                            <p style="margin:0; color:#666; font-size:0.9em;">{archetype_info['count']} items</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+
+        lazy_tabs(tab_labels, "ads_archetypes", render_archetypes)
     else:
         st.info("No archetype data available. Ensure compos files are in data/ads/compos or Agility files contain 'Top Archetype'.")
 
@@ -545,34 +477,34 @@ def render():
     if not key_advantages_data:
         st.info("No key advantages data loaded. Place key_advantages.xlsx in data/key_advantages.")
     else:
-        brand_tabs = st.tabs(list(key_advantages_data.keys()))
-        for i, brand_disp in enumerate(key_advantages_data.keys()):
-            with brand_tabs[i]:
-                st.subheader(f"{brand_disp} Key Advantages")
-                brand_data = key_advantages_data.get(brand_disp)
-                if brand_data is None or brand_data.empty:
-                    st.info(f"No specific key advantages found for {brand_disp}.")
-                else:
-                    grouped_data = brand_data.groupby(['title', 'evidence_list']).agg({
-                        'example_quote': lambda x: list(x)
-                    }).reset_index()
-                    col1, col2 = st.columns(2)
-                    for idx, (_, row) in enumerate(grouped_data.iterrows()):
-                        with (col1 if idx % 2 == 0 else col2):
-                            examples_html = ""
-                            for ii, example in enumerate(row['example_quote']):
-                                if example and str(example).strip():
-                                    examples_html += f"<li style='margin:4px 0; color:#444;'>{example}</li>"
-                            examples_html = f"<ul style='margin:4px 0 0; padding-left:20px;'>{examples_html}</ul>" if examples_html else "<p style='margin:4px 0 0; color:#444;'>No examples available</p>"
-                            st.markdown(f"""
-                            <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px; max-height:800px; overflow-y:auto;">
-                                <h5 style="margin:0; word-wrap:break-word;">{row['title']}</h5>
-                                <p style="margin:8px 0 0; font-weight:bold; color:#333;">Evidence:</p>
-                                <p style="margin:4px 0 8px; color:#444; word-wrap:break-word; white-space:pre-wrap;">{row['evidence_list']}</p>
-                                <p style="margin:8px 0 0; font-weight:bold; color:#333;">Examples:</p>
-                                {examples_html}
-                            </div>
-                            """, unsafe_allow_html=True)
+        def render_key_advantages(i, brand_disp):
+            st.subheader(f"{brand_disp} Key Advantages")
+            brand_data = key_advantages_data.get(brand_disp)
+            if brand_data is None or brand_data.empty:
+                st.info(f"No specific key advantages found for {brand_disp}.")
+            else:
+                grouped_data = brand_data.groupby(['title', 'evidence_list']).agg({
+                    'example_quote': lambda x: list(x)
+                }).reset_index()
+                col1, col2 = st.columns(2)
+                for idx, (_, row) in enumerate(grouped_data.iterrows()):
+                    with (col1 if idx % 2 == 0 else col2):
+                        examples_html = ""
+                        for ii, example in enumerate(row['example_quote']):
+                            if example and str(example).strip():
+                                examples_html += f"<li style='margin:4px 0; color:#444;'>{example}</li>"
+                        examples_html = f"<ul style='margin:4px 0 0; padding-left:20px;'>{examples_html}</ul>" if examples_html else "<p style='margin:4px 0 0; color:#444;'>No examples available</p>"
+                        st.markdown(f"""
+                        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px; max-height:800px; overflow-y:auto;">
+                            <h5 style="margin:0; word-wrap:break-word;">{row['title']}</h5>
+                            <p style="margin:8px 0 0; font-weight:bold; color:#333;">Evidence:</p>
+                            <p style="margin:4px 0 8px; color:#444; word-wrap:break-word; white-space:pre-wrap;">{row['evidence_list']}</p>
+                            <p style="margin:8px 0 0; font-weight:bold; color:#333;">Examples:</p>
+                            {examples_html}
+                        </div>
+                        """, unsafe_allow_html=True)
+
+        lazy_tabs(list(key_advantages_data.keys()), "ads_key_advantages", render_key_advantages)
 
         st.subheader("Key Advantages Summary")
         summary_text = _load_key_advantages_summary()
@@ -592,110 +524,69 @@ def render():
     st.markdown("### In-Depth View")
 
     st.markdown("Ad Start Date Distribution")
-    hist = px.histogram(df_fixed, x='startDateFormatted', color='brand', nbins=60, barmode='overlay')
     _present = df_fixed["brand"].unique()
-    hist = px.histogram(
-        df_fixed,
+    hist = px_figure(
+        "histogram",
+        df_fixed[["startDateFormatted", "brand"]],
         x="startDateFormatted",
         color="brand",
         nbins=60,
         barmode="overlay",
         color_discrete_map=_present_color_map(_present),
-        category_orders={"brand": BRAND_ORDER},
+        category_orders={"brand": _brand_order()},
         labels={"startDateFormatted": "Month"}
     )
     st.plotly_chart(hist, use_container_width=True)
 
     st.markdown("### Volume Trends")
-    tabs = st.tabs(["Total", "FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"])
-    platforms = ["FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"]
-
-    with tabs[0]:
-        st.markdown("#### Reach (Total)")
-        reach_trend = (
-            df_fixed
-            .groupby([pd.Grouper(key="startDateFormatted", freq="W"), "brand"])["reach"]
-            .sum()
-            .reset_index()
-        )
-        fig = px.line(
-            reach_trend,
-            x="startDateFormatted",
-            y="reach",
-            color="brand",
-            color_discrete_map=_present_color_map(reach_trend["brand"].unique()),
-            category_orders={"brand": BRAND_ORDER},
-            labels={"startDateFormatted": "Month"}
-        )
-        st.plotly_chart(fig, use_container_width=True, key="total_reach")
-
-        st.markdown("#### New Ads (Total)")
-        ads_trend = (
-            df_fixed
-            .groupby([pd.Grouper(key="startDateFormatted", freq="W"), "brand"])
-            .size()
-            .reset_index(name="ads")
-        )
-        fig = px.line(
-            ads_trend,
-            x="startDateFormatted",
-            y="ads",
-            color="brand",
-            color_discrete_map=_present_color_map(ads_trend["brand"].unique()),
-            category_orders={"brand": BRAND_ORDER},
-            labels={"startDateFormatted": "Month"}
-        )
-        st.plotly_chart(fig, use_container_width=True, key="total_ads")
-
-    exploded = df_fixed.copy()
-    exploded["platforms"] = exploded.get("publisherPlatform", exploded.get("platforms", None))
-    exploded["platforms"] = exploded["platforms"].apply(_parse_platforms)
-    exploded = exploded.explode("platforms")
-
-    for i, platform in enumerate(platforms):
-        with tabs[i + 1]:
-            st.markdown(f"#### Reach – {platform}")
-            pf = exploded[exploded["platforms"] == platform]
-            if pf.empty:
-                st.warning(f"No data available for {platform}.")
-            else:
-                pf_reach = (
-                    pf.groupby([pd.Grouper(key="startDateFormatted", freq="W"), "brand"])["reach"]
-                    .sum()
-                    .reset_index()
-                )
-                fig = px.line(
-                    pf_reach,
-                    x="startDateFormatted",
-                    y="reach",
-                    color="brand",
-                    color_discrete_map=_present_color_map(pf_reach["brand"].unique()),
-                    category_orders={"brand": BRAND_ORDER},
-                    labels={"startDateFormatted": "Month"}
-                )
-                st.plotly_chart(fig, use_container_width=True, key=f"reach_{platform}")
-
-                st.markdown(f"#### New Ads – {platform}")
-                pf_ads = (
-                    pf.groupby([pd.Grouper(key="startDateFormatted", freq="W"), "brand"])
-                    .size()
-                    .reset_index(name="ads")
-                )
-                fig = px.line(
-                    pf_ads,
-                    x="startDateFormatted",
-                    y="ads",
-                    color="brand",
-                    color_discrete_map=_present_color_map(pf_ads["brand"].unique()),
-                    category_orders={"brand": BRAND_ORDER},
-                    labels={"startDateFormatted": "Month"}
-                )
-                st.plotly_chart(fig, use_container_width=True, key=f"ads_{platform}")
+    platforms = AD_PLATFORMS
+    # Trend figures are built for the selected tab only and kept until the ads files change
+    trends_version = (ads_version, fixed_start, fixed_end)
+
+    def trend_figure(platform, value, trend):
+        def build():
+            return px_figure(
+                "line",
+                trend,
+                x="startDateFormatted",
+                y=value,
+                color="brand",
+                color_discrete_map=_present_color_map(trend["brand"].unique()),
+                category_orders={"brand": _brand_order()},
+                labels={"startDateFormatted": "Month"}
+            )
+        return tab_figure("ads_trends", (platform, value), trends_version, build)
+
+    def render_trends(i, label):
+        if i == 0:
+            st.markdown("#### Reach (Total)")
+            fig = trend_figure(TOTAL, "reach", weekly_series(rollup, TOTAL, "reach"))
+            st.plotly_chart(fig, use_container_width=True, key="total_reach")
+
+            st.markdown("#### New Ads (Total)")
+            fig = trend_figure(TOTAL, "ads", weekly_series(rollup, TOTAL, "ads"))
+            st.plotly_chart(fig, use_container_width=True, key="total_ads")
+            return
+
+        platform = platforms[i - 1]
+        st.markdown(f"#### Reach – {platform}")
+        pf_reach = weekly_series(rollup, platform, "reach")
+        if pf_reach.empty:
+            st.warning(f"No data available for {platform}.")
+            return
+        fig = trend_figure(platform, "reach", pf_reach)
+        st.plotly_chart(fig, use_container_width=True, key=f"reach_{platform}")
+
+        st.markdown(f"#### New Ads – {platform}")
+        fig = trend_figure(platform, "ads", weekly_series(rollup, platform, "ads"))
+        st.plotly_chart(fig, use_container_width=True, key=f"ads_{platform}")
+
+    lazy_tabs(["Total"] + platforms, "ads_volume_trends", render_trends)
 
     # --- Top 5 Product Types Section ---
     st.markdown("### Top 5 Product Types")
 
-    prod_path = os.path.join(DATA_ROOT, "ads", "products", "Artea_Product_Invest_COMBINED.xlsx")
+    prod_path = os.path.join(config.DATA_ROOT, "ads", "products", "Artea_Product_Invest_COMBINED.xlsx")
     if not os.path.exists(prod_path):
         st.info("Product file not found. Place Artea_Product_Invest_COMBINED.xlsx in data/ads/products.")
     else:
@@ -708,7 +599,6 @@ def render():
 
         banks = sorted(df_prod["BANK"].dropna().unique())
         tab_labels = ["Overall"] + banks
-        prod_tabs = st.tabs(tab_labels)
 
         def top5_overall(df):
             df = df[df["new_classifcation"].notna() & (df["new_classifcation"].str.upper() != "NONE")]
@@ -727,98 +617,106 @@ def render():
             total = df["Product Type"].count()
             return [(cat, cnt / total * 100 if total > 0 else 0) for cat, cnt in top.items()], total
 
-        for i, tab_name in enumerate(tab_labels):
-            with prod_tabs[i]:
-                if tab_name == "Overall":
-                    df_tab = df_prod
-                else:
-                    df_tab = df_prod[df_prod["BANK"] == tab_name]
-
-                col1, col2 = st.columns(2)
-                # Overall Top 5
-                with col1:
-                    top5, total_count = top5_overall(df_tab)
+        def render_products(i, tab_name):
+            if tab_name == "Overall":
+                df_tab = df_prod
+            else:
+                df_tab = df_prod[df_prod["BANK"] == tab_name]
+
+            col1, col2 = st.columns(2)
+            # Overall Top 5
+            with col1:
+                top5, total_count = top5_overall(df_tab)
+                st.markdown(f"""
+                <div style="border:2px solid #bbb; border-radius:12px; padding:12px; margin-bottom:12px;">
+                    <h5 style="margin:0;">Top 5 Product Types (All) <span style="font-weight:normal; color:#555;">({total_count} Total Products)</span></h5>
+                """, unsafe_allow_html=True)
+                for cat, pct in top5:
                     st.markdown(f"""
-                    <div style="border:2px solid #bbb; border-radius:12px; padding:12px; margin-bottom:12px;">
-                        <h5 style="margin:0;">Top 5 Product Types (All) <span style="font-weight:normal; color:#555;">({total_count} Total Products)</span></h5>
-                    """, unsafe_allow_html=True)
-                    for cat, pct in top5:
-                        st.markdown(f"""
-                        <div style="display:flex; align-items:center; margin:10px 0;">
-                            <div style="border:1px solid #ddd; border-radius:8px; padding:10px 16px; font-size:1.1em; font-weight:600; flex:1; background:#fafbfc; text-align:center;">
-                                {cat}
-                            </div>
-                            <div style="border:1px solid #555; border-radius:8px; padding:8px 14px; margin-left:10px; font-size:1em; font-weight:bold; color:#555; background:#f6fafd; min-width:70px; text-align:center;">
-                                {pct:.1f}%
-                            </div>
+                    <div style="display:flex; align-items:center; margin:10px 0;">
+                        <div style="border:1px solid #ddd; border-radius:8px; padding:10px 16px; font-size:1.1em; font-weight:600; flex:1; background:#fafbfc; text-align:center;">
+                            {cat}
                         </div>
-                        """, unsafe_allow_html=True)
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-                # Investment Top 5
-                with col2:
-                    top5_inv, total_count_inv = top5_investment(df_tab)
-                    st.markdown(f"""
-                    <div style="border:2px solid #bbb; border-radius:12px; padding:12px; margin-bottom:12px;">
-                        <h5 style="margin:0;">Top 5 Investment Product Types <span style="font-weight:normal; color:#555;">({total_count_inv} Total Products)</span></h5>
+                        <div style="border:1px solid #555; border-radius:8px; padding:8px 14px; margin-left:10px; font-size:1em; font-weight:bold; color:#555; background:#f6fafd; min-width:70px; text-align:center;">
+                            {pct:.1f}%
+                        </div>
+                    </div>
                     """, unsafe_allow_html=True)
-                    for cat, pct in top5_inv:
-                        st.markdown(f"""
-                        <div style="display:flex; align-items:center; margin:10px 0;">
-                            <div style="border:1px solid #ddd; border-radius:8px; padding:10px 16px; font-size:1.1em; font-weight:600; flex:1; background:#fafbfc; text-align:center;">
-                                {cat}
-                            </div>
-                            <div style="border:1px solid #555; border-radius:8px; padding:8px 14px; margin-left:10px; font-size:1em; font-weight:bold; color:#555; background:#f6fafd; min-width:70px; text-align:center;">
-                                {pct:.1f}%
-                            </div>
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            # Investment Top 5
+            with col2:
+                top5_inv, total_count_inv = top5_investment(df_tab)
+                st.markdown(f"""
+                <div style="border:2px solid #bbb; border-radius:12px; padding:12px; margin-bottom:12px;">
+                    <h5 style="margin:0;">Top 5 Investment Product Types <span style="font-weight:normal; color:#555;">({total_count_inv} Total Products)</span></h5>
+                """, unsafe_allow_html=True)
+                for cat, pct in top5_inv:
+                    st.markdown(f"""
+                    <div style="display:flex; align-items:center; margin:10px 0;">
+                        <div style="border:1px solid #ddd; border-radius:8px; padding:10px 16px; font-size:1.1em; font-weight:600; flex:1; background:#fafbfc; text-align:center;">
+                            {cat}
                         </div>
-                        """, unsafe_allow_html=True)
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-                # --- Unique Products, Unique Investment Comms & Unique Education Initiatives (bank tabs only) ---
-                if tab_name != "Overall":
-                    unique_info = {
-                        "Artea": {
-                            "Unique products": "Smart Wallet, Artea Life Insurance for Critical Illnesses, and Summer Savings Deposit.",
-                            "Unique Investment Comms": "Investment Consultation Service, Financial Management Tools, and various Pension Funds.",
-                            "Unique Education Initiatives": "\"Investavimo kelionė\" series focusing on investment strategies."
-                        },
-                        "Luminor Lietuva": {
-                            "Unique products": "Luminor Black Card, Luminor Business Solutions, and Luminor Cashback Offer.",
-                            "Unique Investment Comms": "Luminor Investor platform, One Euro a Day Savings Plan, and various Pension Funds.",
-                            "Unique Education Initiatives": "\"Lietuvos ekonomikos apžvalga\" providing expert analysis on the Lithuanian economy."
-                        },
-                        "SEB Lietuvoje": {
-                            "Unique products": "SEB Bank Card for Children, SEB Client Services, and PRO BRO Monthly Subscription.",
-                            "Unique Investment Comms": "Future Pension Calculator, SEB Ambasadorių Programa, and various Pension Investment Products.",
-                            "Unique Education Initiatives": "\"SEB Ambasadorių Programa\" empowering students to teach financial literacy."
-                        },
-                        "Swedbank Lietuvoje": {
-                            "Unique products": "Solar Power Plant Financing, EIF Guarantee for Business Expansion, and Pegaso Gift Voucher.",
-                            "Unique Investment Comms": "Swedbank Robur Funds, Mini Investicijos, and various educational campaigns.",
-                            "Unique Education Initiatives": "\"Swedbank Finansų laboratorija\" offering free financial literacy education for students."
-                        },
-                        "Citadele bankas": {
-                            "Unique products": "C smart NEON Card, Citadele Piggy Bank, and C prime and payment ring.",
-                            "Unique Investment Comms": "Money Knowledge Test and Investment Account.",
-                            "Unique Education Initiatives": "\"Money Knowledge Test\" engaging users in assessing their financial knowledge."
-                        }
+                        <div style="border:1px solid #555; border-radius:8px; padding:8px 14px; margin-left:10px; font-size:1em; font-weight:bold; color:#555; background:#f6fafd; min-width:70px; text-align:center;">
+                            {pct:.1f}%
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            # --- Unique Products, Unique Investment Comms & Unique Education Initiatives (bank tabs only) ---
+            if tab_name != "Overall":
+                unique_info = {
+                    "Artea": {
+                        "Unique products": "Smart Wallet, Artea Life Insurance for Critical Illnesses, and Summer Savings Deposit.",
+                        "Unique Investment Comms": "Investment Consultation Service, Financial Management Tools, and various Pension Funds.",
+                        "Unique Education Initiatives": "\"Investavimo kelionė\" series focusing on investment strategies."
+                    },
+                    "Luminor Lietuva": {
+                        "Unique products": "Luminor Black Card, Luminor Business Solutions, and Luminor Cashback Offer.",
+                        "Unique Investment Comms": "Luminor Investor platform, One Euro a Day Savings Plan, and various Pension Funds.",
+                        "Unique Education Initiatives": "\"Lietuvos ekonomikos apžvalga\" providing expert analysis on the Lithuanian economy."
+                    },
+                    "SEB Lietuvoje": {
+                        "Unique products": "SEB Bank Card for Children, SEB Client Services, and PRO BRO Monthly Subscription.",
+                        "Unique Investment Comms": "Future Pension Calculator, SEB Ambasadorių Programa, and various Pension Investment Products.",
+                        "Unique Education Initiatives": "\"SEB Ambasadorių Programa\" empowering students to teach financial literacy."
+                    },
+                    "Swedbank Lietuvoje": {
+                        "Unique products": "Solar Power Plant Financing, EIF Guarantee for Business Expansion, and Pegaso Gift Voucher.",
+                        "Unique Investment Comms": "Swedbank Robur Funds, Mini Investicijos, and various educational campaigns.",
+                        "Unique Education Initiatives": "\"Swedbank Finansų laboratorija\" offering free financial literacy education for students."
+                    },
+                    "Citadele bankas": {
+                        "Unique products": "C smart NEON Card, Citadele Piggy Bank, and C prime and payment ring.",
+                        "Unique Investment Comms": "Money Knowledge Test and Investment Account.",
+                        "Unique Education Initiatives": "\"Money Knowledge Test\" engaging users in assessing their financial knowledge."
                     }
-                    info = unique_info.get(tab_name, None)
-                    if info:
-                        st.markdown("#### Unique Products")
-                        st.markdown(f"- {info['Unique products']}")
-                        st.markdown("#### Unique Investment Comms")
-                        st.markdown(f"- {info['Unique Investment Comms']}")
-                        st.markdown("#### Unique Education Initiatives")
-                        st.markdown(f"- {info['Unique Education Initiatives']}")
+                }
+                info = unique_info.get(tab_name, None)
+                if info:
+                    st.markdown("#### Unique Products")
+                    st.markdown(f"- {info['Unique products']}")
+                    st.markdown("#### Unique Investment Comms")
+                    st.markdown(f"- {info['Unique Investment Comms']}")
+                    st.markdown("#### Unique Education Initiatives")
+                    st.markdown(f"- {info['Unique Education Initiatives']}")
+
+        lazy_tabs(tab_labels, "ads_product_types", render_products)
 
     # Text analysis and new campaigns sections can be added later as optional blocks
 
+@file_cached(COMPOS_SUMMARY_FILE)
+def _load_compos_summary():
+    compos_summary_path = os.path.join(config.DATA_ROOT, COMPOS_SUMMARY_FILE)
+    if not os.path.exists(compos_summary_path):
+        return None
+    return pd.read_excel(compos_summary_path)
+
 def _load_top_archetypes_from_summary():
-    if not os.path.exists(COMPOS_SUMMARY_PATH):
+    df = _load_compos_summary()
+    if df is None:
         return {}
-    df = pd.read_excel(COMPOS_SUMMARY_PATH)
     archetypes = {}
     for col in df.columns:
         vc = df[col].dropna().value_counts()
@@ -833,9 +731,9 @@ def _load_top_archetypes_from_summary():
     return archetypes
 
 def _load_brand_strength_from_summary():
-    if not os.path.exists(COMPOS_SUMMARY_PATH):
+    df = _load_compos_summary()
+    if df is None:
         return {}
-    df = pd.read_excel(COMPOS_SUMMARY_PATH)
     strength = {}
     for col in df.columns:
         vc = df[col].dropna().value_counts()
@@ -1,13 +1,14 @@
 # streamlit_app.py
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import os
 import glob
-import ast
+import functools
 
 # Configure wide layout
 st.set_page_config(layout="wide")
@@ -20,6 +21,18 @@ CREATIVITY_DIR = os.path.join(DATA_DIR, "creativity")
 KEY_ADVANTAGES_DIR = os.path.join(DATA_DIR, "key_advantages")
 
 
+def file_signature(path):
+    """(path, mtime_ns, size) of a file, or None if it is missing.
+
+    Passed to the cached loaders below so they re-read a workbook only after it changed.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
 def find_ads_file():
     # Prefer explicitly known file, else fallback to first xlsx in ads dir
     preferred = os.path.join(ADS_DIR, "ads_scraping_LP.xlsx")
@@ -60,9 +73,9 @@ def load_key_advantages():
     return advantages
 
 
-# Clear cache for key advantages
-@st.cache_data(ttl=0)
-def load_key_advantages_cached():
+# Cached until key_advantages.xlsx changes; only the current version is kept
+@st.cache_data(max_entries=1)
+def load_key_advantages_cached(signature):
     return load_key_advantages()
 
 
@@ -90,6 +103,7 @@ def load_key_advantages_summary():
         return ""
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_brand(name: str) -> str:
     if not isinstance(name, str):
         return ""
@@ -98,6 +112,34 @@ def normalize_brand(name: str) -> str:
     return " ".join("".join(ch.lower() if ch.isalnum() or ch.isspace() else " " for ch in base).split())
 
 
+# Publisher platforms; bit i of 'platform_mask' is PLATFORMS[i]
+PLATFORMS = ["FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"]
+PLATFORM_BITS = {platform: 1 << i for i, platform in enumerate(PLATFORMS)}
+
+
+def parse_platforms(val):
+    """Parse a publisherPlatform cell like "['FACEBOOK', 'INSTAGRAM']" into a list ([] otherwise)."""
+    if isinstance(val, list):
+        return val
+    if not isinstance(val, str):
+        return []
+    text = val.strip()
+    if not (text.startswith("[") and text.endswith("]")):
+        return []
+    names = (item.strip().strip("'\"").strip() for item in text[1:-1].split(","))
+    return [name for name in names if name]
+
+
+def platform_masks(values: pd.Series) -> pd.Series:
+    """Bitmask of PLATFORMS per row; every distinct cell value is parsed once."""
+    codes, uniques = pd.factorize(values.astype(str))
+    lookup = np.array(
+        [sum(PLATFORM_BITS.get(p, 0) for p in set(parse_platforms(u))) for u in uniques],
+        dtype=np.int16,
+    )
+    return pd.Series(lookup[codes], index=values.index, name="platform_mask")
+
+
 # Load and preprocess data
 ads_path = find_ads_file()
 if not ads_path:
@@ -114,26 +156,33 @@ df['duration_days'] = (df['endDateFormatted'] - df['startDateFormatted']).dt.day
 reach_col = 'ad_details/aaa_info/eu_total_reach' if 'ad_details/aaa_info/eu_total_reach' in df.columns else 'reach'
 df['reach'] = pd.to_numeric(df[reach_col], errors='coerce')
 df['platforms'] = df.get('publisherPlatform')
+df['platform_mask'] = platform_masks(df['platforms']) if df['platforms'] is not None else np.int16(0)
 df['brand'] = df.get('pageName')
 df['isActive'] = df.get('isActive', False).astype(bool) if 'isActive' in df.columns else False
 
 # Canonicalize brand names for consistency across charts
+CANONICAL_BRANDS = {
+    'dpd lietuva': 'DPD Lietuva',
+    'lp express': 'LP EXPRESS',
+    'omniva lietuva': 'Omniva Lietuva',
+    'smartpost lietuva': 'SmartPosti Lietuva',
+    'smartposti lietuva': 'SmartPosti Lietuva',
+    'venipak lietuva': 'Venipak Lietuva',
+}
 
 def canonicalize_brand(name: str) -> str:
-    n = normalize_brand(name)
-    mapping = {
-        'dpd lietuva': 'DPD Lietuva',
-        'lp express': 'LP EXPRESS',
-        'omniva lietuva': 'Omniva Lietuva',
-        'smartpost lietuva': 'SmartPosti Lietuva',
-        'smartposti lietuva': 'SmartPosti Lietuva',
-        'venipak lietuva': 'Venipak Lietuva',
-    }
-    return mapping.get(n, name if isinstance(name, str) else "")
+    return CANONICAL_BRANDS.get(normalize_brand(name), name if isinstance(name, str) else "")
+
+def canonicalize_brands(values: pd.Series) -> pd.Series:
+    """canonicalize_brand for a whole column: each distinct name is normalized once."""
+    codes, uniques = pd.factorize(values)
+    # Last slot is for missing values (code -1)
+    lookup = np.array([canonicalize_brand(u) for u in uniques] + [""], dtype=object)
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
 
 # Apply canonicalization
 if 'brand' in df.columns:
-    df['brand'] = df['brand'].apply(canonicalize_brand)
+    df['brand'] = canonicalize_brands(df['brand'])
 
 # Filter for last 6 months (Feb–Jul 2025)
 end_date = pd.Timestamp("2025-07-31", tz="UTC")
@@ -141,25 +190,38 @@ start_date = end_date - relativedelta(months=6)
 mid_date = start_date + relativedelta(months=3)
 df_filtered = df[(df['startDateFormatted'] >= start_date) & (df['startDateFormatted'] <= end_date)].copy()
 
-# Summary calculation function
-def summary(df, value_col):
-    curr = df[(df['startDateFormatted'] >= mid_date) & (df['startDateFormatted'] <= end_date)]
-    prev = df[(df['startDateFormatted'] >= start_date) & (df['startDateFormatted'] < mid_date)]
-
-    curr_agg = curr.groupby('brand')[value_col].sum()
-    prev_agg = prev.groupby('brand')[value_col].sum()
-
-    rank_curr = curr_agg.sort_values(ascending=False).rank(ascending=False, method="min")
-    rank_prev = prev_agg.sort_values(ascending=False).rank(ascending=False, method="min")
-
-    result = pd.DataFrame({
-        'current': curr_agg,
-        'previous': prev_agg,
-        'change_pct': ((curr_agg - prev_agg) / prev_agg.replace(0, 1)) * 100,
-        'rank_now': rank_curr,
-        'rank_prev': rank_prev,
-        'rank_change': rank_curr - rank_prev
-    }).fillna(0)
+# Summary calculation: previous = [start_date, mid_date), current = [mid_date, end_date]
+def summary(df, value_cols):
+    """Current vs previous stats per brand for each value column, from one groupby over a window label."""
+    dates = df['startDateFormatted']
+    window = pd.Series(
+        np.select(
+            [(dates >= mid_date) & (dates <= end_date), (dates >= start_date) & (dates < mid_date)],
+            ['current', 'previous'],
+            default=None,
+        ),
+        index=df.index,
+        name='window',
+    )
+    sums = df.groupby(['brand', window])[value_cols].sum().unstack('window')
+
+    result = {}
+    for value_col in value_cols:
+        values = sums[value_col]
+        curr_agg = values['current'].dropna() if 'current' in values.columns else pd.Series(dtype=float)
+        prev_agg = values['previous'].dropna() if 'previous' in values.columns else pd.Series(dtype=float)
+
+        rank_curr = curr_agg.rank(ascending=False, method="min")
+        rank_prev = prev_agg.rank(ascending=False, method="min")
+
+        result[value_col] = pd.DataFrame({
+            'current': curr_agg,
+            'previous': prev_agg,
+            'change_pct': ((curr_agg - prev_agg) / prev_agg.replace(0, 1)) * 100,
+            'rank_now': rank_curr,
+            'rank_prev': rank_prev,
+            'rank_change': rank_curr - rank_prev
+        }).fillna(0)
 
     return result
 
@@ -216,10 +278,11 @@ for i, month in enumerate(months):
             st.plotly_chart(fig, use_container_width=True, key=f"pie_reach_{month}")
 
 # 2. Summary Cards (Reach, Brand Strength, Creativity)
-reach_stats = summary(df_filtered, 'reach')
 df_filtered['ad_count'] = 1
-ads_stats = summary(df_filtered, 'ad_count')
-duration_stats = summary(df_filtered, 'duration_days')
+stats = summary(df_filtered, ['reach', 'ad_count', 'duration_days'])
+reach_stats = stats['reach']
+ads_stats = stats['ad_count']
+duration_stats = stats['duration_days']
 from pandas.tseries.offsets import MonthEnd
 
 # Define current and previous month ranges
@@ -289,8 +352,8 @@ else:
 
 # --- Load Creativity ---
 
-@st.cache_data(ttl=0)  # Disable caching to force reload
-def load_creativity():
+@st.cache_data(max_entries=1)  # Keyed by the file signature, reloads when the workbook changes
+def load_creativity(signature):
     path = os.path.join(CREATIVITY_DIR, "creativity_ranking.xlsx")
     if not os.path.exists(path):
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
@@ -314,7 +377,7 @@ def load_creativity():
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
 
 
-creativity_df = load_creativity()
+creativity_df = load_creativity(file_signature(os.path.join(CREATIVITY_DIR, "creativity_ranking.xlsx")))
 
 # Compute creativity delta vs mean for card display
 if not creativity_df.empty:
@@ -557,53 +620,99 @@ hist.update_layout(
 st.plotly_chart(hist, use_container_width=True)
 
 # Volume Trends
+
+def active_weekly(ads, start, end):
+    """week, brand, active_ads: ads running at some point of each week of [start, end].
+
+    An ad runs from startDateFormatted to endDateFormatted; without an end date it
+    still runs at end if isActive, otherwise it ran on its start day only.
+    """
+    first = ads['startDateFormatted'].clip(lower=start)
+    last = ads['endDateFormatted'].fillna(ads['startDateFormatted'].where(~ads['isActive'], end)).clip(upper=end)
+    running = first.notna() & (first <= last)
+    # Sunday of each week, the label pd.Grouper(freq='W') gives it
+    first_week = first[running].dt.normalize() + pd.to_timedelta((6 - first[running].dt.weekday) % 7, unit='D')
+    last_week = last[running].dt.normalize() + pd.to_timedelta((6 - last[running].dt.weekday) % 7, unit='D')
+    counts = ((last_week - first_week).dt.days // 7 + 1).to_numpy()
+    steps = np.arange(counts.sum()) - np.repeat(counts.cumsum() - counts, counts)
+    weeks = pd.DataFrame({
+        'week': first_week.repeat(counts).reset_index(drop=True) + pd.to_timedelta(steps * 7, unit='D'),
+        'brand': ads.loc[running, 'brand'].repeat(counts).reset_index(drop=True),
+    })
+    return weeks.groupby(['week', 'brand']).size().rename('active_ads').reset_index()
+
+
+@st.cache_data  # Keyed by the ads file signature and window; _ads and _running are not hashed
+def weekly_rollup(signature, window, _ads, _running):
+    """Weekly rollup keyed by (brand, platform, week): reach sum, new ads, active ads and duration stats.
+
+    _running holds every ad started by the end of the window, so active_ads also
+    counts ads started before it. Weeks in which no ad started only have active_ads.
+    """
+    def weekly(ads, running, platform):
+        out = (
+            ads.groupby([pd.Grouper(key='startDateFormatted', freq='W'), 'brand'])
+            .agg(
+                reach=('reach', 'sum'),
+                ads=('reach', 'size'),
+                duration_mean=('duration_days', 'mean'),
+                duration_max=('duration_days', 'max'),
+            )
+            .reset_index()
+            .rename(columns={'startDateFormatted': 'week'})
+        )
+        out = out.merge(active_weekly(running, *window), on=['week', 'brand'], how='outer')
+        out['ads'] = out['ads'].astype('Int64')
+        out['active_ads'] = out['active_ads'].fillna(0).astype(int)
+        out['platform'] = platform
+        return out
+
+    frames = [weekly(_ads, _running, "Total")]
+    frames += [
+        weekly(_ads[(_ads['platform_mask'] & bit) != 0], _running[(_running['platform_mask'] & bit) != 0], platform)
+        for platform, bit in PLATFORM_BITS.items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def weekly_series(rollup, platform, value):
+    """startDateFormatted, brand, <value> rows of one platform from the weekly rollup."""
+    rows = rollup[(rollup['platform'] == platform) & rollup[value].notna()]
+    return rows[['week', 'brand', value]].rename(columns={'week': 'startDateFormatted'}).reset_index(drop=True)
+
+
+rollup = weekly_rollup(
+    file_signature(ads_path), (start_date, end_date), df_filtered, df[df['startDateFormatted'] <= end_date]
+)
+
 st.subheader("Volume Trends")
-tabs = st.tabs(["Total", "FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"])
-platforms = ["FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"]
+platforms = PLATFORMS
+tabs = st.tabs(["Total"] + platforms)
 
 # Total tab (weekly)
 with tabs[0]:
     st.markdown("#### Reach (Total)")
-    reach_trend = df_filtered.groupby([pd.Grouper(key='startDateFormatted', freq='W'), 'brand'])['reach'].sum().reset_index()
+    reach_trend = weekly_series(rollup, "Total", 'reach')
     fig = px.line(reach_trend, x='startDateFormatted', y='reach', color='brand')
     st.plotly_chart(fig, use_container_width=True, key="total_reach")
 
     st.markdown("#### New Ads (Total)")
-    ads_trend = df_filtered.groupby([pd.Grouper(key='startDateFormatted', freq='W'), 'brand']).size().reset_index(name='ads')
+    ads_trend = weekly_series(rollup, "Total", 'ads')
     fig = px.line(ads_trend, x='startDateFormatted', y='ads', color='brand')
     st.plotly_chart(fig, use_container_width=True, key="total_ads")
 
-# Fix platform list parsing
-
-def parse_platforms(val):
-    try:
-        if isinstance(val, str):
-            return ast.literal_eval(val)
-        elif isinstance(val, list):
-            return val
-    except Exception:
-        return []
-    return []
-
-
-exploded = df_filtered.copy()
-exploded['platforms'] = exploded['platforms'].apply(parse_platforms)
-exploded = exploded.explode('platforms')
-
 for i, platform in enumerate(platforms):
     with tabs[i + 1]:
         st.markdown(f"#### Reach – {platform}")
-        pf = exploded[exploded['platforms'] == platform]
+        pf_reach = weekly_series(rollup, platform, 'reach')
 
-        if pf.empty:
+        if pf_reach.empty:
             st.warning(f"No data available for {platform}.")
         else:
-            pf_reach = pf.groupby([pd.Grouper(key='startDateFormatted', freq='W'), 'brand'])['reach'].sum().reset_index()
             fig = px.line(pf_reach, x='startDateFormatted', y='reach', color='brand')
             st.plotly_chart(fig, use_container_width=True, key=f"reach_{platform}")
 
             st.markdown(f"#### New Ads – {platform}")
-            pf_ads = pf.groupby([pd.Grouper(key='startDateFormatted', freq='W'), 'brand']).size().reset_index(name='ads')
+            pf_ads = weekly_series(rollup, platform, 'ads')
             fig = px.line(pf_ads, x='startDateFormatted', y='ads', color='brand')
             st.plotly_chart(fig, use_container_width=True, key=f"ads_{platform}")
 
@@ -611,7 +720,7 @@ for i, platform in enumerate(platforms):
 
 st.header("Key Advantages")
 
-key_advantages_data = load_key_advantages_cached()
+key_advantages_data = load_key_advantages_cached(file_signature(os.path.join(KEY_ADVANTAGES_DIR, "key_advantages.xlsx")))
 
 if not key_advantages_data:
     st.info("No key advantages data loaded. Please ensure key_advantages.xlsx is in the data/key_advantages directory.")
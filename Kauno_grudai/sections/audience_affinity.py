@@ -2,7 +2,7 @@
 
 import streamlit as st
 import pandas as pd
-from utils.config import BRAND_NAME_MAPPING
+from utils import config
 from utils.file_io import load_audience_affinity_outputs
 
 def format_percentage(series):
@@ -44,7 +44,7 @@ def render(source: str = "pr"):
             return
 
         summary_df["Brand"] = summary_df["Brand"].map(
-            lambda x: BRAND_NAME_MAPPING.get(x, x)
+            lambda x: config.BRAND_NAME_MAPPING.get(x, x)
         )
 
         view_option = st.selectbox(
@@ -1,41 +1,47 @@
 import streamlit as st
 import plotly.express as px
-from utils.file_io import load_agility_data, load_agility_volume_map
-from utils.config import BRANDS
+from utils.file_io import load_agility_volume_map
+from utils.pr_context import PRContext
+from utils import config
 import pandas as pd
-from utils.date_utils import get_selected_date_range  # Add this import
+from utils.label_placement import label_annotations
 
-def render():
+# Label box as a share of the axis ranges: about 4 lines of 9px text on a plot
+# area roughly 370px high and 700px wide
+_LABEL_HEIGHT = 0.15
+_LABEL_WIDTH = 0.2
+
+def render(context: PRContext):
     st.subheader("🏷️ Brand Archetypes: Volume vs. Quality")
 
-    st.markdown("""
-    **Quality definition:** The Brand Mention Quality (BMQ) score is a measure of how well the brand is represented in the article. It takes into account the [PageRank]('https://en.wikipedia.org/wiki/PageRank') of the website, how often the brand is mentioned and where the brand is mentioned in the article. The BMQ score ranges from 0 to 1, where 1 is the best possible score.
-    """)
+    if config.COMPOS_NOTE:
+        st.markdown(config.COMPOS_NOTE)
+
+    if config.COMPOS_DEFINITIONS:
+        st.markdown("""
+        **Quality definition:** The Brand Mention Quality (BMQ) score is a measure of how well the brand is represented in the article. It takes into account the [PageRank]('https://en.wikipedia.org/wiki/PageRank') of the website, how often the brand is mentioned and where the brand is mentioned in the article. The BMQ score ranges from 0 to 1, where 1 is the best possible score.
+        """)
 
     summary = {}
 
     volume_map = load_agility_volume_map()
-    start_date, end_date = get_selected_date_range()  # Get selected date range
-
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is None or df.empty:
-            continue
-
-        # Filter by selected date range for volume and quality only
-        if "Published Date" in df.columns:
-            df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-            df = df.dropna(subset=["Published Date"])
-            df_filtered = df[(df["Published Date"] >= start_date) & (df["Published Date"] <= end_date)]
-        else:
-            df_filtered = df
 
-        volume = len(df_filtered)  # Use filtered count
-        quality = df_filtered["BMQ"].mean() if "BMQ" in df_filtered.columns and not df_filtered.empty else 0
-
-        # Top 3 archetypes: use ALL data, not date-filtered
-        if "Top Archetype" in df.columns and not df.empty:
-            vc = df["Top Archetype"].dropna().value_counts()
+    # Volume and quality come from the selected months, archetypes from all months
+    period = context.totals()
+    archetypes = context.cube["archetypes"]
+
+    for brand in context.brands:
+        volume = int(period["Volume"].get(brand, 0))
+        bmq_count = period["BMQ_count"].get(brand, 0)
+        # No BMQ scores in the period: quality 0, so the brand stays on the matrix
+        quality = period["BMQ_sum"].get(brand, 0) / bmq_count if bmq_count else 0
+
+        if "Top Archetype" in context.columns[brand]:
+            vc = (
+                archetypes[archetypes["Company"] == brand]
+                .groupby("Top Archetype")["Count"].sum()
+                .sort_values(ascending=False, kind="stable")
+            )
             total = int(vc.sum()) if vc.sum() else 0
             top3 = vc.head(3)
             archetype_text = "<br>".join([f"{a} ({(count/total*100 if total>0 else 0):.1f}%)" for a, count in top3.items()])
@@ -66,17 +72,27 @@ def render():
 
     fig.update_traces(textposition="top center", marker=dict(size=10))
 
-    for _, row in df_summary.iterrows():
-        fig.add_annotation(
-            x=row["Volume"],
-            y=row["Quality"],
-            text=f"<b>{row['Company']}</b><br>{row['Archetypes']}",
-            showarrow=False,
-            font=dict(size=9),
-            align="center",
-            bgcolor="white",
-            borderpad=4
-        )
+    # All labels in one batch, centred on their point unless they would overlap another
+    volume, quality = df_summary["Volume"], df_summary["Quality"]
+    label_height = _LABEL_HEIGHT * ((quality.max() - quality.min()) or 1)
+    labels = label_annotations(
+        volume,
+        quality,
+        [f"<b>{company}</b><br>{archetypes}" for company, archetypes in zip(df_summary["Company"], df_summary["Archetypes"])],
+        height=label_height,
+        width=_LABEL_WIDTH * ((volume.max() - volume.min()) or 1),
+        showarrow=False,
+        font=dict(size=9),
+        align="center",
+        bgcolor="white",
+        borderpad=4
+    )
+    fig.update_layout(annotations=labels)
+
+    # Autorange ignores annotations; make room for labels moved below the lowest point
+    lowest = min(label["y"] for label in labels)
+    if lowest < quality.min():
+        fig.update_yaxes(range=[lowest - label_height / 2, quality.max() + label_height / 2])
 
     fig.update_layout(
         xaxis_title="Volume (Articles)",
@@ -87,6 +103,7 @@ def render():
 
     st.plotly_chart(fig, use_container_width=True)
 
-    st.markdown(
-        'Read more about brand archetypes here: [Brandtypes](https://www.comp-os.com/brandtypes)'
-    )
+    if config.COMPOS_DEFINITIONS:
+        st.markdown(
+            'Read more about brand archetypes here: [Brandtypes](https://www.comp-os.com/brandtypes)'
+        )
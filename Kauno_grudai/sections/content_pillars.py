@@ -1,7 +1,7 @@
 # sections/content_pillars.py
 
 import streamlit as st
-from utils.config import BRAND_NAME_MAPPING
+from utils import config
 from utils.file_io import load_content_pillar_outputs
 
 def render():
@@ -19,7 +19,7 @@ def render():
 
         # Map keys to display names (do NOT exclude "__summary__")
         brand_keys = list(content_pillar_outputs.keys())
-        display_names = [BRAND_NAME_MAPPING.get(key, key) for key in brand_keys]
+        display_names = [config.BRAND_NAME_MAPPING.get(key, key) for key in brand_keys]
         brand_display_map = dict(zip(display_names, brand_keys))
 
         selected_display = st.selectbox("Select Brand", display_names)
@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.file_io import load_agility_data
-from utils.date_utils import get_selected_date_range
-from utils.config import BRANDS, BRAND_COLORS  # <-- add BRAND_COLORS
+from utils.pr_context import PRContext
+from utils import config
+from utils.lazy_tabs import lazy_tabs, tab_figure
+from utils.figure_cache import px_figure
 
 REGIONS = {
     "Total": None,
@@ -13,18 +13,20 @@ REGIONS = {
 }
 
 # ---- color helpers (consistent across all charts) ----
-_BRAND_ORDER = list(BRAND_COLORS.keys())
 _FALLBACK = "#BDBDBD"
 
+def _brand_order() -> list:
+    return list(config.BRAND_COLORS.keys())
+
 def _present_color_map(present_labels):
-    m = dict(BRAND_COLORS)
+    m = dict(config.BRAND_COLORS)
     for b in present_labels:
         if b not in m:
             m[b] = _FALLBACK
     return m
 # -----------------------------------------------------
 
-def render(mode: str = "by_brand"):
+def render(context: PRContext, mode: str = "by_brand"):
     """
     Display brand media coverage using pie charts.
     mode: 
@@ -37,105 +39,125 @@ def render(mode: str = "by_brand"):
 
     st.subheader("📰 Media Mentions Coverage Share")
 
-    # Removed long explanatory text per request
-
-    start_date, end_date = get_selected_date_range()
-
-    all_data = []
-
-    # Use normalized display names directly (already using BRANDS list order)
-
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is None or "Published Date" not in df.columns:
-            continue
+    if config.MEDIA_INTRO:
+        st.markdown(config.MEDIA_INTRO)
 
-        df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-        df = df.dropna(subset=["Published Date"])
-        df = df[(df["Published Date"] >= start_date) & (df["Published Date"] <= end_date)]
+    metrics = context.period("metrics")
+    metrics = metrics[metrics["Company"].isin(context.brands)]
 
-        if df.empty:
-            continue
-
-        df["Company"] = brand
-        all_data.append(df)
-
-    if not all_data:
+    if metrics.empty:
         st.warning("No data available for the selected period.")
         return
 
-    df_all = pd.concat(all_data, ignore_index=True)
+    # Articles and impressions per brand for the selected months
+    totals = metrics.groupby("Company")[["Volume", "Impressions"]].sum().reset_index()
+    counts = totals.rename(columns={"Volume": "Articles"})[["Company", "Articles"]]
+    has_impressions = any("Impressions" in context.columns[b] for b in totals["Company"])
+    reach = totals[["Company", "Impressions"]] if has_impressions else None
+
+    # Pies are built for the selected tab only and kept until the data or months change
+    def share_pie(region_counts, title):
+        _plot_share_pie(region_counts, title, key=(mode, title), version=context.version)
+
+    def reach_pie():
+        _plot_reach_pie(reach, title="Total Media Reach Share (Impressions)", key=(mode, "reach"), version=context.version)
 
     if mode == "by_brand":
-        tabs = st.tabs(["📰 Coverage", "📢 Reach"])
-        with tabs[0]:
-            _plot_share_pie(df_all, title="Total Media Coverage Share")
-        with tabs[1]:
-            _plot_reach_pie(df_all, title="Total Media Reach Share (Impressions)")
+        def render_tab(i, label):
+            if i == 0:
+                share_pie(counts, title="Total Media Coverage Share")
+            else:
+                reach_pie()
+
+        lazy_tabs(["📰 Coverage", "📢 Reach"], "media_coverage_by_brand", render_tab)
     else:  # by_brand_and_country
-        region_tabs = st.tabs([f"🌍 {region}" for region in REGIONS.keys()] + ["📢 Reach"])
-        for i, (region_name, country_filter) in enumerate(REGIONS.items()):
-            with region_tabs[i]:
-                region_df = df_all if country_filter is None else df_all[df_all["Country"] == country_filter]
-                if region_df.empty:
-                    st.info("No data for this region.")
-                    continue
-                _plot_share_pie(region_df, title=f"{region_name} Media Coverage Share")
-        # Reach tab (total impressions by brand)
-        with region_tabs[-1]:
-            _plot_reach_pie(df_all, title="Total Media Reach Share (Impressions)")
-
-def _plot_share_pie(df: pd.DataFrame, title: str):
-    counts = df.groupby("Company").size().reset_index(name="Articles")
+        regions = list(REGIONS.items())
+
+        def render_tab(i, label):
+            # Reach tab (total impressions by brand)
+            if i == len(regions):
+                reach_pie()
+                return
+            region_name, country_filter = regions[i]
+            if country_filter is None:
+                region_counts = counts
+            else:
+                countries = context.period("countries")
+                region_counts = (
+                    countries[countries["Country"] == country_filter]
+                    .groupby("Company")["Count"].sum()
+                    .reset_index(name="Articles")
+                )
+            if region_counts.empty:
+                st.info("No data for this region.")
+                return
+            share_pie(region_counts, title=f"{region_name} Media Coverage Share")
+
+        lazy_tabs([f"🌍 {region}" for region in REGIONS.keys()] + ["📢 Reach"], "media_coverage_by_region", render_tab)
+
+def _plot_share_pie(counts: pd.DataFrame, title: str, key=None, version=None):
+    """counts: one row per Company with its article count in 'Articles'.
+    With a key the figure is memoized per version (see utils.lazy_tabs.tab_figure)."""
+    counts = counts[counts["Articles"] > 0].copy()
     if counts.empty:
         st.info("No articles in the selected period.")
         return
     total = counts["Articles"].sum()
     counts["Percentage"] = (counts["Articles"] / total) * 100
 
-    present = counts["Company"].unique()
-    fig = px.pie(
-        counts,
-        names="Company",
-        values="Articles",
-        hover_data=["Percentage"],
-        labels={"Percentage": "% of Total"},
-        title=title,
-        color="Company",
-        color_discrete_map=_present_color_map(present),
-        category_orders={"Company": _BRAND_ORDER},
-    )
-    fig.update_traces(
-        textinfo="percent",
-        hovertemplate="%{label}: %{value} articles (%{customdata[0]:.1f}%)"
-    )
+    def build():
+        present = counts["Company"].unique()
+        return px_figure(
+            "pie",
+            counts,
+            names="Company",
+            values="Articles",
+            hover_data=["Percentage"],
+            labels={"Percentage": "% of Total"},
+            title=title,
+            color="Company",
+            color_discrete_map=_present_color_map(present),
+            category_orders={"Company": _brand_order()},
+            traces=dict(
+                textinfo="percent",
+                hovertemplate="%{label}: %{value} articles (%{customdata[0]:.1f}%)"
+            ),
+        )
+
+    fig = build() if key is None else tab_figure("media_coverage", key, version, build)
     st.plotly_chart(fig, use_container_width=True)
 
-def _plot_reach_pie(df: pd.DataFrame, title: str):
-    if "Impressions" not in df.columns:
+def _plot_reach_pie(reach: pd.DataFrame, title: str, key=None, version=None):
+    """reach: one row per Company with summed 'Impressions', or None if the data has none.
+    With a key the figure is memoized per version (see utils.lazy_tabs.tab_figure)."""
+    if reach is None:
         st.info("No Impressions data available.")
         return
-    reach = df.groupby("Company")["Impressions"].sum().reset_index()
+    reach = reach.copy()
     if reach.empty:
         st.info("No Impressions in the selected period.")
         return
     total_reach = reach["Impressions"].sum()
     reach["Percentage"] = (reach["Impressions"] / total_reach) * 100
 
-    present = reach["Company"].unique()
-    fig = px.pie(
-        reach,
-        names="Company",
-        values="Impressions",
-        hover_data=["Percentage"],
-        labels={"Percentage": "% of Total"},
-        title=title,
-        color="Company",
-        color_discrete_map=_present_color_map(present),
-        category_orders={"Company": _BRAND_ORDER},
-    )
-    fig.update_traces(
-        textinfo="percent",
-        hovertemplate="%{label}: %{value} impressions (%{customdata[0]:.1f}%)"
-    )
+    def build():
+        present = reach["Company"].unique()
+        return px_figure(
+            "pie",
+            reach,
+            names="Company",
+            values="Impressions",
+            hover_data=["Percentage"],
+            labels={"Percentage": "% of Total"},
+            title=title,
+            color="Company",
+            color_discrete_map=_present_color_map(present),
+            category_orders={"Company": _brand_order()},
+            traces=dict(
+                textinfo="percent",
+                hovertemplate="%{label}: %{value} impressions (%{customdata[0]:.1f}%)"
+            ),
+        )
+
+    fig = build() if key is None else tab_figure("media_coverage", key, version, build)
     st.plotly_chart(fig, use_container_width=True)
@@ -2,74 +2,39 @@ import streamlit as st
 import pandas as pd
 import os
 import glob
-from utils.file_io import load_agility_data
-from utils.config import BRANDS, DATA_ROOT, BRAND_COLORS
-from utils.date_utils import get_selected_date_range
+from utils.pr_context import PRContext
+from utils import config
+from utils.file_cache import file_cached
+from utils.brands import BrandCanonicalizer
+from utils.cards import simple_metric_card, card_grid
+from utils.lazy_tabs import lazy_tabs
 
-BRAND_ORDER = list(BRAND_COLORS.keys())
 DEFAULT_COLOR = "#BDBDBD"  # used for any brand not in BRAND_COLORS
 
-AGILITY_DIR = os.path.join(DATA_ROOT, "agility")
-CREATIVITY_PATH = os.path.join(DATA_ROOT, "creativity", "creativity_ranking.xlsx")
+# Relative to the tenant's DATA_ROOT
+AGILITY_DIR = "agility"
+CREATIVITY_FILE = os.path.join("creativity", "creativity_ranking.xlsx")
 
 
-def _normalize_brand(name: str) -> str:
-    """Normalize brand name for consistent matching."""
-    if not isinstance(name, str):
-        return ""
-    base = name.split("|")[0].strip()
-    cleaned = "".join(ch.lower() if (ch.isalnum() or ch.isspace()) else " " for ch in base)
-    normalized = " ".join(cleaned.split())
-    
-    # Apply brand mapping to normalize variants to canonical names
-    brand_mapping = {
-        "kaun": "kauno grudai",
-        "thermo": "thermo fisher",
-        "acme": "acme",
-        "ignitis": "ignitis", 
-        "sba": "sba"
-    }
-    
-    return brand_mapping.get(normalized, normalized)
-
-
-def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
-    """Format a metric card with optional percentage change and ranking."""
-    rank_color = "gray"
-    if rank_now is not None and total_ranks:
-        if int(rank_now) == 1:
-            rank_color = "green"
-        elif int(rank_now) == int(total_ranks):
-            rank_color = "red"
-    
-    pct_color = None
-    if pct is not None:
-        pct_color = "green" if pct > 0 else "red" if pct < 0 else "gray"
-    
-    pct_html = f'<p style="margin:0; color:{pct_color};">Δ {pct:.1f}%</p>' if pct is not None else ''
-    rank_html = f'<p style="margin:0; color:{rank_color};">Rank {int(rank_now)}</p>' if rank_now is not None else ''
-    
-    st.markdown(
-        f"""
-        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-            <h5 style="margin:0;">{label}</h5>
-            <h3 style="margin:5px 0;">{val}</h3>
-            {pct_html}
-            {rank_html}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+# Normalize brand names for consistent matching, mapping variants to canonical names
+_normalize_brand = BrandCanonicalizer(aliases={
+    "kaun": "kauno grudai",
+    "thermo": "thermo fisher",
+    "acme": "acme",
+    "ignitis": "ignitis",
+    "sba": "sba",
+})
 
 
-@st.cache_data(ttl=0)
+@file_cached(CREATIVITY_FILE)
 def _load_creativity():
     """Load creativity ranking data."""
-    if not os.path.exists(CREATIVITY_PATH):
+    creativity_path = os.path.join(config.DATA_ROOT, CREATIVITY_FILE)
+    if not os.path.exists(creativity_path):
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
     
     try:
-        df_cre = pd.read_excel(CREATIVITY_PATH, sheet_name="Overall Ranking")
+        df_cre = pd.read_excel(creativity_path, sheet_name="Overall Ranking")
         df_cre = df_cre.rename(columns={c: str(c).lower() for c in df_cre.columns})
         
         # Ensure required columns exist
@@ -87,13 +52,15 @@ def _load_creativity():
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
 
 
+@file_cached(os.path.join(AGILITY_DIR, "*_compos_analysis.xlsx"))
 def _load_brand_strength_from_agility_compos():
     """Load brand strength from agility compos files."""
     strength = {}
-    if not os.path.isdir(AGILITY_DIR):
+    agility_dir = os.path.join(config.DATA_ROOT, AGILITY_DIR)
+    if not os.path.isdir(agility_dir):
         return strength
     
-    for path in glob.glob(os.path.join(AGILITY_DIR, "*_compos_analysis.xlsx")):
+    for path in glob.glob(os.path.join(agility_dir, "*_compos_analysis.xlsx")):
         fname = os.path.basename(path)
         if fname.startswith("~$"):
             continue
@@ -116,33 +83,14 @@ def _load_brand_strength_from_agility_compos():
     return strength
 
 
-def _compute_pr_reach_totals():
+def _compute_pr_reach_totals(context: PRContext):
     """Compute total impressions (reach) for each brand from PR data."""
-    reach_totals = {}
-    start_date, end_date = get_selected_date_range()
-    
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is None or df.empty:
-            continue
-        
-        # Filter by date range
-        if "Published Date" in df.columns:
-            df['Published Date'] = pd.to_datetime(df['Published Date'], errors='coerce')
-            df = df[(df['Published Date'] >= start_date) & (df['Published Date'] <= end_date)]
-        
-        # Calculate total impressions
-        if "Impressions" in df.columns:
-            df["Impressions"] = pd.to_numeric(df["Impressions"], errors="coerce").fillna(0)
-            total_impressions = df["Impressions"].sum()
-            reach_totals[brand] = total_impressions
-        else:
-            reach_totals[brand] = 0
-    
-    return reach_totals
+    impressions = context.totals()["Impressions"]
+
+    return {brand: impressions.get(brand, 0) for brand in context.brands}
 
 
-def render():
+def render(context: PRContext):
     """Render the PR ranking section with metric cards."""
     st.markdown("### PR Performance Ranking")
     
@@ -161,7 +109,7 @@ def render():
     strength_map = _load_brand_strength_from_agility_compos()
     if strength_map:
         bs_df = pd.DataFrame({'brand': list(strength_map.keys()), 'strength': list(strength_map.values())})
-        bs_df['brand_norm'] = bs_df['brand'].apply(_normalize_brand)
+        bs_df['brand_norm'] = _normalize_brand.map(bs_df['brand'])
         bs_df['rank'] = bs_df['strength'].rank(ascending=False, method='min')
         bs_mean = bs_df['strength'].mean() if len(bs_df) else 0
         bs_df['delta_vs_mean_pct'] = ((bs_df['strength'] - bs_mean) / (bs_mean if bs_mean != 0 else 1)) * 100
@@ -170,7 +118,7 @@ def render():
         bs_mean = 0
     
     # Compute PR reach totals (impressions)
-    reach_totals = _compute_pr_reach_totals()
+    reach_totals = _compute_pr_reach_totals(context)
     
     # Build brand tabs from union of brands across sources
     pr_brands = set(reach_totals.keys())
@@ -246,71 +194,67 @@ def render():
     strength_ranks = strength_series.rank(ascending=False, method="min") if len(strength_series) else pd.Series(dtype=float)
     
     # Create brand tabs
-    brand_tabs = st.tabs(available_brands)
-    for i, brand_name in enumerate(available_brands):
-        with brand_tabs[i]:
-            col1, col2, col3 = st.columns(3)
-            
-            # PR Reach (Impressions)
-            with col1:
-                total_reach = int(aggregated_reach.get(brand_name, 0))
-                delta_mean_pct = ((total_reach - (reach_mean if reach_mean != 0 else 1)) / (reach_mean if reach_mean != 0 else 1)) * 100 if reach_mean != 0 else 0
-                rank_now = reach_ranks.get(brand_name, None) if len(reach_ranks) else None
-                _format_simple_metric_card(
-                    label="Reach",
-                    val=f"{total_reach:,}",
-                    pct=delta_mean_pct,
-                    rank_now=rank_now,
-                    total_ranks=len(reach_ranks) if len(reach_ranks) else None
-                )
-            
-            # Brand Strength
-            with col2:
-                if brand_name in aggregated_strength:
-                    strength = float(aggregated_strength[brand_name])
-                    rank_bs = int(strength_ranks.get(brand_name, 0))
-                    delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
-                    _format_simple_metric_card(
-                        label="Brand Strength",
-                        val=f"{strength:.1f}%",
-                        pct=delta_bs,
-                        rank_now=rank_bs,
-                        total_ranks=len(strength_ranks)
-                    )
-                else:
-                    _format_simple_metric_card("Brand Strength", "N/A")
-            
-            # Creativity
-            with col3:
-                if brand_name in aggregated_creativity:
-                    cre_row = aggregated_creativity[brand_name]
-                    score = cre_row['originality_score']
-                    rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
-                    delta_cre = float(cre_row['delta_vs_mean_pct']) if pd.notna(cre_row['delta_vs_mean_pct']) else None
-                    _format_simple_metric_card(
-                        label="Creativity",
-                        val=f"{score:.2f}",
-                        pct=delta_cre,
-                        rank_now=rank_cre,
-                        total_ranks=len(aggregated_creativity)
-                    )
-                else:
-                    _format_simple_metric_card("Creativity", "N/A")
+    def render_brand(i, brand_name):
+        # PR Reach (Impressions)
+        total_reach = int(aggregated_reach.get(brand_name, 0))
+        delta_mean_pct = ((total_reach - (reach_mean if reach_mean != 0 else 1)) / (reach_mean if reach_mean != 0 else 1)) * 100 if reach_mean != 0 else 0
+        rank_now = reach_ranks.get(brand_name, None) if len(reach_ranks) else None
+        reach_card = simple_metric_card(
+            label="Reach",
+            val=f"{total_reach:,}",
+            pct=delta_mean_pct,
+            rank_now=rank_now,
+            total_ranks=len(reach_ranks) if len(reach_ranks) else None
+        )
+        
+        # Brand Strength
+        if brand_name in aggregated_strength:
+            strength = float(aggregated_strength[brand_name])
+            rank_bs = int(strength_ranks.get(brand_name, 0))
+            delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
+            strength_card = simple_metric_card(
+                label="Brand Strength",
+                val=f"{strength:.1f}%",
+                pct=delta_bs,
+                rank_now=rank_bs,
+                total_ranks=len(strength_ranks)
+            )
+        else:
+            strength_card = simple_metric_card("Brand Strength", "N/A")
+        
+        # Creativity
+        if brand_name in aggregated_creativity:
+            cre_row = aggregated_creativity[brand_name]
+            score = cre_row['originality_score']
+            rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
+            delta_cre = float(cre_row['delta_vs_mean_pct']) if pd.notna(cre_row['delta_vs_mean_pct']) else None
+            creativity_card = simple_metric_card(
+                label="Creativity",
+                val=f"{score:.2f}",
+                pct=delta_cre,
+                rank_now=rank_cre,
+                total_ranks=len(aggregated_creativity)
+            )
+        else:
+            creativity_card = simple_metric_card("Creativity", "N/A")
+        card_grid([reach_card, strength_card, creativity_card])
+        
+        # Creativity Analysis section
+        if brand_name in aggregated_creativity:
+            cre_row = aggregated_creativity[brand_name]
+            score = cre_row['originality_score']
+            rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
+            just_text = str(cre_row['justification']) if pd.notna(cre_row['justification']) else ""
+            examples_text = str(cre_row['examples']) if pd.notna(cre_row['examples']) else ""
             
-            # Creativity Analysis section
-            if brand_name in aggregated_creativity:
-                cre_row = aggregated_creativity[brand_name]
-                score = cre_row['originality_score']
-                rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
-                just_text = str(cre_row['justification']) if pd.notna(cre_row['justification']) else ""
-                examples_text = str(cre_row['examples']) if pd.notna(cre_row['examples']) else ""
-                
-                if just_text or examples_text:
-                    st.markdown("#### Creativity Analysis")
-                    st.markdown(f"""
-                    <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-                        <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
-                        {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
-                        {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
-                    </div>
-                    """, unsafe_allow_html=True)
+            if just_text or examples_text:
+                st.markdown("#### Creativity Analysis")
+                st.markdown(f"""
+                <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
+                    <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
+                    {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
+                    {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
+                </div>
+                """, unsafe_allow_html=True)
+
+    lazy_tabs(available_brands, "pr_ranking_brands", render_brand)
@@ -2,81 +2,47 @@ import streamlit as st
 import pandas as pd
 import os
 import glob
-from utils.file_io import load_social_data
-from utils.config import BRANDS, DATA_ROOT, BRAND_COLORS, LINKEDIN_SLUG_TO_BRAND
-from utils.date_utils import get_selected_date_range
+from utils.file_io import get_social_brand_frames
+from utils import config
+from utils.date_utils import get_selected_date_range, filter_by_date_range
+from utils.file_cache import file_cached
+from utils.brands import BrandCanonicalizer
+from utils.cards import simple_metric_card, card_grid
+from utils.lazy_tabs import lazy_tabs
 
-BRAND_ORDER = list(BRAND_COLORS.keys())
 DEFAULT_COLOR = "#BDBDBD"  # used for any brand not in BRAND_COLORS
 
-SOCIAL_MEDIA_COMPOS_DIR = os.path.join(DATA_ROOT, "social_media", "compos")
-CREATIVITY_PATH = os.path.join(DATA_ROOT, "creativity", "social_media", "creativity_ranking.xlsx")
+# Relative to the tenant's DATA_ROOT
+SOCIAL_MEDIA_COMPOS_DIR = os.path.join("social_media", "compos")
+CREATIVITY_FILE = os.path.join("creativity", "social_media", "creativity_ranking.xlsx")
 
 
-def _normalize_brand(name: str) -> str:
-    """Normalize brand name for consistent matching."""
-    if not isinstance(name, str):
-        return ""
-    base = name.split("|")[0].strip()
-    cleaned = "".join(ch.lower() if (ch.isalnum() or ch.isspace()) else " " for ch in base)
-    normalized = " ".join(cleaned.split())
-    
-    # Apply brand mapping to normalize variants to canonical names
-    # This includes LinkedIn slug names from compos files
-    brand_mapping = {
-        "kaun": "kauno grudai",
-        "thermo": "thermo fisher",
-        "acme": "acme",
-        "ignitis": "ignitis", 
-        "sba": "sba",
-        # LinkedIn slug mappings from compos files
-        "acme grupe": "acme",
-        "ignitis grupe": "ignitis",
-        "kauno grudai": "kauno grudai",
-        "sba invent everyday": "sba",
-        "thermo fisher scientific": "thermo fisher"
-    }
-    
-    return brand_mapping.get(normalized, normalized)
+# Normalize brand names for consistent matching, mapping variants to canonical names.
+# Includes the LinkedIn slug names from compos files
+_normalize_brand = BrandCanonicalizer(aliases={
+    "kaun": "kauno grudai",
+    "thermo": "thermo fisher",
+    "acme": "acme",
+    "ignitis": "ignitis",
+    "sba": "sba",
+    # LinkedIn slug mappings from compos files
+    "acme grupe": "acme",
+    "ignitis grupe": "ignitis",
+    "kauno grudai": "kauno grudai",
+    "sba invent everyday": "sba",
+    "thermo fisher scientific": "thermo fisher",
+})
 
 
-def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
-    """Format a metric card with optional percentage change and ranking."""
-    rank_color = "gray"
-    if rank_now is not None and total_ranks:
-        if int(rank_now) == 1:
-            rank_color = "green"
-        elif int(rank_now) == int(total_ranks):
-            rank_color = "red"
-    
-    pct_color = None
-    if pct is not None:
-        pct_color = "green" if pct > 0 else "red" if pct < 0 else "gray"
-    
-    pct_html = f'<p style="margin:0; color:{pct_color};">Δ {pct:.1f}%</p>' if pct is not None else ''
-    rank_html = f'<p style="margin:0; color:{rank_color};">Rank {int(rank_now)}</p>' if rank_now is not None else ''
-    
-    st.markdown(
-        f"""
-        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-            <h5 style="margin:0;">{label}</h5>
-            <h3 style="margin:5px 0;">{val}</h3>
-            {pct_html}
-            {rank_html}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-
-@st.cache_data(ttl=0)
+@file_cached(CREATIVITY_FILE)
 def _load_creativity():
     """Load creativity ranking data."""
-    if not os.path.exists(CREATIVITY_PATH):
+    creativity_path = os.path.join(config.DATA_ROOT, CREATIVITY_FILE)
+    if not os.path.exists(creativity_path):
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
     
     try:
-        df_cre = pd.read_excel(CREATIVITY_PATH, sheet_name="Overall Ranking")
+        df_cre = pd.read_excel(creativity_path, sheet_name="Overall Ranking")
         df_cre = df_cre.rename(columns={c: str(c).lower() for c in df_cre.columns})
         
         # Ensure required columns exist
@@ -94,10 +60,12 @@ def _load_creativity():
         return pd.DataFrame(columns=['brand', 'rank', 'originality_score', 'justification', 'examples'])
 
 
+@file_cached(os.path.join(SOCIAL_MEDIA_COMPOS_DIR, "*_compos_analysis.xlsx"))
 def _load_brand_strength_from_social_compos():
     """Load brand strength from social media compos files."""
     strength = {}
-    if not os.path.isdir(SOCIAL_MEDIA_COMPOS_DIR):
+    compos_dir = os.path.join(config.DATA_ROOT, SOCIAL_MEDIA_COMPOS_DIR)
+    if not os.path.isdir(compos_dir):
         return strength
     
     # Map LinkedIn slug filenames to canonical brand names
@@ -109,7 +77,7 @@ def _load_brand_strength_from_social_compos():
         "thermo-fisher-scientific": "Thermo Fisher"
     }
     
-    for path in glob.glob(os.path.join(SOCIAL_MEDIA_COMPOS_DIR, "*_compos_analysis.xlsx")):
+    for path in glob.glob(os.path.join(compos_dir, "*_compos_analysis.xlsx")):
         fname = os.path.basename(path)
         if fname.startswith("~$"):
             continue
@@ -142,15 +110,15 @@ def _compute_linkedin_engagement_totals():
     start_date, end_date = get_selected_date_range()
     
     # Use LinkedIn slug to brand mapping
-    for linkedin_slug, brand_display in LINKEDIN_SLUG_TO_BRAND.items():
-        df = load_social_data(linkedin_slug, "linkedin")
+    brand_frames = get_social_brand_frames("linkedin", config.LINKEDIN_SLUG_TO_BRAND)
+    for linkedin_slug, brand_display in config.LINKEDIN_SLUG_TO_BRAND.items():
+        df = brand_frames.get(linkedin_slug)
         if df is None or df.empty:
             continue
         
         # Filter by date range
         if "Published Date" in df.columns:
-            df['Published Date'] = pd.to_datetime(df['Published Date'], errors='coerce')
-            df = df[(df['Published Date'] >= start_date) & (df['Published Date'] <= end_date)]
+            df = filter_by_date_range(df, start_date, end_date)
         
         # Calculate total engagement (same formula as volume_engagement_trends)
         if not df.empty:
@@ -182,7 +150,7 @@ def render():
     strength_map = _load_brand_strength_from_social_compos()
     if strength_map:
         bs_df = pd.DataFrame({'brand': list(strength_map.keys()), 'strength': list(strength_map.values())})
-        bs_df['brand_norm'] = bs_df['brand'].apply(_normalize_brand)
+        bs_df['brand_norm'] = _normalize_brand.map(bs_df['brand'])
         bs_df['rank'] = bs_df['strength'].rank(ascending=False, method='min')
         bs_mean = bs_df['strength'].mean() if len(bs_df) else 0
         bs_df['delta_vs_mean_pct'] = ((bs_df['strength'] - bs_mean) / (bs_mean if bs_mean != 0 else 1)) * 100
@@ -267,71 +235,67 @@ def render():
     strength_ranks = strength_series.rank(ascending=False, method="min") if len(strength_series) else pd.Series(dtype=float)
     
     # Create brand tabs
-    brand_tabs = st.tabs(available_brands)
-    for i, brand_name in enumerate(available_brands):
-        with brand_tabs[i]:
-            col1, col2, col3 = st.columns(3)
-            
-            # Social Media Engagement
-            with col1:
-                total_engagement = int(aggregated_engagement.get(brand_name, 0))
-                delta_mean_pct = ((total_engagement - (engagement_mean if engagement_mean != 0 else 1)) / (engagement_mean if engagement_mean != 0 else 1)) * 100 if engagement_mean != 0 else 0
-                rank_now = engagement_ranks.get(brand_name, None) if len(engagement_ranks) else None
-                _format_simple_metric_card(
-                    label="Engagement",
-                    val=f"{total_engagement:,}",
-                    pct=delta_mean_pct,
-                    rank_now=rank_now,
-                    total_ranks=len(engagement_ranks) if len(engagement_ranks) else None
-                )
-            
-            # Brand Strength
-            with col2:
-                if brand_name in aggregated_strength:
-                    strength = float(aggregated_strength[brand_name])
-                    rank_bs = int(strength_ranks.get(brand_name, 0))
-                    delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
-                    _format_simple_metric_card(
-                        label="Brand Strength",
-                        val=f"{strength:.1f}%",
-                        pct=delta_bs,
-                        rank_now=rank_bs,
-                        total_ranks=len(strength_ranks)
-                    )
-                else:
-                    _format_simple_metric_card("Brand Strength", "N/A")
-            
-            # Creativity
-            with col3:
-                if brand_name in aggregated_creativity:
-                    cre_row = aggregated_creativity[brand_name]
-                    score = cre_row['originality_score']
-                    rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
-                    delta_cre = float(cre_row['delta_vs_mean_pct']) if pd.notna(cre_row['delta_vs_mean_pct']) else None
-                    _format_simple_metric_card(
-                        label="Creativity",
-                        val=f"{score:.2f}",
-                        pct=delta_cre,
-                        rank_now=rank_cre,
-                        total_ranks=len(aggregated_creativity)
-                    )
-                else:
-                    _format_simple_metric_card("Creativity", "N/A")
+    def render_brand(i, brand_name):
+        # Social Media Engagement
+        total_engagement = int(aggregated_engagement.get(brand_name, 0))
+        delta_mean_pct = ((total_engagement - (engagement_mean if engagement_mean != 0 else 1)) / (engagement_mean if engagement_mean != 0 else 1)) * 100 if engagement_mean != 0 else 0
+        rank_now = engagement_ranks.get(brand_name, None) if len(engagement_ranks) else None
+        engagement_card = simple_metric_card(
+            label="Engagement",
+            val=f"{total_engagement:,}",
+            pct=delta_mean_pct,
+            rank_now=rank_now,
+            total_ranks=len(engagement_ranks) if len(engagement_ranks) else None
+        )
+        
+        # Brand Strength
+        if brand_name in aggregated_strength:
+            strength = float(aggregated_strength[brand_name])
+            rank_bs = int(strength_ranks.get(brand_name, 0))
+            delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
+            strength_card = simple_metric_card(
+                label="Brand Strength",
+                val=f"{strength:.1f}%",
+                pct=delta_bs,
+                rank_now=rank_bs,
+                total_ranks=len(strength_ranks)
+            )
+        else:
+            strength_card = simple_metric_card("Brand Strength", "N/A")
+        
+        # Creativity
+        if brand_name in aggregated_creativity:
+            cre_row = aggregated_creativity[brand_name]
+            score = cre_row['originality_score']
+            rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
+            delta_cre = float(cre_row['delta_vs_mean_pct']) if pd.notna(cre_row['delta_vs_mean_pct']) else None
+            creativity_card = simple_metric_card(
+                label="Creativity",
+                val=f"{score:.2f}",
+                pct=delta_cre,
+                rank_now=rank_cre,
+                total_ranks=len(aggregated_creativity)
+            )
+        else:
+            creativity_card = simple_metric_card("Creativity", "N/A")
+        card_grid([engagement_card, strength_card, creativity_card])
+        
+        # Creativity Analysis section
+        if brand_name in aggregated_creativity:
+            cre_row = aggregated_creativity[brand_name]
+            score = cre_row['originality_score']
+            rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
+            just_text = str(cre_row['justification']) if pd.notna(cre_row['justification']) else ""
+            examples_text = str(cre_row['examples']) if pd.notna(cre_row['examples']) else ""
             
-            # Creativity Analysis section
-            if brand_name in aggregated_creativity:
-                cre_row = aggregated_creativity[brand_name]
-                score = cre_row['originality_score']
-                rank_cre = int(cre_row['rank']) if pd.notna(cre_row['rank']) else None
-                just_text = str(cre_row['justification']) if pd.notna(cre_row['justification']) else ""
-                examples_text = str(cre_row['examples']) if pd.notna(cre_row['examples']) else ""
-                
-                if just_text or examples_text:
-                    st.markdown("#### Creativity Analysis")
-                    st.markdown(f"""
-                    <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-                        <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
-                        {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
-                        {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
-                    </div>
-                    """, unsafe_allow_html=True)
+            if just_text or examples_text:
+                st.markdown("#### Creativity Analysis")
+                st.markdown(f"""
+                <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
+                    <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
+                    {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
+                    {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
+                </div>
+                """, unsafe_allow_html=True)
+
+    lazy_tabs(available_brands, "social_media_ranking_brands", render_brand)
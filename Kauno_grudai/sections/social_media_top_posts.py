@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
-from utils.config import FACEBOOK_NAME_TO_BRAND, LINKEDIN_SLUG_TO_BRAND
-from utils.date_utils import get_selected_date_range
-from utils.file_io import load_social_data
+from utils import config
+from utils.date_utils import get_selected_date_range, filter_by_date_range
+from utils.file_io import get_social_brand_frames
 
 POST_TEXT_COLUMNS = ["Post", "post_text", "content"]
 
@@ -12,20 +12,23 @@ def render(selected_platforms=None):
 
     st.subheader("🏆 Top Social Media Posts")
 
+    if config.SOCIAL_TAKEAWAYS:
+        st.markdown(config.SOCIAL_TAKEAWAYS)
+
     start_date, end_date = get_selected_date_range()
 
     for platform in selected_platforms:
         st.markdown(f"### {platform.capitalize()}")
         all_posts = []
 
-        platform_map = FACEBOOK_NAME_TO_BRAND if platform == "facebook" else LINKEDIN_SLUG_TO_BRAND
+        platform_map = config.FACEBOOK_NAME_TO_BRAND if platform == "facebook" else config.LINKEDIN_SLUG_TO_BRAND
+        brand_frames = get_social_brand_frames(platform, platform_map)
         for identifier, brand_display in platform_map.items():
-            df = load_social_data(identifier, platform)
+            df = brand_frames.get(identifier)
             if df is None or df.empty or "Published Date" not in df.columns:
                 continue
 
-            df = df.dropna(subset=["Published Date"])
-            df = df[(df["Published Date"] >= start_date) & (df["Published Date"] <= end_date)]
+            df = filter_by_date_range(df, start_date, end_date)
             if df.empty:
                 continue
 
@@ -38,16 +41,16 @@ def render(selected_platforms=None):
                 continue
 
             if platform == "facebook":
-                df["Engagement"] = (
+                df = df.assign(Engagement=(
                     df.get("likes", 0).fillna(0) +
                     df.get("num_comments", 0).fillna(0) * 3 +
                     df.get("num_shares", 0).fillna(0) * 5
-                )
+                ))
             elif platform == "linkedin":
-                df["Engagement"] = (
+                df = df.assign(Engagement=(
                     df.get("num_likes", 0).fillna(0) +
                     df.get("num_comments", 0).fillna(0) * 3
-                )
+                ))
             else:
                 continue
 
@@ -90,3 +93,5 @@ def render(selected_platforms=None):
                     st.markdown(brand_df.head(5).to_markdown(index=False), unsafe_allow_html=True)
 
         st.markdown("---")
+        if platform in config.SOCIAL_POST_SUMMARIES:
+            st.markdown(config.SOCIAL_POST_SUMMARIES[platform])
@@ -1,14 +1,11 @@
 import os
 import pandas as pd
 import streamlit as st
-from utils.config import DATA_ROOT, BRAND_NAME_MAPPING, BRANDS, BRAND_COLORS
+from utils import config
+from utils.file_cache import file_cached
+from utils.brands import BrandCanonicalizer
 
-def _normalize_brand(name: str) -> str:
-    if not isinstance(name, str):
-        return ""
-    base = name.split("|")[0].strip()
-    cleaned = "".join(ch.lower() if (ch.isalnum() or ch.isspace()) else " " for ch in base)
-    return " ".join(cleaned.split())
+_normalize_brand = BrandCanonicalizer()
 
 def _get_compos_file_path(source: str, brand: str) -> str:
     """
@@ -16,9 +13,9 @@ def _get_compos_file_path(source: str, brand: str) -> str:
     source: 'pr', 'linkedin', or 'facebook'
     """
     if source == "pr":
-        folder = os.path.join(DATA_ROOT, "agility")
+        folder = os.path.join(config.DATA_ROOT, "agility")
     elif source in {"linkedin", "facebook"}:
-        folder = os.path.join(DATA_ROOT, "social_media", "compos")
+        folder = os.path.join(config.DATA_ROOT, "social_media", "compos")
     else:
         return None
     # Try matching by normalized brand name
@@ -31,6 +28,10 @@ def _get_compos_file_path(source: str, brand: str) -> str:
             return os.path.join(folder, fname)
     return None
 
+@file_cached(
+    os.path.join("agility", "*_compos_analysis.xlsx"),
+    os.path.join("social_media", "compos", "*_compos_analysis.xlsx"),
+)
 def load_top_3_archetypes(source: str, brand: str):
     """
     Loads the top 3 archetypes for a brand from the compos analysis file for the given source.
@@ -1,91 +1,78 @@
 import streamlit as st
 import pandas as pd
-from utils.file_io import load_agility_data
-from utils.date_utils import get_selected_date_range
-from utils.config import BRANDS
+from utils.pr_context import PRContext
+from utils.topics import TOPIC_COLUMNS, top_topics
+from utils import config
+from utils.lazy_tabs import lazy_tabs
 
-TOPIC_COLUMNS = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
-
-def render() -> None:
+def render(context: PRContext) -> None:
     """
     Render a display of top 5 content topics from Agility data.
     Tabs: Combined + per-brand, all with article counts.
     """
     st.subheader("🧠 Key Communication Topics")
-    start_date, end_date = get_selected_date_range()
+    volumes = context.totals()["Volume"]
+    topics = context.period("topics")
 
-    company_data = {}
     brand_counts = {}
 
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is None or "Published Date" not in df.columns:
-            continue
-
-        df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-        df = df.dropna(subset=["Published Date"])
-        df = df[(df["Published Date"] >= start_date) & (df["Published Date"] <= end_date)]
-
-        if df.empty or not all(col in df.columns for col in TOPIC_COLUMNS):
+    for brand in context.brands:
+        if volumes.get(brand, 0) == 0 or not all(col in context.columns[brand] for col in TOPIC_COLUMNS):
             continue
+        brand_counts[brand] = int(volumes[brand])
 
-        company_data[brand] = df
-        brand_counts[brand] = len(df)
-
-    if not company_data:
+    if not brand_counts:
         st.warning("No topic data available for the selected period.")
         return
 
     # Total article count
     total_articles = sum(brand_counts.values())
 
-    tabs = st.tabs(
+    # Top 5 per brand and overall in one pass over the Topic x brand matrix
+    top = top_topics(extract_topics(topics, list(brand_counts)), k=5)
+
+    def render_tab(i, label):
+        # Tab 0: Combined
+        if i == 0:
+            st.markdown("**Top topics across all brands.**")
+            display_top_topics(top["All"])
+            return
+        # Per-brand tabs
+        brand = config.BRANDS[i - 1]
+        if brand not in brand_counts:
+            st.info(f"No topic data for {brand}.")
+            return
+        st.markdown(f"**Top topics for {brand}**")
+        display_top_topics(top[brand])
+
+    lazy_tabs(
         [f"🌍 All Brands ({total_articles})"] +
-        [f"🏢 {brand} ({brand_counts.get(brand, 0)})" for brand in BRANDS]
+        [f"🏢 {brand} ({brand_counts.get(brand, 0)})" for brand in config.BRANDS],
+        "topical_analysis_brands",
+        render_tab,
     )
 
-    # Tab 0: Combined
-    with tabs[0]:
-        st.markdown("**Top topics across all brands.**")
-        combined_counts = extract_topics(company_data)
-        display_top_topics(combined_counts)
-
-    # Per-brand tabs
-    for i, brand in enumerate(BRANDS, start=1):
-        with tabs[i]:
-            if brand not in company_data:
-                st.info(f"No topic data for {brand}.")
-                continue
-            st.markdown(f"**Top topics for {brand}**")
-            brand_counts = extract_topics({brand: company_data[brand]})
-            display_top_topics(brand_counts)
-
 
-def extract_topics(dataframes_dict: dict) -> dict:
+def extract_topics(topics: pd.DataFrame, brands: list) -> pd.DataFrame:
     """
-    Extract and count topic mentions from cluster columns.
+    Topic x brand mention counts from the PR cube's topic table for the given brands.
     """
-    topic_counts = {}
-    for df in dataframes_dict.values():
-        for col in TOPIC_COLUMNS:
-            for topic in df[col].dropna():
-                topic = str(topic).strip()
-                if topic:
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
-    return topic_counts
+    selected = topics[topics["Company"].isin(brands)]
+    matrix = selected.pivot_table(index="Topic", columns="Company", values="Count", aggfunc="sum", fill_value=0)
+    return matrix.reindex(columns=brands, fill_value=0)
 
-def display_top_topics(topic_counts: dict) -> None:
+def display_top_topics(topic_summary: dict) -> None:
     """
     Show the top 5 topics in a block format.
+    topic_summary: one entry of utils.topics.top_topics()
     """
-    if not topic_counts:
+    if not topic_summary["top"]:
         st.info("No topics found.")
         return
 
-    total = sum(topic_counts.values())
-    top_5 = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    total = topic_summary["total"]
 
-    for topic, count in top_5:
+    for topic, count in topic_summary["top"]:
         pct = (count / total) * 100 if total > 0 else 0
         st.markdown(
             f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; '
@@ -1,16 +1,17 @@
 import streamlit as st
 import pandas as pd
 import os
-from utils.config import DATA_ROOT  # <-- import here
+from utils import config
 
-TOPIC_INSIGHTS_PATH = os.path.join(DATA_ROOT, "agility", "topic_insights.xlsx")
+TOPIC_INSIGHTS_FILE = os.path.join("agility", "topic_insights.xlsx")
 
 def load_topic_insights():
-    if not os.path.exists(TOPIC_INSIGHTS_PATH):
+    topic_insights_path = os.path.join(config.DATA_ROOT, TOPIC_INSIGHTS_FILE)
+    if not os.path.exists(topic_insights_path):
         st.error("topic_insights.xlsx not found in agility folder.")
         return None
     try:
-        df = pd.read_excel(TOPIC_INSIGHTS_PATH)
+        df = pd.read_excel(topic_insights_path)
         return df
     except Exception as e:
         st.error(f"Error loading topic_insights.xlsx: {e}")
@@ -1,23 +1,25 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.config import BRAND_COLORS, FACEBOOK_NAME_TO_BRAND, LINKEDIN_SLUG_TO_BRAND
-from utils.date_utils import get_selected_date_range
-from utils.file_io import load_social_data
+from utils import config
+from utils.date_utils import get_selected_date_range, filter_by_date_range
+from utils.file_io import get_social_brand_frames
+from utils.figure_cache import px_figure
 
 PLATFORMS = ["facebook", "linkedin"]
 
 # --- color helpers ---
 _ALL_BRANDS = "All Brands"  # not used here, but reserved if you add a combined series later
 _FALLBACK = "#BDBDBD"
-_CATEGORY_ORDER = list(BRAND_COLORS.keys())
 
 def _normalized(df: pd.DataFrame) -> pd.DataFrame:
     # Company values already set to normalized display names via platform maps
     return df.copy()
 
+def _category_order() -> list:
+    return list(config.BRAND_COLORS.keys())
+
 def _present_color_map(present_labels) -> dict:
-    m = dict(BRAND_COLORS)
+    m = dict(config.BRAND_COLORS)
     for b in present_labels:
         if b not in m:
             m[b] = _FALLBACK
@@ -50,24 +52,19 @@ def render(selected_platforms=None):
             "Engagement_Per_Follower": []
         }
 
-        platform_map = FACEBOOK_NAME_TO_BRAND if platform == "facebook" else LINKEDIN_SLUG_TO_BRAND
+        platform_map = config.FACEBOOK_NAME_TO_BRAND if platform == "facebook" else config.LINKEDIN_SLUG_TO_BRAND
+        brand_frames = get_social_brand_frames(platform, platform_map)
         for identifier, brand_display in platform_map.items():
-            df = load_social_data(identifier, platform)
+            df = brand_frames.get(identifier)
             if df is None or df.empty or "Published Date" not in df.columns:
                 continue
 
-            df = df.dropna(subset=["Published Date"])
-            df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-            df = df.dropna(subset=["Published Date"])
-            if df.empty:
-                continue
-
             # filter to selected window
-            df = df[(df["Published Date"] >= start_date) & (df["Published Date"] <= end_date)]
+            df = filter_by_date_range(df, start_date, end_date)
             if df.empty:
                 continue
 
-            df["Month"] = df["Published Date"].dt.to_period("M")
+            df = df.assign(Month=df["Published Date"].dt.to_period("M"))
 
             for period in months:
                 month_df = df[df["Month"] == period]
@@ -110,7 +107,8 @@ def render(selected_platforms=None):
         # Volume
         with tab1:
             df_plot = _normalized(df_combined)  # normalize Company -> BRAND_COLORS keys
-            fig_volume = px.line(
+            fig_volume = px_figure(
+                "line",
                 df_plot,
                 x="Month",
                 y="Volume",
@@ -118,15 +116,16 @@ def render(selected_platforms=None):
                 markers=True,
                 title=f"{platform.capitalize()} - Monthly Post Volume",
                 color_discrete_map=_present_color_map(df_plot["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
+                category_orders={"Company": _category_order()},
+                layout=dict(xaxis=dict(categoryorder="array", categoryarray=month_labels)),
             )
-            fig_volume.update_layout(xaxis=dict(categoryorder="array", categoryarray=month_labels))
             st.plotly_chart(fig_volume, use_container_width=True)
 
         # Engagement
         with tab2:
             df_plot = _normalized(df_combined)
-            fig_engagement = px.line(
+            fig_engagement = px_figure(
+                "line",
                 df_plot,
                 x="Month",
                 y="Engagement",
@@ -134,15 +133,16 @@ def render(selected_platforms=None):
                 markers=True,
                 title=f"{platform.capitalize()} - Monthly Engagement Trend",
                 color_discrete_map=_present_color_map(df_plot["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
+                category_orders={"Company": _category_order()},
+                layout=dict(xaxis=dict(categoryorder="array", categoryarray=month_labels)),
             )
-            fig_engagement.update_layout(xaxis=dict(categoryorder="array", categoryarray=month_labels))
             st.plotly_chart(fig_engagement, use_container_width=True)
 
         # Engagement per Follower
         with tab3:
             df_plot = _normalized(df_combined)
-            fig_epf = px.line(
+            fig_epf = px_figure(
+                "line",
                 df_plot,
                 x="Month",
                 y="Engagement_Per_Follower",
@@ -150,7 +150,7 @@ def render(selected_platforms=None):
                 markers=True,
                 title=f"{platform.capitalize()} - Engagement per Follower",
                 color_discrete_map=_present_color_map(df_plot["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
+                category_orders={"Company": _category_order()},
+                layout=dict(xaxis=dict(categoryorder="array", categoryarray=month_labels)),
             )
-            fig_epf.update_layout(xaxis=dict(categoryorder="array", categoryarray=month_labels))
             st.plotly_chart(fig_epf, use_container_width=True)
@@ -1,12 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.file_io import load_agility_data
-from utils.config import BRANDS, BRAND_COLORS   # <-- normalized display names
-from pandas.tseries.offsets import MonthEnd
-
-# --- name normalization: short -> long (matches BRAND_COLORS keys) ---
-NAME_MAP = {b: b for b in BRANDS}
+from utils.pr_context import PRContext
+from utils.lazy_tabs import lazy_tabs, tab_figure
+from utils.figure_cache import px_figure
+from utils import config   # BRANDS / BRAND_COLORS hold normalized display names
 
 # --- color helpers ---
 _ALL_BRANDS_LABEL = "All Brands"
@@ -17,12 +14,13 @@ def _normalized(df: pd.DataFrame) -> pd.DataFrame:
     if "Company" not in df.columns:
         return df
     out = df.copy()
-    out["Company"] = out["Company"].replace(NAME_MAP)
+    # name normalization: short -> long (matches BRAND_COLORS keys)
+    out["Company"] = out["Company"].replace({b: b for b in config.BRANDS})
     return out
 
 def _present_color_map(present_labels) -> dict:
     """Color map covering present labels + neutral for 'All Brands'."""
-    m = dict(BRAND_COLORS)
+    m = dict(config.BRAND_COLORS)
     if _ALL_BRANDS_LABEL in present_labels:
         m[_ALL_BRANDS_LABEL] = _FALLBACK
     # If any unexpected names appear, give them fallback too.
@@ -31,10 +29,11 @@ def _present_color_map(present_labels) -> dict:
             m[b] = _FALLBACK
     return m
 
-_CATEGORY_ORDER = list(BRAND_COLORS.keys()) + [_ALL_BRANDS_LABEL]
+def _category_order() -> list:
+    return list(config.BRAND_COLORS.keys()) + [_ALL_BRANDS_LABEL]
 # ---------------------------------------------------------------
 
-def render(mode: str = "by_company"):
+def render(context: PRContext, mode: str = "by_company"):
     """
     Plot article volume trends by month.
     mode = "by_company" → lines per brand
@@ -46,95 +45,63 @@ def render(mode: str = "by_company"):
 
     st.subheader("📈 Monthly Media Mention Trends")
 
-    # Determine min/max dates from all brands' data
-    all_dates = []
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is not None and "Published Date" in df.columns:
-            df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-            all_dates.extend(df["Published Date"].dropna().tolist())
+    metrics = context.cube["metrics"]
 
-    if not all_dates:
+    # Determine min/max months from all brands' data
+    if metrics.empty:
         st.warning("No data available for volume trends.")
         return
 
-    start_month = pd.Timestamp(min(all_dates)).replace(day=1)
-    end_month = pd.Timestamp(max(all_dates)).replace(day=1)
-    months = pd.date_range(start=start_month, end=end_month, freq="MS")
+    months = pd.date_range(start=metrics["Month"].min(), end=metrics["Month"].max(), freq="MS")
 
     # Initialize data structures
     volume_data, impressions_data, bmq_data = [], [], []
 
-    for brand in BRANDS:
-        df = load_agility_data(brand)
-        if df is None or "Published Date" not in df.columns:
-            continue
-
-        df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-        df = df.dropna(subset=["Published Date"])
-
-        if df.empty:
+    for brand in context.brands:
+        brand_metrics = metrics[metrics["Company"] == brand].set_index("Month")
+        if brand_metrics.empty:
             continue
 
-        df["Month"] = df["Published Date"].dt.to_period("M").dt.to_timestamp()
-
         # Volume (article count)
-        monthly_counts = df.groupby("Month").size().reindex(months, fill_value=0)
+        monthly_counts = brand_metrics["Volume"].reindex(months, fill_value=0)
 
         # Impressions
-        if "Impressions" in df.columns:
-            df["Impressions"] = pd.to_numeric(df["Impressions"], errors="coerce").fillna(0)
-            monthly_impressions = df.groupby("Month")["Impressions"].sum().reindex(months, fill_value=0)
-        else:
-            monthly_impressions = pd.Series(0, index=months)
+        monthly_impressions = brand_metrics["Impressions"].reindex(months, fill_value=0)
 
         # BMQ
-        if "BMQ" in df.columns:
-            df["BMQ"] = pd.to_numeric(df["BMQ"], errors="coerce")
-            monthly_bmq = df.groupby("Month")["BMQ"].mean().reindex(months, fill_value=0)
+        if "BMQ" in context.columns[brand]:
+            monthly_bmq = (brand_metrics["BMQ_sum"] / brand_metrics["BMQ_count"].where(brand_metrics["BMQ_count"] > 0)).reindex(months, fill_value=0)
         else:
             monthly_bmq = pd.Series(0, index=months)
 
-        if mode == "by_company":
-            for month, count in monthly_counts.items():
-                volume_data.append({"Month": month, "Company": brand, "Volume": count})
-            for month, impressions in monthly_impressions.items():
-                impressions_data.append({"Month": month, "Company": brand, "Impressions": impressions})
-            for month, bmq in monthly_bmq.items():
-                bmq_data.append({"Month": month, "Company": brand, "BMQ": bmq})
-        else:  # combined
-            for month, count in monthly_counts.items():
-                volume_data.append({"Month": month, "Company": _ALL_BRANDS_LABEL, "Volume": count if brand == BRANDS[0] else 0})
-            for month, impressions in monthly_impressions.items():
-                impressions_data.append({"Month": month, "Company": _ALL_BRANDS_LABEL, "Impressions": impressions if brand == BRANDS[0] else 0})
-            for month, bmq in monthly_bmq.items():
-                bmq_data.append({"Month": month, "Company": _ALL_BRANDS_LABEL, "BMQ": bmq if brand == BRANDS[0] else 0})
-
-    # Tabs
-    tab1, tab2, tab3 = st.tabs(["📊 Volume", "👁️ Impressions", "⭐ BMQ"])
-
-    # Volume Tab
-    with tab1:
-        if not volume_data:
-            st.warning("No volume data found.")
-        else:
-            df_volume = pd.DataFrame(volume_data)
-            if mode == "combined":
-                df_volume = df_volume.groupby("Month", as_index=False).agg({"Volume": "sum"})
-                df_volume["Company"] = _ALL_BRANDS_LABEL
-
-            df_volume = _normalized(df_volume)  # <-- normalize names
-            fig_volume = px.line(
-                df_volume,
-                x="Month",
-                y="Volume",
-                color="Company",
-                markers=True,
-                title="Monthly Trend of Media Mentions",
-                color_discrete_map=_present_color_map(df_volume["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
-            )
-            fig_volume.update_layout(
+        # In combined mode every brand is added under one label and summed per month below
+        label = brand if mode == "by_company" else _ALL_BRANDS_LABEL
+        for month, count in monthly_counts.items():
+            volume_data.append({"Month": month, "Company": label, "Volume": count})
+        for month, impressions in monthly_impressions.items():
+            impressions_data.append({"Month": month, "Company": label, "Impressions": impressions})
+        for month, bmq in monthly_bmq.items():
+            bmq_data.append({"Month": month, "Company": label, "BMQ": bmq})
+
+    # Figures are built for the selected tab only and kept until the PR data changes
+    def build_volume():
+        df_volume = pd.DataFrame(volume_data)
+        if mode == "combined":
+            df_volume = df_volume.groupby("Month", as_index=False).agg({"Volume": "sum"})
+            df_volume["Company"] = _ALL_BRANDS_LABEL
+
+        df_volume = _normalized(df_volume)  # <-- normalize names
+        return px_figure(
+            "line",
+            df_volume,
+            x="Month",
+            y="Volume",
+            color="Company",
+            markers=True,
+            title="Monthly Trend of Media Mentions",
+            color_discrete_map=_present_color_map(df_volume["Company"].unique()),
+            category_orders={"Company": _category_order()},
+            layout=dict(
                 xaxis_title="Month",
                 yaxis_title="Number of Articles",
                 xaxis=dict(
@@ -142,31 +109,27 @@ def render(mode: str = "by_company"):
                     tickvals=sorted(df_volume["Month"].unique()),
                     ticktext=[pd.to_datetime(m).strftime('%b %Y') for m in sorted(df_volume["Month"].unique())]
                 )
-            )
-            st.plotly_chart(fig_volume, use_container_width=True)
-
-    # Impressions Tab
-    with tab2:
-        if not impressions_data:
-            st.warning("No impressions data found.")
-        else:
-            df_impressions = pd.DataFrame(impressions_data)
-            if mode == "combined":
-                df_impressions = df_impressions.groupby("Month", as_index=False).agg({"Impressions": "sum"})
-                df_impressions["Company"] = _ALL_BRANDS_LABEL
-
-            df_impressions = _normalized(df_impressions)  # <-- normalize names
-            fig_impressions = px.line(
-                df_impressions,
-                x="Month",
-                y="Impressions",
-                color="Company",
-                markers=True,
-                title="Monthly Trend of Total Impressions",
-                color_discrete_map=_present_color_map(df_impressions["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
-            )
-            fig_impressions.update_layout(
+            ),
+        )
+
+    def build_impressions():
+        df_impressions = pd.DataFrame(impressions_data)
+        if mode == "combined":
+            df_impressions = df_impressions.groupby("Month", as_index=False).agg({"Impressions": "sum"})
+            df_impressions["Company"] = _ALL_BRANDS_LABEL
+
+        df_impressions = _normalized(df_impressions)  # <-- normalize names
+        return px_figure(
+            "line",
+            df_impressions,
+            x="Month",
+            y="Impressions",
+            color="Company",
+            markers=True,
+            title="Monthly Trend of Total Impressions",
+            color_discrete_map=_present_color_map(df_impressions["Company"].unique()),
+            category_orders={"Company": _category_order()},
+            layout=dict(
                 xaxis_title="Month",
                 yaxis_title="Total Impressions",
                 xaxis=dict(
@@ -174,45 +137,34 @@ def render(mode: str = "by_company"):
                     tickvals=sorted(df_impressions["Month"].unique()),
                     ticktext=[pd.to_datetime(m).strftime('%b %Y') for m in sorted(df_impressions["Month"].unique())]
                 )
-            )
-            st.plotly_chart(fig_impressions, use_container_width=True)
-
-    # BMQ Tab
-    with tab3:
-        if not bmq_data:
-            st.warning("No BMQ data found.")
-        else:
-            df_bmq = pd.DataFrame(bmq_data)
-            if mode == "combined":
-                # Recalc average across all brands
-                all_bmq_data = []
-                for brand in BRANDS:
-                    df = load_agility_data(brand)
-                    if df is None or "Published Date" not in df.columns or "BMQ" not in df.columns:
-                        continue
-                    df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce")
-                    df = df.dropna(subset=["Published Date"])
-                    df["Month"] = df["Published Date"].dt.to_period("M").dt.to_timestamp()
-                    df["BMQ"] = pd.to_numeric(df["BMQ"], errors="coerce")
-                    for month, bmq in df.groupby("Month")["BMQ"].mean().items():
-                        all_bmq_data.append({"Month": month, "BMQ": bmq})
-                if all_bmq_data:
-                    df_all_bmq = pd.DataFrame(all_bmq_data)
-                    df_bmq = df_all_bmq.groupby("Month", as_index=False).agg({"BMQ": "mean"})
-                    df_bmq["Company"] = _ALL_BRANDS_LABEL
-
-            df_bmq = _normalized(df_bmq)  # <-- normalize names
-            fig_bmq = px.line(
-                df_bmq,
-                x="Month",
-                y="BMQ",
-                color="Company",
-                markers=True,
-                title="Monthly Trend of Average Article Quality (BMQ)",
-                color_discrete_map=_present_color_map(df_bmq["Company"].unique()),
-                category_orders={"Company": _CATEGORY_ORDER},
-            )
-            fig_bmq.update_layout(
+            ),
+        )
+
+    def build_bmq():
+        df_bmq = pd.DataFrame(bmq_data)
+        if mode == "combined":
+            # Recalc average across all brands: mean of each brand's monthly average
+            brand_bmq = metrics[metrics["BMQ_count"] > 0]
+            if not brand_bmq.empty:
+                df_bmq = (
+                    (brand_bmq["BMQ_sum"] / brand_bmq["BMQ_count"])
+                    .groupby(brand_bmq["Month"]).mean()
+                    .rename("BMQ").reset_index()
+                )
+                df_bmq["Company"] = _ALL_BRANDS_LABEL
+
+        df_bmq = _normalized(df_bmq)  # <-- normalize names
+        return px_figure(
+            "line",
+            df_bmq,
+            x="Month",
+            y="BMQ",
+            color="Company",
+            markers=True,
+            title="Monthly Trend of Average Article Quality (BMQ)",
+            color_discrete_map=_present_color_map(df_bmq["Company"].unique()),
+            category_orders={"Company": _category_order()},
+            layout=dict(
                 xaxis_title="Month",
                 yaxis_title="Average BMQ",
                 xaxis=dict(
@@ -220,5 +172,23 @@ def render(mode: str = "by_company"):
                     tickvals=sorted(df_bmq["Month"].unique()),
                     ticktext=[pd.to_datetime(m).strftime('%b %Y') for m in sorted(df_bmq["Month"].unique())]
                 )
-            )
-            st.plotly_chart(fig_bmq, use_container_width=True)
+            ),
+        )
+
+    # Tabs: (label, rows, message without data, figure builder)
+    tabs = [
+        ("📊 Volume", volume_data, "No volume data found.", build_volume),
+        ("👁️ Impressions", impressions_data, "No impressions data found.", build_impressions),
+        ("⭐ BMQ", bmq_data, "No BMQ data found.", build_bmq),
+    ]
+
+    def render_tab(i, label):
+        _, rows, empty_message, build = tabs[i]
+        if not rows:
+            st.warning(empty_message)
+            return
+        # The trends cover every month in the cube, so only the data version matters
+        fig = tab_figure("volume_trends", (mode, label), context.data_version, build)
+        st.plotly_chart(fig, use_container_width=True)
+
+    lazy_tabs([label for label, _, _, _ in tabs], f"volume_trends_{mode}", render_tab)
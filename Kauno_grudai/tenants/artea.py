@@ -0,0 +1,166 @@
+# tenants/artea.py
+
+import os
+
+# Top-level folder where your data is stored
+DATA_ROOT = os.path.join("Artea", "data")
+
+# Brands to include in the dashboard (normalized display names)
+BRANDS = ["Swedbank", "Citadele", "Luminor", "SEB", "Artea"]
+
+# Map various source variants to normalized display names used across the app
+BRAND_NAME_MAPPING = {
+    "Artea": "Artea",
+    "SEB Lietuvoje": "SEB",
+    "Swedbank Lietuvoje": "Swedbank",
+    "Citadele bankas": "Citadele",
+    "Luminor Lietuva": "Luminor"
+}
+
+# Company identifiers in fb_posts.xlsx / linkedin_posts.xlsx, in social tab order
+FACEBOOK_NAME_TO_BRAND = dict(BRAND_NAME_MAPPING)
+
+LINKEDIN_SLUG_TO_BRAND = dict(FACEBOOK_NAME_TO_BRAND)
+
+# Brand colors keyed by normalized display names
+BRAND_COLORS = {
+    "Swedbank": "#4083B3",  # Plotly Blue
+    "SEB":      "#2FB375",  # Teal/Green
+    "Luminor":  "#FF0E0E",  # Plotly Orange-Red
+    "Citadele": "#FF9896",  # Light Red / Pink
+    "Artea":    "#BECFE6",  # Light Blue
+}
+
+# Months offered in the sidebar month selector
+AVAILABLE_MONTHS = [
+    (2025, 2), (2025, 3), (2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)
+]
+
+# Pages shown in the sidebar navigation
+PAGES = ["Press Releases", "Social Media", "Content Pillars", "Audience Affinity", "Ad Intelligence"]
+
+# Sections of the Press Releases and Social Media pages, in order (see main.py)
+PR_SECTIONS = ["compos_matrix", "sentiment", "topic_insights", "volume", "media_coverage"]
+SOCIAL_SECTIONS = ["trends", "top_posts"]
+
+# Social platforms shown on the Social Media page
+SOCIAL_PLATFORMS = ["linkedin", "facebook"]
+
+# Audience affinity sources, one tab each
+AUDIENCE_AFFINITY_SOURCES = ["pr"]
+
+# Top 3 archetype tabs per source; names are matched against compos file names
+ARCHETYPE_TABS = {}
+
+# Press Releases: note above the Volume vs. Quality matrix (None for none)
+COMPOS_NOTE = """
+**Note:** News articles were selected from February 1st until July 31st. Only articles where the bank was mentioned in either the title or the first paragraph were kept for analysis.
+"""
+
+# Show the BMQ quality definition and the Brandtypes link with the matrix
+COMPOS_DEFINITIONS = True
+
+# Expanders under the sentiment chart, label -> markdown
+SENTIMENT_NOTES = {
+    "🔎 Negative sentiment article topics for Artea": """
+- **Client frustrations with Artea (multiple cases)**
+  - Unexpected bank fees on account balances.
+  - Complaints spreading on social media about poor treatment of customers.
+  - These are reputational hits tied to service quality and fee transparency.
+- **Broader financial/economic pressure**
+  - Tax changes and economic downturn discussions reflect negatively on banks, with Artea mentioned as an example.
+  - Suggests an association with systemic financial stress, not necessarily misconduct by the bank itself.
+- **Fraud and scams targeting customers**
+  - Several stories about scams and fraud attempts, where criminals impersonated or exploited Artea/Šiaulių bankas customers.
+  - The negativity comes from reputational risk: banks seen as vectors or vulnerable points for fraud.
+- **Šiaulių bankas stock market performance**
+  - Coverage of declining stock value, analyst downgrades, and continued sell-offs.
+  - Tone is negative because of weak market confidence and forecasts of reduced share price.
+- **Artea liquidity/transaction issues**
+  - At least one case of a business unable to retrieve funds for an extended period.
+  - Directly undermines trust in the bank’s operations.
+
+**In short:** Artea is criticized for poor customer service (fees, delays) and linked to fraud risk. Šiaulių bankas is framed negatively in financial press due to declining share value and negative analyst outlooks.
+""",
+}
+
+# Intro above the media coverage pies (None for none)
+MEDIA_INTRO = (
+    "This section visualizes the share of media mentions across brands. \n"
+    "Use this to evaluate visibility or dominance in earned media."
+)
+
+# Social Media: takeaways above the top posts (None for none) and a summary
+# under each platform's top posts, platform -> markdown
+SOCIAL_TAKEAWAYS = """
+### 📌 Key Takeaways
+
+**Facebook = spectacle + urgency**  
+Contests, sports, and fraud alerts drive the highest engagement. Banks that tailor their content to excitement, national pride, and urgent warnings outperform those using purely educational or product-driven posts.
+
+**LinkedIn = identity + credibility**  
+Culture, rebrands, leadership, and values-focused posts resonate most. Banks succeed by humanizing themselves and sharing internal recognition, while hard business insights attract a narrower audience.
+"""
+SOCIAL_POST_SUMMARIES = {
+    "linkedin": """
+### 📊 LinkedIn Content Summary
+
+#### Content of the top 5 posts for each bank
+
+**SEB & Swedbank**
+- Employee culture and recognition posts (team events, awards, new hires) resonate strongly.
+- Leadership and organizational changes (e.g., CEO announcements) also generate traction.
+- These banks lean on LinkedIn as a brand/culture stage.
+
+**Artea**
+- Rebranding and identity-building is a winning theme — novelty and narrative matter.
+- Values-based posts (e.g., solidarity with Ukraine) also gain visibility.
+
+**Citadele**
+- Focuses on thought-leadership (economic outlook, AI, leadership trends).
+- While more niche in reach, it positions the brand as serious and analytical.
+
+**Luminor**
+- Engagement comes from light office culture and CSR/entrepreneurship programs.
+- More human, but less differentiated compared to SEB/Swedbank.
+
+**Overall:**
+- Culture and identity posts dominate (internal recognition, rebrands, value-driven messages).
+- Thought-leadership works, but it attracts a narrower, more specialized audience.
+
+**Cross-Bank Themes**
+- Banks succeed by humanizing themselves — employees, culture, values, brand identity.
+- Hard business insights (Citadele’s angle) stand out as distinctive, but they do not maximize broad engagement.
+
+**Key Takeaway**
+- **LinkedIn = identity + credibility** (culture, rebrands, leadership, values).
+- Banks that tailor their content to the emotional logic of LinkedIn outperform those trying to force one style across both.
+""",
+    "facebook": """
+### 📊 Facebook Content Summary
+
+#### Content of the top 5 posts for each bank
+
+**Citadele & Swedbank**
+- Contests and giveaways dominate (ticket draws, prizes, sports tie-ins).
+- Sports sponsorships (basketball in particular) provide a strong emotional hook.
+- Posts lean into excitement, emojis, and a celebratory tone.
+
+**SEB & Artea**
+- Fraud/security alerts attract high interaction — practical, widely relevant, and shareable.
+- Surveys or data points on consumer behavior also spark interest when made relatable.
+
+**Luminor**
+- Attempts at engagement through webinars, financial education, or lifestyle tie-ins perform more modestly.
+- The themes are useful but lack the immediate emotional payoff of contests or security alerts.
+
+**Overall:**
+- High-arousal content works best: competitions, national pride, and urgent warnings.
+- Purely educational or product-driven posts struggle unless wrapped in lifestyle relevance.
+
+**Cross-Bank Themes**
+- Entertainment, urgency, and fun win.
+- Contests and sports are the universal currency.
+- Fraud/security alerts are the only serious theme that reliably breaks through.
+""",
+}
@@ -0,0 +1,104 @@
+# tenants/kauno_grudai.py
+
+import os
+
+# Top-level folder where your data is stored
+DATA_ROOT = os.path.join("Kauno_grudai","data")
+# DATA_ROOT = os.path.join("data")
+
+# Brands to include in the dashboard (normalized display names)
+BRANDS = ["Acme", "Ignitis", "Kauno grūdai", "SBA", "Thermo Fisher"]
+
+# Map various source variants to normalized display names used across the app
+BRAND_NAME_MAPPING = {
+    # Normalized names map to themselves
+    "Acme": "Acme",
+    "Ignitis": "Ignitis",
+    "Kauno grūdai": "Kauno grūdai",
+    "SBA": "SBA",
+    "Thermo Fisher": "Thermo Fisher",
+    # Short codes seen in agility/composition filenames
+    "Kaun": "Kauno grūdai",
+    "Thermo": "Thermo Fisher",
+    # Lithuanian/long variants (Facebook and PR sources)
+    "Acme grupė": "Acme",
+    "Ignitis grupė": "Ignitis",
+    "Kauno Grūdai": "Kauno grūdai",
+    "SBA grupė": "SBA",
+    "Thermo Fisher Scientific": "Thermo Fisher",
+    # LinkedIn slugs
+    "acme-grupe": "Acme",
+    "ignitis-grupe": "Ignitis",
+    "kauno-grudai": "Kauno grūdai",
+    "sba-invent-everyday": "SBA",
+    "thermo-fisher-scientific": "Thermo Fisher",
+}
+
+# Platform-specific helpers (optional, for convenience in sections)
+# Map platform-specific identifiers to normalized names
+FACEBOOK_NAME_TO_BRAND = {
+    "Acme grupė": "Acme",
+    "Ignitis grupė": "Ignitis",
+    "Kauno Grūdai": "Kauno grūdai",
+    "SBA grupė": "SBA",
+    "Thermo Fisher Scientific": "Thermo Fisher",
+}
+
+LINKEDIN_SLUG_TO_BRAND = {
+    "acme-grupe": "Acme",
+    "ignitis-grupe": "Ignitis",
+    "kauno-grudai": "Kauno grūdai",
+    "sba-invent-everyday": "SBA",
+    "thermo-fisher-scientific": "Thermo Fisher",
+}
+
+# Brand colors keyed by normalized display names
+BRAND_COLORS = {
+    "Acme": "#4083B3",
+    "Ignitis": "#2FB375",
+    "Kauno grūdai": "#FF0E0E",
+    "SBA": "#FF9896",
+    "Thermo Fisher": "#BECFE6",
+
+}
+
+# Months offered in the sidebar month selector
+AVAILABLE_MONTHS = [
+    (2025, 2), (2025, 3), (2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)
+]
+
+# Pages shown in the sidebar navigation
+PAGES = ["Press Releases", "Social Media", "Audience Affinity", "Content Pillars"]
+
+# Sections of the Press Releases and Social Media pages, in order (see main.py)
+PR_SECTIONS = ["compos_matrix", "pr_ranking", "archetypes", "sentiment", "topics", "volume", "media_coverage"]
+SOCIAL_SECTIONS = ["social_media_ranking", "archetypes", "trends", "top_posts"]
+
+# Social platforms shown on the Social Media page
+SOCIAL_PLATFORMS = ["linkedin", "facebook"]
+
+# Audience affinity sources, one tab each
+AUDIENCE_AFFINITY_SOURCES = ["pr", "linkedin"]
+
+# Top 3 archetype tabs per source; names are matched against compos file names
+ARCHETYPE_TABS = {
+    "pr": ["Kauno grudai", "Acme grupe", "Ignitis Group", "SBA", "Thermo Fisher"],
+    "linkedin": ["Kauno grudai", "Acme grupe", "Ignitis", "SBA", "Thermo Fisher"],
+}
+
+# Press Releases: note above the Volume vs. Quality matrix (None for none)
+COMPOS_NOTE = None
+
+# Show the BMQ quality definition and the Brandtypes link with the matrix
+COMPOS_DEFINITIONS = True
+
+# Expanders under the sentiment chart, label -> markdown
+SENTIMENT_NOTES = {}
+
+# Intro above the media coverage pies (None for none)
+MEDIA_INTRO = None
+
+# Social Media: takeaways above the top posts (None for none) and a summary
+# under each platform's top posts, platform -> markdown
+SOCIAL_TAKEAWAYS = None
+SOCIAL_POST_SUMMARIES = {}
@@ -0,0 +1,73 @@
+# tenants/tracking.py
+
+import os
+
+# Top-level folder where your data is stored
+DATA_ROOT = os.path.join("Tracking", "data")
+
+# Brands to include in the dashboard (normalized display names)
+BRANDS = ["Swedbank", "Citadele", "Luminor", "SEB", "Artea"]
+
+# Map various source variants to normalized display names used across the app
+BRAND_NAME_MAPPING = {
+    "arteagrupe": "Artea",
+    "seb-lietuvoje": "SEB",
+    "swedbanklietuvoje": "Swedbank",
+    "citadele-bankas-lietuvoje": "Citadele",
+    "luminorlietuva": "Luminor"
+}
+
+# No consolidated social exports; brands are read from <brand>_<platform>.xlsx
+FACEBOOK_NAME_TO_BRAND = {brand: brand for brand in BRANDS}
+
+LINKEDIN_SLUG_TO_BRAND = {brand: brand for brand in BRANDS}
+
+# Brand colors keyed by normalized display names
+BRAND_COLORS = {
+    "Swedbank": "#4083B3",
+    "SEB":      "#2FB375",
+    "Luminor":  "#FF0E0E",
+    "Citadele": "#FF9896",
+    "Artea":    "#BECFE6",
+}
+
+# Months offered in the sidebar month selector
+AVAILABLE_MONTHS = [
+    (2025, 1), (2025, 2), (2025, 3), (2025, 4), (2025, 5)
+]
+
+# Pages shown in the sidebar navigation
+PAGES = ["Press Releases", "Social Media", "Content Pillars", "Audience Affinity"]
+
+# Sections of the Press Releases and Social Media pages, in order (see main.py)
+PR_SECTIONS = ["compos_matrix", "sentiment", "topics", "volume", "media_coverage"]
+SOCIAL_SECTIONS = ["trends", "top_posts"]
+
+# Social platforms shown on the Social Media page
+SOCIAL_PLATFORMS = ["linkedin"]
+
+# Audience affinity sources, one tab each
+AUDIENCE_AFFINITY_SOURCES = ["pr"]
+
+# Top 3 archetype tabs per source; names are matched against compos file names
+ARCHETYPE_TABS = {}
+
+# Press Releases: note above the Volume vs. Quality matrix (None for none)
+COMPOS_NOTE = None
+
+# Show the BMQ quality definition and the Brandtypes link with the matrix
+COMPOS_DEFINITIONS = False
+
+# Expanders under the sentiment chart, label -> markdown
+SENTIMENT_NOTES = {}
+
+# Intro above the media coverage pies (None for none)
+MEDIA_INTRO = (
+    "This section visualizes the share of media mentions across brands. \n"
+    "Use this to evaluate visibility or dominance in earned media."
+)
+
+# Social Media: takeaways above the top posts (None for none) and a summary
+# under each platform's top posts, platform -> markdown
+SOCIAL_TAKEAWAYS = None
+SOCIAL_POST_SUMMARIES = {}
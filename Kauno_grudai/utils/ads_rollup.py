@@ -0,0 +1,100 @@
+# utils/ads_rollup.py
+import os
+import numpy as np
+import pandas as pd
+from utils.file_io import load_ads_data, AD_PLATFORMS, on_platform
+from utils.file_cache import file_cached, data_roots
+from utils.frame_cache import cached_frames
+
+# 'platform' value of the rows that count every ad regardless of platform
+TOTAL = "Total"
+
+ROLLUP_COLUMNS = ["brand", "platform", "week", "reach", "ads", "active_ads", "duration_mean", "duration_max"]
+
+
+def _week(dates: pd.Series) -> pd.Series:
+    # Sunday of each date's week: the label pd.Grouper(freq="W") gives it
+    return dates.dt.normalize() + pd.to_timedelta((6 - dates.dt.weekday) % 7, unit="D")
+
+
+def _active_weekly(ads: pd.DataFrame, start, end) -> pd.DataFrame:
+    """week, brand, active_ads: ads running at some point of each week of [start, end].
+
+    An ad runs from startDateFormatted to endDateFormatted. Without an end date it
+    still runs at end if isActive, otherwise it ran on its start day only.
+    """
+    first = ads["startDateFormatted"]
+    last = ads["endDateFormatted"] if "endDateFormatted" in ads.columns else pd.Series(pd.NaT, index=ads.index)
+    last = last.fillna(first.where(~ads["isActive"], pd.Timestamp(end)))
+    first, last = first.clip(lower=pd.Timestamp(start)), last.clip(upper=pd.Timestamp(end))
+    running = first.notna() & (first <= last)
+    first_week, last_week = _week(first[running]), _week(last[running])
+
+    # One row per ad and week it ran in
+    counts = ((last_week - first_week).dt.days // 7 + 1).to_numpy()
+    steps = np.arange(counts.sum()) - np.repeat(counts.cumsum() - counts, counts)
+    weeks = pd.DataFrame({
+        "week": first_week.repeat(counts).reset_index(drop=True) + pd.to_timedelta(steps * 7, unit="D"),
+        "brand": ads.loc[running, "brand"].repeat(counts).reset_index(drop=True),
+    })
+    return weeks.groupby(["week", "brand"]).size().rename("active_ads").reset_index()
+
+
+def _weekly(ads: pd.DataFrame, running: pd.DataFrame, platform: str, start, end) -> pd.DataFrame:
+    weekly = (
+        ads.groupby([pd.Grouper(key="startDateFormatted", freq="W"), "brand"])
+        .agg(
+            reach=("reach", "sum"),
+            ads=("reach", "size"),
+            duration_mean=("duration_days", "mean"),
+            duration_max=("duration_days", "max"),
+        )
+        .reset_index()
+        .rename(columns={"startDateFormatted": "week"})
+    )
+    # Weeks in which ads ran but none started only have active_ads
+    weekly = weekly.merge(_active_weekly(running, start, end), on=["week", "brand"], how="outer")
+    weekly["ads"] = weekly["ads"].astype("Int64")
+    weekly["active_ads"] = weekly["active_ads"].fillna(0).astype(int)
+    weekly["platform"] = platform
+    return weekly
+
+
+@file_cached(os.path.join("ads", "*.xlsx"), cache=cached_frames, roots=data_roots)
+def load_weekly_ads_rollup(start, end) -> pd.DataFrame:
+    """Weekly ads rollup keyed by (brand, platform, week) for ads starting in [start, end].
+
+    Built once per ads file version and window. Weeks end on Sunday, as with
+    pd.Grouper(freq="W"); 'platform' is one of AD_PLATFORMS or TOTAL. Columns:
+    brand, platform, week, reach, ads (new ads), active_ads (ads running at some
+    point of the week, including ones started before start), duration_mean,
+    duration_max. Weeks in which no ad started are NA except for active_ads.
+    """
+    df = load_ads_data()
+    if df is None or df.empty or "startDateFormatted" not in df.columns:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    df = df.assign(
+        isActive=df["isActive"].astype(bool) if "isActive" in df.columns else False,
+        duration_days=df["duration_days"] if "duration_days" in df.columns else float("nan"),
+    )
+    ads = df[(df["startDateFormatted"] >= start) & (df["startDateFormatted"] <= end)]
+    # Ads started before the window count as active in the weeks they still ran
+    running = df[df["startDateFormatted"] <= end]
+    frames = [_weekly(ads, running, TOTAL, start, end)]
+    frames += [
+        _weekly(ads[on_platform(ads, platform)], running[on_platform(running, platform)], platform, start, end)
+        for platform in AD_PLATFORMS
+    ]
+    return pd.concat(frames, ignore_index=True)[ROLLUP_COLUMNS]
+
+
+def weekly_series(rollup: pd.DataFrame, platform: str, value: str) -> pd.DataFrame:
+    """startDateFormatted, brand, <value> rows of one platform, ready for px.line."""
+    rows = rollup[(rollup["platform"] == platform) & rollup[value].notna()]
+    return rows[["week", "brand", value]].rename(columns={"week": "startDateFormatted"}).reset_index(drop=True)
+
+
+def brand_totals(rollup: pd.DataFrame, value: str, platform: str = TOTAL) -> pd.Series:
+    """Sum of value per brand over every week in the rollup."""
+    return rollup[rollup["platform"] == platform].groupby("brand")[value].sum()
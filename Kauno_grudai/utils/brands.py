@@ -0,0 +1,83 @@
+# utils/brands.py
+import functools
+import numpy as np
+import pandas as pd
+from utils import config
+
+# Lithuanian letters folded to ASCII in file keys
+_ACCENT_FOLDING = str.maketrans({"ū": "u", "ė": "e", "š": "s", "ž": "z", "ą": "a", "ę": "e", "į": "i", "č": "c"})
+
+
+def match_key(name) -> str:
+    """'Brand | City' -> 'brand': lower-case, punctuation to spaces, location suffix dropped."""
+    if not isinstance(name, str):
+        return ""
+    base = name.split("|")[0].strip()
+    cleaned = "".join(ch.lower() if (ch.isalnum() or ch.isspace()) else " " for ch in base)
+    return " ".join(cleaned.split())
+
+
+def file_key(name) -> str:
+    """'Kauno-Grūdai' -> 'kauno grudai': key of the Brand column in the Agility workbooks."""
+    if not isinstance(name, str):
+        return ""
+    t = name.strip().lower().replace("-", " ").replace("_", " ")
+    return " ".join(t.split()).translate(_ACCENT_FOLDING)
+
+
+class BrandCanonicalizer:
+    """Maps raw brand names to canonical names, remembering every distinct name it has seen.
+
+    Args:
+        key: Function turning a raw name into its lookup key (match_key, file_key)
+        aliases: Optional dict[key] = canonical name; keys not in it map to themselves
+
+    Call it with one name, or use .map(series) for a whole column: only the distinct
+    values not seen before are normalized, the rest is a lookup on factorized codes.
+    """
+
+    def __init__(self, key=match_key, aliases=None):
+        self.key = key
+        self.aliases = dict(aliases or {})
+        self._memo = {}
+
+    def _canonical(self, name) -> str:
+        normalized = self.key(name)
+        return self.aliases.get(normalized, normalized)
+
+    def __call__(self, name) -> str:
+        try:
+            return self._memo[name]
+        except KeyError:
+            result = self._memo[name] = self._canonical(name)
+            return result
+        except TypeError:
+            # Unhashable cell
+            return self._canonical(name)
+
+    def map(self, values) -> pd.Series:
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        codes, uniques = pd.factorize(values)
+        # Last slot is for missing values (code -1)
+        lookup = np.array([self(u) for u in uniques] + [self(None)], dtype=object)
+        return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+@functools.lru_cache(maxsize=None)
+def _variant_index(tenant: str) -> dict:
+    """dict[canonical brand] = frozenset of file keys of every name mapping to it."""
+    mapping = config.tenant_settings(tenant).BRAND_NAME_MAPPING
+    index = {}
+    for variant, canonical in mapping.items():
+        index.setdefault(canonical, {file_key(canonical)}).add(file_key(variant))
+    return {canonical: frozenset(keys) for canonical, keys in index.items()}
+
+
+def brand_variant_keys(brand: str) -> frozenset:
+    """File keys of every name the current tenant's BRAND_NAME_MAPPING maps to brand's canonical name."""
+    canonical = config.BRAND_NAME_MAPPING.get(brand, brand)
+    return _variant_index(config.current_tenant()).get(canonical, frozenset({file_key(canonical)}))
+
+
+# Shared canonicalizer for the Agility Brand column
+file_keys = BrandCanonicalizer(key=file_key)
@@ -0,0 +1,61 @@
+# utils/cards.py
+import functools
+from string import Template
+import streamlit as st
+
+# Compiled once; cards are single-line HTML so markdown never reads them as code blocks
+_CARD = Template(
+    '<div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">'
+    '<h5 style="margin:0;">$label</h5>'
+    '<h3 style="margin:5px 0;">$val</h3>'
+    '$lines'
+    '</div>'
+)
+_LINE = Template('<p style="margin:0; color:$color;">$text</p>')
+_GRID = Template(
+    '<div style="display:grid; grid-template-columns:repeat($columns, minmax(0, 1fr)); column-gap:1rem;">'
+    '$cards'
+    '</div>'
+)
+
+
+def _pct_color(pct) -> str:
+    return "green" if pct > 0 else "red" if pct < 0 else "gray"
+
+
+@functools.lru_cache(maxsize=4096)
+def simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None) -> str:
+    """HTML of a card with optional Δ% and rank (green when first of total_ranks, red when last)."""
+    rank_color = "gray"
+    if rank_now is not None and total_ranks:
+        if int(rank_now) == 1:
+            rank_color = "green"
+        elif int(rank_now) == int(total_ranks):
+            rank_color = "red"
+    lines = ""
+    if pct is not None:
+        lines += _LINE.substitute(color=_pct_color(pct), text=f"Δ {pct:.1f}%")
+    if rank_now is not None:
+        lines += _LINE.substitute(color=rank_color, text=f"Rank {int(rank_now)}")
+    return _CARD.substitute(label=label, val=val, lines=lines)
+
+
+@functools.lru_cache(maxsize=4096)
+def metric_card(label, val, pct, rank_now, rank_change) -> str:
+    """HTML of a card with Δ% and rank, with an arrow for the rank change (positive = dropped)."""
+    if rank_change > 0:
+        arrow, rank_color = "↓", "red"
+    elif rank_change < 0:
+        arrow, rank_color = "↑", "green"
+    else:
+        arrow, rank_color = "→", "gray"
+    lines = _LINE.substitute(color=_pct_color(pct), text=f"Δ {pct:.1f}%")
+    lines += _LINE.substitute(color=rank_color, text=f"{arrow} Rank {int(rank_now)}")
+    return _CARD.substitute(label=label, val=val, lines=lines)
+
+
+def card_grid(cards, columns: int = 3) -> None:
+    """Render cards (HTML from the functions above) as one grid in a single markdown element."""
+    cards = list(cards)
+    if cards:
+        st.markdown(_GRID.substitute(columns=columns, cards="".join(cards)), unsafe_allow_html=True)
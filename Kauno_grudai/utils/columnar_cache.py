@@ -0,0 +1,110 @@
+# utils/columnar_cache.py
+import hashlib
+import glob
+import os
+import pandas as pd
+from utils import config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit, but stay optional
+    pa = None
+    pq = None
+
+# Converted workbooks live next to the data they were built from, per tenant
+CACHE_DIRNAME = ".cache"
+
+# Column holding the partition key each row group is written under
+PARTITION_COLUMN = "__partition_key__"
+
+
+def is_available() -> bool:
+    return pq is not None
+
+
+def source_signature(path: str) -> tuple:
+    """(absolute path, mtime_ns, size) of a source file; changes whenever the file is replaced."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def cache_dir() -> str:
+    return os.path.join(config.DATA_ROOT, CACHE_DIRNAME)
+
+
+def _cache_path(path: str, variant: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(repr((source_signature(path), variant)).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir(), f"{stem}.{variant}.{digest}.parquet")
+
+
+def _remove_stale(path: str, variant: str, keep: str):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for old in glob.glob(os.path.join(cache_dir(), f"{stem}.{variant}.*.parquet")):
+        if os.path.abspath(old) != os.path.abspath(keep):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def convert_to_parquet(path: str, read_func, partition_func, variant: str = "default"):
+    """Convert a source file to a Parquet file with one row group per partition key.
+
+    Args:
+        path: Source file (usually an .xlsx workbook)
+        read_func: Callable returning the parsed DataFrame; only called on a cache miss
+        partition_func: Callable mapping that DataFrame to a Series of partition keys
+        variant: Distinguishes different conversions of the same source file
+
+    Returns the Parquet path, or None if pyarrow is unavailable or the frame cannot be
+    represented in Arrow (callers then fall back to the source file).
+    """
+    if not is_available():
+        return None
+
+    target = _cache_path(path, variant)
+    if os.path.exists(target):
+        return target
+
+    df = read_func()
+    if df is None:
+        return None
+
+    df = df.copy()
+    df[PARTITION_COLUMN] = partition_func(df).astype(str)
+    # Stable sort keeps the original row order inside every partition
+    df = df.sort_values(PARTITION_COLUMN, kind="stable").reset_index(drop=True)
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+    os.makedirs(cache_dir(), exist_ok=True)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    keys = table.column(PARTITION_COLUMN).to_pandas()
+    with pq.ParquetWriter(tmp_path, table.schema) as writer:
+        # One row group per key so readers can skip every other partition
+        for _, positions in keys.groupby(keys, sort=False).indices.items():
+            writer.write_table(table.slice(int(positions[0]), len(positions)))
+    os.replace(tmp_path, target)
+    _remove_stale(path, variant, keep=target)
+    return target
+
+
+def read_partitions(parquet_path: str, keys=None, columns=None) -> pd.DataFrame:
+    """Read selected partitions (row groups) and columns from a converted file."""
+    schema_names = pq.read_schema(parquet_path).names
+    if columns is None:
+        selected = [c for c in schema_names if c != PARTITION_COLUMN]
+    else:
+        selected = [c for c in columns if c in schema_names and c != PARTITION_COLUMN]
+
+    if keys is not None and not keys:
+        return pq.read_schema(parquet_path).empty_table().select(selected).to_pandas()
+
+    filters = [(PARTITION_COLUMN, "in", sorted(keys))] if keys is not None else None
+    table = pq.read_table(parquet_path, columns=selected, filters=filters)
+    return table.to_pandas()
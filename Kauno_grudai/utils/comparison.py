@@ -0,0 +1,110 @@
+# utils/comparison.py
+import numpy as np
+import pandas as pd
+
+CURRENT = "current"
+PREVIOUS = "previous"
+
+STAT_COLUMNS = ["current", "previous", "change_pct", "rank_now", "rank_prev", "rank_change"]
+
+
+# ------------------------
+# Window definitions: dict[name] = pd.Interval over the date column
+# ------------------------
+
+def midpoint_windows(start, end, mid=None, closed: str = "left") -> dict:
+    """Previous = [start, mid), current = [mid, end); closed="both" includes end."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    mid = start + (end - start) / 2 if mid is None else pd.Timestamp(mid)
+    return {
+        CURRENT: pd.Interval(mid, end, closed=closed),
+        PREVIOUS: pd.Interval(start, mid, closed="left"),
+    }
+
+
+def rolling_windows(last_day, days: int = 7) -> dict:
+    """The `days` calendar days ending on last_day (included) vs the `days` before them."""
+    end = pd.Timestamp(last_day).normalize() + pd.Timedelta(days=1)
+    span = pd.Timedelta(days=days)
+    return {
+        CURRENT: pd.Interval(end - span, end, closed="left"),
+        PREVIOUS: pd.Interval(end - 2 * span, end - span, closed="left"),
+    }
+
+
+def month_over_month(month) -> dict:
+    """Calendar month of `month` (a date or 'YYYY-MM') vs the month before."""
+    current = pd.Period(month, freq="M")
+    return {
+        CURRENT: pd.Interval(current.start_time, (current + 1).start_time, closed="left"),
+        PREVIOUS: pd.Interval((current - 1).start_time, current.start_time, closed="left"),
+    }
+
+
+def label_windows(dates: pd.Series, windows: dict) -> pd.Series:
+    """Name of the window each date falls in (NaN outside all of them). Windows must not overlap."""
+    names = list(windows)
+    conditions = []
+    for interval in windows.values():
+        left = dates >= interval.left if interval.closed_left else dates > interval.left
+        right = dates <= interval.right if interval.closed_right else dates < interval.right
+        conditions.append((left & right).to_numpy())
+    codes = np.select(conditions, np.arange(len(names)), default=-1) if names else np.full(len(dates), -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=names), index=dates.index, name="window")
+
+
+# ------------------------
+# Comparison
+# ------------------------
+
+def _stats(cur: pd.Series, prev: pd.Series, change_from_zero) -> pd.DataFrame:
+    if change_from_zero is not None:
+        # Missing means nothing happened in that window
+        cur, prev = cur.fillna(0), prev.fillna(0)
+    rank_now = cur.rank(ascending=False, method="min")
+    rank_prev = prev.rank(ascending=False, method="min")
+    change = ((cur - prev) / prev.replace(0, 1)) * 100
+    if change_from_zero is not None:
+        change = change.where(prev != 0, np.where(cur > 0, change_from_zero, 0))
+    return pd.DataFrame({
+        "current": cur,
+        "previous": prev,
+        "change_pct": change,
+        "rank_now": rank_now,
+        "rank_prev": rank_prev,
+        "rank_change": rank_now - rank_prev,
+    }).fillna(0)
+
+
+def compare_windows(df: pd.DataFrame, date_col: str, windows: dict, metrics: dict, by="brand",
+                    current: str = CURRENT, previous: str = PREVIOUS, change_from_zero=None) -> dict:
+    """Compare metrics between two windows for every group in a single groupby.
+
+    Args:
+        df: Rows to compare (ads, articles, posts, ...)
+        date_col: Column the windows are applied to
+        windows: dict[name] = pd.Interval; see midpoint_windows, rolling_windows, month_over_month
+        metrics: dict[name] = (column, aggfunc), e.g. {"reach": ("reach", "sum"), "ads": ("ad_id", "nunique")}
+        by: Column to compare across (ranks are within it); None compares the frame as a whole ("All")
+        current, previous: Names of the two windows to compare
+        change_from_zero: change_pct when previous is 0 and current is not (missing counts as 0).
+            By default the change is taken against 1 and groups missing from a window get 0.
+
+    Returns dict[metric] = DataFrame indexed by group with current, previous, change_pct,
+    rank_now, rank_prev and rank_change (1 = highest).
+    """
+    groups = df[by] if by is not None else pd.Series("All", index=df.index, name="group")
+    window = label_windows(df[date_col], windows)
+    aggregated = (
+        df.groupby([groups, window], observed=True)
+        .agg(**{name: pd.NamedAgg(column, func) for name, (column, func) in metrics.items()})
+        .unstack("window")
+    )
+
+    result = {}
+    for name in metrics:
+        values = aggregated[name] if name in aggregated.columns.get_level_values(0) else pd.DataFrame(index=aggregated.index)
+        cur = values[current] if current in values.columns else pd.Series(np.nan, index=values.index)
+        prev = values[previous] if previous in values.columns else pd.Series(np.nan, index=values.index)
+        result[name] = _stats(cur.rename(None), prev.rename(None), change_from_zero)
+    return result
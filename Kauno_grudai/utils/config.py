@@ -1,64 +1,62 @@
 # utils/config.py
 
+import importlib
 import os
-
-# Top-level folder where your data is stored
-DATA_ROOT = os.path.join("Kauno_grudai","data")
-# DATA_ROOT = os.path.join("data")
-
-# Brands to include in the dashboard (normalized display names)
-BRANDS = ["Acme", "Ignitis", "Kauno grūdai", "SBA", "Thermo Fisher"]
-
-# Map various source variants to normalized display names used across the app
-BRAND_NAME_MAPPING = {
-    # Normalized names map to themselves
-    "Acme": "Acme",
-    "Ignitis": "Ignitis",
-    "Kauno grūdai": "Kauno grūdai",
-    "SBA": "SBA",
-    "Thermo Fisher": "Thermo Fisher",
-    # Short codes seen in agility/composition filenames
-    "Kaun": "Kauno grūdai",
-    "Thermo": "Thermo Fisher",
-    # Lithuanian/long variants (Facebook and PR sources)
-    "Acme grupė": "Acme",
-    "Ignitis grupė": "Ignitis",
-    "Kauno Grūdai": "Kauno grūdai",
-    "SBA grupė": "SBA",
-    "Thermo Fisher Scientific": "Thermo Fisher",
-    # LinkedIn slugs
-    "acme-grupe": "Acme",
-    "ignitis-grupe": "Ignitis",
-    "kauno-grudai": "Kauno grūdai",
-    "sba-invent-everyday": "SBA",
-    "thermo-fisher-scientific": "Thermo Fisher",
-}
-
-# Platform-specific helpers (optional, for convenience in sections)
-# Map platform-specific identifiers to normalized names
-FACEBOOK_NAME_TO_BRAND = {
-    "Acme grupė": "Acme",
-    "Ignitis grupė": "Ignitis",
-    "Kauno Grūdai": "Kauno grūdai",
-    "SBA grupė": "SBA",
-    "Thermo Fisher Scientific": "Thermo Fisher",
-}
-
-LINKEDIN_SLUG_TO_BRAND = {
-    "acme-grupe": "Acme",
-    "ignitis-grupe": "Ignitis",
-    "kauno-grudai": "Kauno grūdai",
-    "sba-invent-everyday": "SBA",
-    "thermo-fisher-scientific": "Thermo Fisher",
-}
-
-# Brand colors keyed by normalized display names
-BRAND_COLORS = {
-    "Acme": "#4083B3",
-    "Ignitis": "#2FB375",
-    "Kauno grūdai": "#FF0E0E",
-    "SBA": "#FF9896",
-    "Thermo Fisher": "#BECFE6",
-
+import streamlit as st
+
+# Clients served by this dashboard: tenant key -> display name.
+# Each tenant's settings live in tenants/<key>.py
+TENANTS = {
+    "kauno_grudai": "Kauno grūdai",
+    "artea": "Artea",
+    "tracking": "Tracking",
 }
 
+# Tenant served when the URL does not pick one (?tenant=artea)
+DEFAULT_TENANT = os.environ.get("DASHBOARD_TENANT", "kauno_grudai")
+
+# Settings every tenant module defines. Read them as config.<NAME> inside functions,
+# not with "from utils.config import <NAME>", so each session sees its own tenant.
+TENANT_SETTINGS = (
+    "DATA_ROOT",
+    "BRANDS",
+    "BRAND_NAME_MAPPING",
+    "FACEBOOK_NAME_TO_BRAND",
+    "LINKEDIN_SLUG_TO_BRAND",
+    "BRAND_COLORS",
+    "AVAILABLE_MONTHS",
+    "PAGES",
+    "PR_SECTIONS",
+    "SOCIAL_SECTIONS",
+    "SOCIAL_PLATFORMS",
+    "AUDIENCE_AFFINITY_SOURCES",
+    "ARCHETYPE_TABS",
+    "COMPOS_NOTE",
+    "COMPOS_DEFINITIONS",
+    "SENTIMENT_NOTES",
+    "MEDIA_INTRO",
+    "SOCIAL_TAKEAWAYS",
+    "SOCIAL_POST_SUMMARIES",
+)
+
+
+def current_tenant() -> str:
+    """Tenant of the current session."""
+    return st.session_state.get("tenant", DEFAULT_TENANT)
+
+
+def select_tenant(tenant: str):
+    if tenant not in TENANTS:
+        raise ValueError(f"Unknown tenant '{tenant}'. Use one of: {', '.join(TENANTS)}")
+    st.session_state["tenant"] = tenant
+
+
+def tenant_settings(tenant: str = None):
+    """Settings module of a tenant (default: the current session's)."""
+    return importlib.import_module(f"tenants.{tenant or current_tenant()}")
+
+
+def __getattr__(name):
+    if name in TENANT_SETTINGS:
+        return getattr(tenant_settings(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,10 @@
 # utils/date_utils.py
+import numpy as np
+import pandas as pd
 import streamlit as st
 from datetime import datetime
 from calendar import month_name
-
-# Manually define which months are available
-# AVAILABLE_MONTHS = [
-#     (2024, 8), (2024, 9), (2024, 10), (2024, 11), (2024, 12), (2025, 1),
-#     (2025, 2), (2025, 3), (2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)
-# ]
-
-AVAILABLE_MONTHS = [
-    (2025, 2), (2025, 3), (2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)
-]
+from utils import config
 
 def get_selected_date_range():
     selected = st.session_state.get("selected_months", [])
@@ -37,7 +30,7 @@ def init_month_selector():
     # Prepare options for dropdowns
     options = [
         (year, month, f"{month_name[month]} {year}")
-        for year, month in AVAILABLE_MONTHS
+        for year, month in config.AVAILABLE_MONTHS  # months offered are set per tenant
     ]
     labels = [opt[2] for opt in options]
 
@@ -67,3 +60,15 @@ def init_month_selector():
         st.stop()
 
     st.session_state["selected_months"] = selected
+
+
+def filter_by_date_range(df, start, end, column: str = "Published Date"):
+    """Rows of df with start <= column < end.
+
+    df must be sorted by column (NaT last), as the loaders in utils.file_io return it,
+    so the bounds are found with a binary search and the result is a positional slice.
+    """
+    values = df[column].to_numpy()
+    lo = values.searchsorted(np.datetime64(pd.Timestamp(start)), side="left")
+    hi = values.searchsorted(np.datetime64(pd.Timestamp(end)), side="left")
+    return df.iloc[lo:hi]
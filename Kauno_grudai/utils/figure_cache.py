@@ -0,0 +1,120 @@
+# utils/figure_cache.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import streamlit as st
+
+# Upper bound on the serialized figures kept per process (every session shares them)
+FIGURE_CACHE_MAX_BYTES = int(float(os.environ.get("FIGURE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Digest of df's columns, dtypes, index and values; equal frames give equal digests."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, [str(c) for c in df.columns], [str(t) for t in df.dtypes])).encode())
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # Unhashable cells (lists, dicts); hash their text instead
+        hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _spec_default(value):
+    # Arrays and Series in a spec are keyed on every element, not on their truncated repr
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def spec_key(spec) -> str:
+    """Canonical text of a chart spec (dicts, lists, strings, numbers, dates, arrays)."""
+    return json.dumps(spec, sort_keys=True, default=_spec_default)
+
+
+class FigureCache:
+    """Serialized figures by key, evicting the least recently used beyond max_bytes."""
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def get(self, key):
+        """Figure JSON stored under key, or None."""
+        with self._lock:
+            figure_json = self._figures.get(key)
+            if figure_json is not None:
+                self._figures.move_to_end(key)
+            return figure_json
+
+    def put(self, key, figure_json: str) -> None:
+        size = len(figure_json)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+        with self._lock:
+            previous = self._figures.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+            self._figures[key] = figure_json
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._figures.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._figures.clear()
+            self.nbytes = 0
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache() -> FigureCache:
+    """The process-wide figure cache."""
+    return FigureCache()
+
+
+def cached_figure(data: pd.DataFrame, spec, build):
+    """build(data), reused while neither data nor spec change.
+
+    Args:
+        data: Aggregate frame the figure is drawn from; keep it to the columns the chart uses
+        spec: Everything else the figure depends on (chart type, columns, title, colors, ...)
+        build: Returns the figure for data
+
+    The figure is stored as JSON, so later calls (from any session) get a fresh copy
+    that can be changed without affecting the cache. Changes made to the returned
+    figure are not part of the cached one; put them in build and spec instead.
+    """
+    key = (frame_fingerprint(data), spec_key(spec))
+    cache = figure_cache()
+    figure_json = cache.get(key)
+    if figure_json is not None:
+        return pio.from_json(figure_json)
+    fig = build(data)
+    cache.put(key, fig.to_json())
+    return fig
+
+
+def px_figure(kind: str, data: pd.DataFrame, layout: dict = None, traces: dict = None, **kwargs):
+    """Cached px.<kind>(data, **kwargs), then fig.update_traces(**traces) and fig.update_layout(**layout)."""
+    def build(frame):
+        fig = getattr(px, kind)(frame, **kwargs)
+        if traces:
+            fig.update_traces(**traces)
+        if layout:
+            fig.update_layout(**layout)
+        return fig
+
+    return cached_figure(data, {"kind": kind, "kwargs": kwargs, "traces": traces, "layout": layout}, build)
@@ -0,0 +1,183 @@
+# utils/file_cache.py
+import functools
+import glob
+import hashlib
+import os
+import threading
+import time
+import streamlit as st
+from streamlit.logger import get_logger
+from utils import config
+
+logger = get_logger(__name__)
+
+# Hit/miss counters per tenant, loader and source files, for the whole process
+_stats = {}
+
+# (path, mtime_ns, size) -> sha1 of the file contents
+_content_hashes = {}
+
+# Entries kept per loader and tenant: one per argument combination (brand, platform,
+# columns, ...) for the current version of the files
+FILE_CACHE_MAX_ENTRIES = 64
+
+# Repository checkout the app runs from; data is also looked up relative to it
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+
+def tenant_root() -> list:
+    """The current tenant's DATA_ROOT (the default roots of file_cached and data_version)."""
+    return [config.DATA_ROOT]
+
+
+def data_roots() -> list:
+    """The current tenant's DATA_ROOT relative to the CWD, then relative to the repository."""
+    return [config.DATA_ROOT, os.path.join(_REPO_ROOT, config.DATA_ROOT)]
+
+
+def _content_hash(path: str, stat) -> str:
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _content_hashes:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _content_hashes[key] = digest.hexdigest()
+    return _content_hashes[key]
+
+
+def file_signature(path: str, content_hash: bool = False) -> tuple:
+    """(path, mtime_ns, size) of a file, or (path, None, None) if it does not exist.
+
+    With content_hash=True the signature is (path, sha1 of the contents) instead, so
+    re-saving an identical file does not invalidate anything. The hash is only
+    recomputed when mtime or size change.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    if content_hash:
+        return (path, _content_hash(path, stat))
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def sources_signature(patterns, content_hash: bool = False) -> tuple:
+    """Signature of every file matched by patterns (paths or glob patterns).
+
+    Adding, removing or changing a matched file changes the signature.
+    """
+    signature = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths = sorted(p for p in glob.glob(pattern) if not os.path.basename(p).startswith("~$"))
+            signature.append((pattern, tuple(file_signature(p, content_hash) for p in paths)))
+        else:
+            signature.append(file_signature(pattern, content_hash))
+    return tuple(signature)
+
+
+def _paths(patterns, roots) -> list:
+    # Every pattern under every root, without repeating a directory reached twice
+    paths = [os.path.join(root, p) for root in roots() for p in patterns]
+    seen = set()
+    return [p for p in paths if not (os.path.abspath(p) in seen or seen.add(os.path.abspath(p)))]
+
+
+def data_version(*patterns, content_hash: bool = False, roots=tenant_root) -> tuple:
+    """Tenant and signature of the files matched by patterns (relative to each of roots()).
+
+    Changes whenever one of the files is added, removed or replaced; use it to key
+    anything derived from them outside of file_cached.
+    """
+    return (config.current_tenant(),) + sources_signature(_paths(patterns, roots), content_hash)
+
+
+def _record(sources: str, hit: bool, seconds: float = 0.0):
+    entry = _stats.setdefault(sources, {"hits": 0, "misses": 0, "load_s": 0.0})
+    if hit:
+        entry["hits"] += 1
+        return
+    entry["misses"] += 1
+    entry["load_s"] += seconds
+    logger.info(
+        "[Cache] %s: loaded in %.2fs (%d hits, %d misses, %.2fs total load time)",
+        sources, seconds, entry["hits"], entry["misses"], entry["load_s"],
+    )
+
+
+def cache_stats() -> dict:
+    """dict['<tenant>: <source files> (<loader>)'] = {'hits', 'misses', 'load_s'} for every file-cached loader."""
+    return {sources: dict(entry) for sources, entry in _stats.items()}
+
+
+def file_cached(
+    *patterns, content_hash: bool = False, cache=st.cache_data, max_entries: int = FILE_CACHE_MAX_ENTRIES, roots=tenant_root
+):
+    """Cache a loader until one of the files it reads changes.
+
+    Args:
+        patterns: Paths or glob patterns of the files the loader reads, relative to
+                  each of roots()
+        content_hash: Key on file contents instead of mtime and size
+        cache: Caching decorator to use (st.cache_data, utils.frame_cache.cached_frames, ...)
+        max_entries: Entries kept per tenant, least recently used evicted first
+        roots: Callable returning the directories the loader searches (tenant_root,
+               data_roots, ...)
+
+    Every tenant gets its own cache. The files are stat'ed on every call, which is
+    cheap; the loader itself only runs again after a file was added, removed or
+    replaced, and the entries loaded from the previous files are dropped then.
+    Hits and misses are counted per tenant and loader (see cache_stats) and every
+    miss is logged with its load time.
+    """
+    def decorator(func):
+        loader = f"{', '.join(patterns)} ({func.__module__}.{func.__qualname__})"
+        # Load time of the current call on a miss; per thread, as sessions run concurrently
+        current = threading.local()
+        # tenant -> [cached loader, signature of the files its entries were loaded from]
+        caches = {}
+        lock = threading.Lock()
+
+        def tenant_cache(tenant: str, signature: tuple):
+            with lock:
+                entry = caches.get(tenant)
+                if entry is None:
+                    def load(signature, args, kwargs):
+                        start = time.perf_counter()
+                        result = func(*args, **kwargs)
+                        current.load_s = time.perf_counter() - start
+                        return result
+
+                    # Streamlit keys a cache by module and qualified name, so every
+                    # loader and tenant gets its own
+                    load.__module__ = func.__module__
+                    load.__qualname__ = f"{func.__qualname__}[{tenant}]"
+                    entry = caches[tenant] = [cache(load, max_entries=max_entries), signature]
+                elif entry[1] != signature:
+                    # The files changed; what was loaded from the old ones is never asked for again
+                    entry[0].clear()
+                    entry[1] = signature
+                return entry[0]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tenant = config.current_tenant()
+            signature = sources_signature(_paths(patterns, roots), content_hash)
+            current.load_s = None
+            result = tenant_cache(tenant, signature)(signature, args, kwargs)
+            if current.load_s is None:
+                _record(f"{tenant}: {loader}", hit=True)
+            else:
+                _record(f"{tenant}: {loader}", hit=False, seconds=current.load_s)
+            return result
+
+        def clear():
+            with lock:
+                for cached, _ in caches.values():
+                    cached.clear()
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
@@ -1,61 +1,89 @@
 import os
+import numpy as np
 import pandas as pd
 import streamlit as st
-from utils.config import DATA_ROOT  # <-- import here
-from utils.config import BRAND_NAME_MAPPING
+from utils import config
+from utils import columnar_cache
+from utils.frame_cache import cached_frames
+from utils.file_cache import file_cached, data_roots
+from utils.brands import brand_variant_keys, file_keys
+
+def _parse_published_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse 'Published Date' once to datetime64[ns] and sort rows by it (NaT last)."""
+    df["Published Date"] = pd.to_datetime(df["Published Date"], errors="coerce").astype("datetime64[ns]")
+    return df.sort_values("Published Date", kind="stable").reset_index(drop=True)
 
 # ------------------------
 # 📄 Load Agility (News)
 # ------------------------
-@st.cache_data
-def load_agility_data(company_name: str):
+def _read_first_sheet(path: str) -> pd.DataFrame:
+    xls = pd.ExcelFile(path)
+    target_sheet = "Raw Data" if "Raw Data" in xls.sheet_names else xls.sheet_names[0]
+    return pd.read_excel(xls, sheet_name=target_sheet)
+
+def _find_brand_column(columns) -> str:
+    for c in columns:
+        cname = str(c).strip().lower()
+        if "brand" in cname or "company" in cname:
+            return c
+    return "company"
+
+def _brand_keys(df: pd.DataFrame) -> pd.Series:
+    return file_keys.map(df[_find_brand_column(df.columns)].astype(str))
+
+def _load_consolidated_agility(full_path: str, variant_keys: set, columns=None) -> pd.DataFrame:
+    """Read one brand's rows from full_pr.xlsx.
+
+    The workbook is converted once into a Parquet file partitioned by brand key
+    (see utils.columnar_cache); later loads read only the requested row groups and
+    columns. Falls back to parsing the workbook when the conversion is unavailable.
+    """
+    parquet_path = None
+    try:
+        parquet_path = columnar_cache.convert_to_parquet(
+            full_path,
+            read_func=lambda: _read_first_sheet(full_path),
+            partition_func=_brand_keys,
+            variant="brand",
+        )
+    except Exception:
+        parquet_path = None
+
+    if parquet_path is not None:
+        return columnar_cache.read_partitions(parquet_path, keys=variant_keys, columns=columns)
+
+    df = _read_first_sheet(full_path)
+    df = df[_brand_keys(df).isin(variant_keys)].copy()
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+@file_cached(os.path.join("agility", "*.xlsx"), cache=cached_frames)
+def load_agility_data(company_name: str, columns=None):
     """Load PR data for a brand.
 
     Strategy:
     1) Prefer consolidated file data/agility/full_pr.xlsx filtering by Brand variants
-    2) Fallback to brand-specific compos files if present
+    2) Brand workbook data/agility/<brand>_agility.xlsx ('Raw Data' sheet)
+    3) Fallback to brand-specific compos files if present
+
+    Pass ``columns`` to keep only those columns (options A and B); the consolidated
+    file then reads nothing else.
+    'Published Date' is returned as datetime64[ns], rows are sorted by it and the
+    frame is read-only; use utils.date_utils.filter_by_date_range to slice it.
     """
-    agility_dir = os.path.join(DATA_ROOT, "agility")
-
-    # Helper: all variants that map to this normalized brand
-    normalized = BRAND_NAME_MAPPING.get(company_name, company_name)
-    variants = [normalized] + [k for k, v in BRAND_NAME_MAPPING.items() if v == normalized]
-
-    def _normalize_brand_key(text: str) -> str:
-        if not isinstance(text, str):
-            return ""
-        t = text.strip().lower().replace("-", " ").replace("_", " ")
-        t = " ".join(t.split())
-        # basic accent folding for LT characters
-        replacements = {
-            "ū": "u", "ė": "e", "š": "s", "ž": "z", "ą": "a", "ę": "e", "į": "i", "č": "c", "į": "i", "Ū": "u",
-        }
-        for k, v in replacements.items():
-            t = t.replace(k, v)
-        return t
-
-    normalized_key = _normalize_brand_key(normalized)
-    variant_keys = {_normalize_brand_key(v) for v in variants}
+    agility_dir = os.path.join(config.DATA_ROOT, "agility")
+    brand_name_mapping = config.BRAND_NAME_MAPPING
+
+    # Keys of all variants that map to this normalized brand
+    normalized = brand_name_mapping.get(company_name, company_name)
+    variant_keys = brand_variant_keys(company_name)
 
     # Option A: consolidated file
     full_path = os.path.join(agility_dir, "full_pr.xlsx")
     if os.path.exists(full_path):
         try:
-            xls = pd.ExcelFile(full_path)
-            target_sheet = "Raw Data" if "Raw Data" in xls.sheet_names else xls.sheet_names[0]
-            df = pd.read_excel(xls, sheet_name=target_sheet)
-            # Filter by Brand variants if a brand/company column exists
-            brand_col = "company"
-            for c in df.columns:
-                cname = str(c).strip().lower()
-                if "brand" in cname or "company" in cname:
-                    brand_col = c
-                    break
-            if brand_col is not None:
-                df = df.copy()
-                df["__brand_key__"] = df[brand_col].astype(str).map(_normalize_brand_key)
-                df = df[df["__brand_key__"].isin(variant_keys)].copy()
-                df = df.drop(columns=["__brand_key__"], errors="ignore")
+            df = _load_consolidated_agility(full_path, variant_keys, columns)
         except Exception as e:
             st.error(f"[Agility] Error loading consolidated PR data: {e}")
             df = None
@@ -66,9 +94,30 @@ def load_agility_data(company_name: str):
                     if candidate in df.columns:
                         df = df.rename(columns={candidate: "Published Date"})
                         break
+            if "Published Date" in df.columns:
+                df = _parse_published_dates(df)
             return df
 
-    # Option B: brand-specific compos files, attempt flexible matching
+    # Option B: one workbook per brand
+    brand_path = os.path.join(agility_dir, f"{company_name.lower()}_agility.xlsx")
+    if os.path.exists(brand_path):
+        try:
+            df = _read_first_sheet(brand_path)
+        except Exception as e:
+            st.error(f"[Agility] Error loading {company_name}: {e}")
+            return None
+        if "Published Date" not in df.columns:
+            for candidate in ["PublishedDate", "published_date", "Date", "date"]:
+                if candidate in df.columns:
+                    df = df.rename(columns={candidate: "Published Date"})
+                    break
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        if "Published Date" in df.columns:
+            df = _parse_published_dates(df)
+        return df
+
+    # Option C: brand-specific compos files, attempt flexible matching
     if not os.path.isdir(agility_dir):
         return None
     try:
@@ -78,7 +127,7 @@ def load_agility_data(company_name: str):
         for f in candidate_files:
             base = f.replace("_compos_analysis.xlsx", "").replace(".xlsx", "")
             # If this base (or title-case, lower-case) maps to our normalized brand, accept
-            mapped = BRAND_NAME_MAPPING.get(base, BRAND_NAME_MAPPING.get(base.title(), base))
+            mapped = brand_name_mapping.get(base, brand_name_mapping.get(base.title(), base))
             if mapped == normalized:
                 matched = os.path.join(agility_dir, f)
                 break
@@ -95,9 +144,7 @@ def load_agility_data(company_name: str):
                     break
         if matched:
             try:
-                xls = pd.ExcelFile(matched)
-                target_sheet = "Raw Data" if "Raw Data" in xls.sheet_names else xls.sheet_names[0]
-                df = pd.read_excel(xls, sheet_name=target_sheet)
+                df = _read_first_sheet(matched)
             except Exception as e:
                 st.error(f"[Agility] Error loading {company_name} from {os.path.basename(matched)}: {e}")
                 return None
@@ -107,6 +154,8 @@ def load_agility_data(company_name: str):
                     if candidate in df.columns:
                         df = df.rename(columns={candidate: "Published Date"})
                         break
+            if "Published Date" in df.columns:
+                df = _parse_published_dates(df)
             return df
     except Exception:
         pass
@@ -117,7 +166,90 @@ def load_agility_data(company_name: str):
 # 📱 Load Social Media Data
 # ------------------------
 
-@st.cache_data
+# Consolidated files: platform -> (filename, company identifier column)
+SOCIAL_CONSOLIDATED_FILES = {
+	"linkedin": ("linkedin_posts.xlsx", "user_id"),
+	"facebook": ("fb_posts.xlsx", "user_username_raw"),
+}
+
+def _normalize_social_dates(df: pd.DataFrame, filename: str):
+	"""Add a naive datetime64[ns] 'Published Date' column; returns None if no date column is recognizable."""
+	if "Published Date" not in df.columns:
+		if "date_posted" in df.columns:
+			df["Published Date"] = pd.to_datetime(df["date_posted"], utc=True, errors="coerce").dt.tz_localize(None)
+		elif "PublishedDate" in df.columns:
+			df["Published Date"] = pd.to_datetime(df["PublishedDate"], utc=True, errors="coerce").dt.tz_localize(None)
+		else:
+			st.warning(f"No recognizable date column in {filename}. Available columns: {list(df.columns)}")
+			return None
+	else:
+		df["Published Date"] = pd.to_datetime(df["Published Date"], utc=True, errors="coerce").dt.tz_localize(None)
+	df["Published Date"] = df["Published Date"].astype("datetime64[ns]")
+	return df
+
+@file_cached(os.path.join("social_media", "*.xlsx"), cache=cached_frames)
+def load_social_platform_data(platform: str):
+	"""Parse a platform's consolidated file once and partition it by company.
+
+	Returns (df, index) where df is sorted by company then date and index maps
+	each company identifier to its (start, stop) row range in df, or None if the
+	file is missing or unreadable. Use get_social_brand_frames() for per-brand slices.
+	"""
+	platform = platform.lower()
+	if platform not in SOCIAL_CONSOLIDATED_FILES:
+		raise ValueError("Platform must be 'facebook' or 'linkedin'")
+
+	filename, company_col = SOCIAL_CONSOLIDATED_FILES[platform]
+	path = os.path.join(config.DATA_ROOT, "social_media", filename)
+	if not os.path.exists(path):
+		return None
+
+	try:
+		df = pd.read_excel(path, sheet_name=0)
+	except Exception as e:
+		st.error(f"[Social] Error loading {platform} data: {e}")
+		return None
+
+	if company_col not in df.columns:
+		st.error(f"[Social] Company column '{company_col}' not found in {filename}")
+		return None
+
+	df = _normalize_social_dates(df, filename)
+	if df is None:
+		return None
+
+	# Rows of a company are contiguous and sorted by date (NaT last)
+	df = df.sort_values([company_col, "Published Date"], kind="stable").reset_index(drop=True)
+	index = {
+		company: (int(positions[0]), int(positions[-1]) + 1)
+		for company, positions in df.groupby(company_col, sort=False).indices.items()
+	}
+	return df, index
+
+def get_social_brand_frames(platform: str, identifiers) -> dict:
+	"""Return dict[identifier] = DataFrame slice of the platform's consolidated file.
+
+	Slices are read-only positional views into the cached frame, sorted by
+	'Published Date', so serving every brand costs a single parse. Identifiers
+	without rows are omitted.
+	"""
+	platform_data = load_social_platform_data(platform)
+	if platform_data is None:
+		# No consolidated export for this tenant: one <identifier>_<platform>.xlsx per brand
+		frames = {}
+		for identifier in identifiers:
+			df = _load_individual_social_file(identifier, platform.lower())
+			if df is not None and not df.empty:
+				frames[identifier] = df
+		return frames
+	df, index = platform_data
+	frames = {}
+	for identifier in identifiers:
+		if identifier in index:
+			start, stop = index[identifier]
+			frames[identifier] = df.iloc[start:stop]
+	return frames
+
 def load_social_data(company_name: str, platform: str, use_consolidated: bool = True):
 	"""Load Facebook or LinkedIn file for a company, normalize date format.
 	
@@ -126,75 +258,49 @@ def load_social_data(company_name: str, platform: str, use_consolidated: bool =
 		platform: 'facebook' or 'linkedin'
 		use_consolidated: If True, load from consolidated files (linkedin_posts.xlsx/fb_posts.xlsx)
 		                 If False, load from individual company files
+
+	The frame is read-only and sorted by its datetime64[ns] 'Published Date'.
 	"""
 	platform = platform.lower()
 	if platform not in {"facebook", "linkedin"}:
 		raise ValueError("Platform must be 'facebook' or 'linkedin'")
 
 	if use_consolidated:
-		# Load from consolidated files
-		if platform == "linkedin":
-			filename = "linkedin_posts.xlsx"
-			company_col = "user_id"
-		else:  # facebook
-			filename = "fb_posts.xlsx"
-			company_col = "user_username_raw"
-		
-		path = os.path.join(DATA_ROOT, "social_media", filename)
-		
-		if not os.path.exists(path):
-			return None
-			
-		try:
-			df = pd.read_excel(path, sheet_name=0)
-			# Filter for the specific company
-			if company_col in df.columns:
-				df = df[df[company_col] == company_name].copy()
-				if df.empty:
-					return None
-			else:
-				st.error(f"[Social] Company column '{company_col}' not found in {filename}")
-				return None
-		except Exception as e:
-			st.error(f"[Social] Error loading {platform} data for {company_name}: {e}")
-			return None
-	else:
-		# Load from individual company files (original behavior)
-		filename = f"{company_name.lower()}_{platform}.xlsx"
-		path = os.path.join(DATA_ROOT, "social_media", filename)
+		# Served from the platform-level loader, which parses each file once
+		return get_social_brand_frames(platform, [company_name]).get(company_name)
 
-		if not os.path.exists(path):
-			return None
+	return _load_individual_social_file(company_name, platform)
 
-		try:
-			df = pd.read_excel(path, sheet_name=0)
-		except Exception as e:
-			st.error(f"[Social] Error loading {platform} data for {company_name}: {e}")
-			return None
+@file_cached(os.path.join("social_media", "*.xlsx"), cache=cached_frames)
+def _load_individual_social_file(company_name: str, platform: str):
+	# Load from individual company files (original behavior)
+	filename = f"{company_name.lower()}_{platform}.xlsx"
+	path = os.path.join(config.DATA_ROOT, "social_media", filename)
 
-	# Normalize datetime column
-	if "Published Date" not in df.columns:
-		if "date_posted" in df.columns:
-			df["Published Date"] = pd.to_datetime(df["date_posted"], utc=True, errors="coerce").dt.tz_localize(None)
-		elif "PublishedDate" in df.columns:
-			df["Published Date"] = pd.to_datetime(df["PublishedDate"], utc=True, errors="coerce").dt.tz_localize(None)
-		else:
-			st.warning(f"No recognizable date column in {filename}. Available columns: {list(df.columns)}")
-			return None
-	else:
-		df["Published Date"] = pd.to_datetime(df["Published Date"], utc=True, errors="coerce").dt.tz_localize(None)
+	if not os.path.exists(path):
+		return None
 
-	return df
+	try:
+		df = pd.read_excel(path, sheet_name=0)
+	except Exception as e:
+		st.error(f"[Social] Error loading {platform} data for {company_name}: {e}")
+		return None
+
+	df = _normalize_social_dates(df, filename)
+	if df is None:
+		return None
+	return df.sort_values("Published Date", kind="stable").reset_index(drop=True)
 
 # ------------------------
 # 🗃️ Load the Actual Volume 
 # ------------------------
 
-AGILITY_METADATA_PATH = os.path.join(DATA_ROOT, "agility", "agility_metadata.xlsx")
+AGILITY_METADATA_FILE = os.path.join("agility", "agility_metadata.xlsx")
 
 def load_agility_volume_map():
-	if os.path.exists(AGILITY_METADATA_PATH):
-		return pd.read_excel(AGILITY_METADATA_PATH, index_col="Company").to_dict()["Volume"]
+	metadata_path = os.path.join(config.DATA_ROOT, AGILITY_METADATA_FILE)
+	if os.path.exists(metadata_path):
+		return pd.read_excel(metadata_path, index_col="Company").to_dict()["Volume"]
 	else:
 		return {}
 
@@ -211,6 +317,9 @@ def load_all_social_data(brands, platform: str, use_consolidated: bool = False):
 		use_consolidated: If True, load from consolidated files (linkedin_posts.xlsx/fb_posts.xlsx)
 		                 If False, load from individual company files
 	"""
+	if use_consolidated:
+		return get_social_brand_frames(platform, brands)
+
 	results = {}
 	for brand in brands:
 		df = load_social_data(brand, platform, use_consolidated=use_consolidated)
@@ -222,18 +331,47 @@ def load_all_social_data(brands, platform: str, use_consolidated: bool = False):
 # 📢 Load Ads Intelligence data
 # ------------------------
 
-@st.cache_data
+# Meta publisher platforms; bit i of the ads 'platform_mask' column is AD_PLATFORMS[i]
+AD_PLATFORMS = ["FACEBOOK", "INSTAGRAM", "MESSENGER", "THREADS", "AUDIENCE_NETWORK"]
+PLATFORM_BITS = {platform: 1 << i for i, platform in enumerate(AD_PLATFORMS)}
+
+def parse_platform_list(value) -> list:
+	"""Parse a publisherPlatform cell like "['FACEBOOK', 'INSTAGRAM']" into a list.
+
+	Handles the flat list-of-names literal the scraper exports without ast.literal_eval;
+	anything else yields [].
+	"""
+	if isinstance(value, list):
+		return value
+	if not isinstance(value, str):
+		return []
+	text = value.strip()
+	if not (text.startswith("[") and text.endswith("]")):
+		return []
+	names = (item.strip().strip("'\"").strip() for item in text[1:-1].split(","))
+	return [name for name in names if name]
+
+def platform_masks(values: pd.Series) -> pd.Series:
+	"""Bitmask of AD_PLATFORMS per row; every distinct cell value is parsed once."""
+	codes, uniques = pd.factorize(values.astype(str))
+	lookup = np.array(
+		[sum(PLATFORM_BITS.get(p, 0) for p in set(parse_platform_list(u))) for u in uniques],
+		dtype=np.int16,
+	)
+	return pd.Series(lookup[codes], index=values.index, name="platform_mask")
+
+def on_platform(df: pd.DataFrame, platform: str) -> pd.Series:
+	"""Boolean mask of the ads in df (from load_ads_data) that ran on platform."""
+	return (df["platform_mask"] & PLATFORM_BITS[platform]) != 0
+
+@file_cached(os.path.join("ads", "*.xlsx"), cache=cached_frames, roots=data_roots)
 def load_ads_data():
 	"""
 	Load ads scraping Excel and normalize key fields.
 	Returns a pandas DataFrame or None if not found.
 	"""
-	# Build potential roots: configured root, module-relative root, and CWD/data
-	module_dir = os.path.dirname(os.path.abspath(__file__))
-	project_root = os.path.abspath(os.path.join(module_dir, os.pardir))
-	module_data_root = os.path.join(project_root, "data")
-	cwd_data_root = os.path.join(os.getcwd(), "data")
-	roots = [DATA_ROOT, module_data_root, cwd_data_root]
+	# Potential roots: the tenant's root relative to the CWD and to the repository
+	roots = data_roots()
 
 	candidate_filenames = [
 		"ads.xlsx",
@@ -291,13 +429,20 @@ def load_ads_data():
 	if "startDateFormatted" in df.columns and "endDateFormatted" in df.columns:
 		df["duration_days"] = (df["endDateFormatted"] - df["startDateFormatted"]).dt.days
 
+	# Platforms as a bitmask, parsed once here instead of exploded on every render
+	platform_col = next((c for c in ["publisherPlatform", "platforms"] if c in df.columns), None)
+	if platform_col is not None:
+		df["platform_mask"] = platform_masks(df[platform_col])
+	else:
+		df["platform_mask"] = np.int16(0)
+
 	return df
 
 # ------------------------
 # 🎯 Load Audience Affinity outputs (pickled)
 # ------------------------
 
-@st.cache_data
+@file_cached(os.path.join("audience_affinity", "*.pkl"))
 def load_audience_affinity_outputs(source: str = "pr"):
 	"""Load audience affinity outputs for a given source ('pr' or 'linkedin').
 
@@ -318,7 +463,10 @@ def load_audience_affinity_outputs(source: str = "pr"):
 		st.error(f"[Audience Affinity] Unknown source '{source}'. Use 'pr' or 'linkedin'.")
 		return None
 
-	path = os.path.join(DATA_ROOT, "audience_affinity", filename)
+	path = os.path.join(config.DATA_ROOT, "audience_affinity", filename)
+	if source == "pr" and not os.path.exists(path):
+		# Tenants with a single source keep the unsuffixed file name
+		path = os.path.join(config.DATA_ROOT, "audience_affinity", "audience_affinity_outputs.pkl")
 	if not os.path.exists(path):
 		st.warning(f"Audience affinity outputs not found for source '{source}'.")
 		return None
@@ -356,9 +504,9 @@ def load_audience_affinity_outputs(source: str = "pr"):
 # 🧱 Load Content Pillars outputs (pickled)
 # ------------------------
 
-@st.cache_data
+@file_cached(os.path.join("content_pillars", "content_pillar_outputs.pkl"))
 def load_content_pillar_outputs():
-	path = os.path.join(DATA_ROOT, "content_pillars", "content_pillar_outputs.pkl")
+	path = os.path.join(config.DATA_ROOT, "content_pillars", "content_pillar_outputs.pkl")
 	if not os.path.exists(path):
 		st.warning("Content pillar outputs not found.")
 		return None
@@ -369,3 +517,19 @@ def load_content_pillar_outputs():
 	except Exception as e:
 		st.error(f"[Content Pillars] Error loading outputs: {e}")
 		return None
+
+# ------------------------
+# 🧠 Load Topic Insights (one-line examples per brand and topic)
+# ------------------------
+
+@file_cached(os.path.join("agility", "topic_insights.xlsx"), cache=cached_frames)
+def load_topic_insights():
+	path = os.path.join(config.DATA_ROOT, "agility", "topic_insights.xlsx")
+	if not os.path.exists(path):
+		st.error("[Topics] topic_insights.xlsx not found in agility folder.")
+		return None
+	try:
+		return pd.read_excel(path)
+	except Exception as e:
+		st.error(f"[Topics] Error loading topic_insights.xlsx: {e}")
+		return None
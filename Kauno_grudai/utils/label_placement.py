@@ -0,0 +1,63 @@
+# utils/label_placement.py
+import bisect
+import numpy as np
+
+
+def place_labels(x, y, height: float, width: float = None, offset: float = 0.0) -> np.ndarray:
+    """Vertical position of each point's label such that no two label boxes overlap.
+
+    Args:
+        x, y: Point each label belongs to
+        height: Label box height, in y units
+        width: Label box width, in x units; None keeps every label apart from every
+            other one, however far apart their points are horizontally
+        offset: How far below its point a label sits when nothing is in the way
+
+    Labels are swept from the top down, each moving just below the placed labels it
+    would overlap. Without a width that is simply just below the previous one; with a
+    width, placed labels are kept sorted so a label only checks the ones within one
+    height of it. Returns the positions in input order; points with a NaN x or y get
+    NaN and take no room.
+    """
+    x = np.asarray(x, dtype=float)
+    positions = np.asarray(y, dtype=float) - offset
+    # NaNs would break the sort order the sweep relies on
+    valid = ~(np.isnan(positions) | np.isnan(x))
+    positions[~valid] = np.nan
+    order = np.flatnonzero(valid)[np.argsort(-positions[valid], kind="stable")]
+    if width is None:
+        lowest = np.inf
+        for i in order:
+            positions[i] = lowest = min(positions[i], lowest - height)
+        return positions
+
+    # Placed labels from the top down: negated positions (ascending) and their x
+    keys, placed_x = [], []
+    for i in order:
+        pos = positions[i]
+        # Everything before j is at least one height above pos
+        j = bisect.bisect_right(keys, -(pos + height))
+        while j < len(keys) and -keys[j] > pos - height:
+            if abs(placed_x[j] - x[i]) < width:
+                # Move below it; every label above it is then cleared as well
+                pos = -keys[j] - height
+            j += 1
+        positions[i] = pos
+        j = bisect.bisect_right(keys, -pos)
+        keys.insert(j, -pos)
+        placed_x.insert(j, x[i])
+    return positions
+
+
+def label_annotations(x, y, texts, height: float, width: float = None, offset: float = 0.0, **style) -> list:
+    """Annotation dicts for fig.update_layout(annotations=...), placed by place_labels.
+
+    style is passed to every annotation (font, bgcolor, yanchor, ...). Points with a
+    NaN x or y get no label.
+    """
+    positions = place_labels(x, y, height, width=width, offset=offset)
+    return [
+        dict(x=xi, y=float(pos), text=text, **style)
+        for xi, pos, text in zip(x, positions, texts)
+        if not np.isnan(pos)
+    ]
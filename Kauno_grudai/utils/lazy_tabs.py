@@ -0,0 +1,46 @@
+# utils/lazy_tabs.py
+import streamlit as st
+
+# session_state key of the figures memoized by tab_figure
+_FIGURES_KEY = "_lazy_tab_figures"
+
+
+def lazy_tabs(labels, key: str, render) -> None:
+    """st.tabs where only the selected tab runs render(index, label).
+
+    Selecting a tab reruns the script, so the data work and charts of the other tabs
+    are skipped on every run. key must be unique on the page. Streamlit versions
+    without tab state (no on_change) render every tab, as plain st.tabs does.
+    """
+    labels = list(labels)
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        tabs = st.tabs(labels)
+    for i, (tab, label) in enumerate(zip(tabs, labels)):
+        if getattr(tab, "open", True) is False:
+            continue
+        with tab:
+            render(i, label)
+
+
+def tab_figure(scope: str, tab, version, build):
+    """Figure of one tab, built by build() once per version and reused after that.
+
+    Args:
+        scope: Tab set the figure belongs to, e.g. "volume_trends"
+        tab: Tab (and chart) within the scope
+        version: Data version and date range the figure depends on; any hashable
+        build: Returns the figure
+
+    Figures are kept in the session, so switching back to a tab does not rebuild its
+    chart. A new version of a scope drops the figures of the previous one.
+    """
+    memo = st.session_state.setdefault(_FIGURES_KEY, {})
+    cached_version, figures = memo.get(scope, (None, None))
+    if figures is None or cached_version != version:
+        figures = {}
+        memo[scope] = (version, figures)
+    if tab not in figures:
+        figures[tab] = build()
+    return figures[tab]
@@ -0,0 +1,66 @@
+# utils/pr_context.py
+import pandas as pd
+from utils.date_utils import get_selected_date_range, filter_by_date_range
+from utils.file_io import load_agility_data
+from utils.pr_cube import load_pr_cube, pr_data_version, slice_months
+
+
+class PRContext:
+    """PR data shared by every Press Releases section during one rerun.
+
+    Built once in main.py with the selected date range applied. The cube is fetched
+    from the Streamlit cache a single time and every derived view is computed on first
+    use and then reused by the following sections.
+    """
+
+    def __init__(self, start_date, end_date, cube: dict, data_version=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.cube = cube
+        self.data_version = data_version
+        self._views = {}
+
+    @property
+    def version(self) -> tuple:
+        """Data version and selected date range; keys anything derived from the selected months."""
+        return (self.data_version, self.start_date, self.end_date)
+
+    @property
+    def brands(self) -> list:
+        return self.cube["brands"]
+
+    @property
+    def columns(self) -> dict:
+        return self.cube["columns"]
+
+    def view(self, key, build):
+        """Return the view stored under key, calling build() the first time it is requested."""
+        if key not in self._views:
+            self._views[key] = build()
+        return self._views[key]
+
+    def period(self, table: str) -> pd.DataFrame:
+        """Cube table ('metrics', 'sentiment', 'topics', ...) limited to the selected months."""
+        return self.view(("period", table), lambda: slice_months(self.cube[table], self.start_date, self.end_date))
+
+    def totals(self) -> pd.DataFrame:
+        """Volume, Impressions, BMQ_sum and BMQ_count per Company over the selected months."""
+        return self.view(
+            "totals",
+            lambda: self.period("metrics").groupby("Company")[["Volume", "Impressions", "BMQ_sum", "BMQ_count"]].sum(),
+        )
+
+    def articles(self, brand: str):
+        """Article rows of one brand within the selected months, or None without PR data."""
+        def build():
+            df = load_agility_data(brand)
+            if df is None or "Published Date" not in df.columns:
+                return None
+            return filter_by_date_range(df, self.start_date, self.end_date)
+        return self.view(("articles", brand), build)
+
+
+def build_pr_context() -> PRContext:
+    start_date, end_date = get_selected_date_range()
+    data_version = pr_data_version()
+    return PRContext(start_date, end_date, load_pr_cube(data_version), data_version)
@@ -0,0 +1,119 @@
+# utils/pr_cube.py
+import glob
+import os
+import pandas as pd
+from utils import config
+from utils.file_io import load_agility_data
+from utils.columnar_cache import source_signature
+from utils.topics import TOPIC_COLUMNS, topic_counts
+from utils.frame_cache import cached_frames
+
+# Categorical dimensions counted per (Company, Month)
+_COUNT_DIMENSIONS = {
+    "sentiment": "Sentiment",
+    "archetypes": "Top Archetype",
+    "countries": "Country",
+}
+
+
+def pr_data_version() -> tuple:
+    """Tenant and signature of every Agility workbook; changes whenever the PR data is replaced."""
+    agility_dir = os.path.join(config.DATA_ROOT, "agility")
+    paths = sorted(
+        p for p in glob.glob(os.path.join(agility_dir, "*.xlsx"))
+        if not os.path.basename(p).startswith("~$")
+    )
+    return (config.current_tenant(),) + tuple(source_signature(p) for p in paths)
+
+
+def _articles(brand: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Per-article frame with Company, Month and the numeric measures the cube sums."""
+    out = pd.DataFrame(index=df.index)
+    out["Company"] = brand
+    out["Month"] = df["Published Date"].dt.to_period("M").dt.to_timestamp()
+    out["Impressions"] = pd.to_numeric(df["Impressions"], errors="coerce").fillna(0) if "Impressions" in df.columns else 0.0
+    out["BMQ"] = pd.to_numeric(df["BMQ"], errors="coerce") if "BMQ" in df.columns else float("nan")
+    for column in _COUNT_DIMENSIONS.values():
+        if column in df.columns:
+            out[column] = df[column]
+    for column in TOPIC_COLUMNS:
+        if column in df.columns:
+            out[column] = df[column]
+    return out.dropna(subset=["Month"])
+
+
+def _count_by(articles: pd.DataFrame, column: str) -> pd.DataFrame:
+    if column not in articles.columns:
+        return pd.DataFrame(columns=["Company", "Month", column, "Count"])
+    return (
+        articles.dropna(subset=[column])
+        .groupby(["Company", "Month", column])
+        .size()
+        .reset_index(name="Count")
+    )
+
+
+def _count_topics(articles: pd.DataFrame) -> pd.DataFrame:
+    if not any(c in articles.columns for c in TOPIC_COLUMNS) or articles.empty:
+        return pd.DataFrame(columns=["Company", "Month", "Topic", "Count"])
+    matrix = topic_counts(articles, by=["Company", "Month"])
+    long = matrix.T.stack()
+    return long[long > 0].reset_index(name="Count")
+
+
+# Keyed by data version; a few tenants with their current data each
+@cached_frames(max_entries=8)
+def _build_pr_cube(data_version: tuple) -> dict:
+    frames = []
+    columns = {}
+    for brand in config.BRANDS:
+        df = load_agility_data(brand)
+        if df is None or df.empty or "Published Date" not in df.columns:
+            continue
+        columns[brand] = list(df.columns)
+        frames.append(_articles(brand, df))
+
+    if frames:
+        articles = pd.concat(frames, ignore_index=True)
+    else:
+        articles = pd.DataFrame(columns=["Company", "Month", "Impressions", "BMQ"])
+
+    metrics = (
+        articles.groupby(["Company", "Month"])
+        .agg(
+            Volume=("Month", "size"),
+            Impressions=("Impressions", "sum"),
+            BMQ_sum=("BMQ", "sum"),
+            BMQ_count=("BMQ", "count"),
+        )
+        .reset_index()
+    )
+
+    cube = {
+        "brands": [b for b in config.BRANDS if b in columns],
+        "columns": columns,
+        "metrics": metrics,
+        "topics": _count_topics(articles),
+    }
+    for name, column in _COUNT_DIMENSIONS.items():
+        cube[name] = _count_by(articles, column)
+    return cube
+
+
+def load_pr_cube(data_version: tuple = None) -> dict:
+    """Load the (brand x month) PR aggregate cube for data_version (default: pr_data_version()).
+
+    Returns a dict with:
+    - 'brands': brands with PR data, in BRANDS order
+    - 'columns': dict[brand] = source columns available for that brand
+    - 'metrics': Company, Month, Volume, Impressions, BMQ_sum, BMQ_count
+    - 'sentiment' / 'archetypes' / 'countries': Company, Month, <dimension>, Count
+    - 'topics': Company, Month, Topic, Count (mentions across the cluster topic columns)
+    """
+    return _build_pr_cube(data_version or pr_data_version())
+
+
+def slice_months(table: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """Rows of a cube table whose Month falls in [start_date, end_date)."""
+    months = table["Month"]
+    return table[(months >= pd.Timestamp(start_date)) & (months < pd.Timestamp(end_date))]
@@ -3,8 +3,8 @@ app.py — Streamlit UI for the LLM Copy POC.
 
 Pages:
 - Editor: paste text, add instructions, pick tone/length, generate/regen/copy/like.
-- History: per-project generations, restore, liked filter.
-- Tone Admin: edit/save guidelines.
+- History: per-project generations, newest first and paged, liked filter.
+- Tone Admin: edit/save guidelines; refuses to overwrite a newer saved version.
 - Export/Import: export current project or import JSON.
 
 Environment:
@@ -16,36 +16,46 @@ from pathlib import Path
 import json
 
 from storage import (
-    load_state, persist_and_return,
-    get_guidelines, update_guidelines,
-    get_product_description, update_product_description,
+    load_state, persist_and_return, store_version, ConflictError,
+    get_guidelines, get_product_description, update_guidelines_and_product_description,
     list_projects, create_project, set_current_project, get_current_project,
-    add_generation, list_generations, toggle_like, list_liked
+    add_generation, page_generations, count_generations, toggle_like
 )
 from prompting import build_prompts
-from llm import generate
+from llm import generate_stream
 
 st.set_page_config(page_title="LLM Copy POC", layout="wide")
 
+# Generations shown per History page
+HISTORY_PAGE_SIZE = 20
+# Seconds between checks for changes saved by other users (History page)
+WATCH_INTERVAL_S = 5
+
 STATE = load_state()
 
 # Sidebar navigation
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", ["Editor", "History", "Tone Admin"])
 
-# Project selection
+# Project selection; kept per session so users do not switch each other's project.
+# The stored current project is only the default for new sessions.
 st.sidebar.markdown("---")
 projects = list_projects(STATE)
-cur_proj = get_current_project(STATE)
+cur_proj = st.session_state.get("project")
+if cur_proj not in projects:
+    cur_proj = get_current_project(STATE)
 sel_proj = st.sidebar.selectbox("Project", projects, index=projects.index(cur_proj))
 if sel_proj != cur_proj:
+    cur_proj = sel_proj
     STATE = set_current_project(STATE, sel_proj)
     STATE = persist_and_return(STATE)
+st.session_state["project"] = cur_proj
 
 new_name = st.sidebar.text_input("New project name")
 if st.sidebar.button("Create project") and new_name.strip():
     STATE = create_project(STATE, new_name.strip())
     STATE = persist_and_return(STATE)
+    st.session_state["project"] = new_name.strip()
     st.rerun()
 
 st.sidebar.markdown("---")
@@ -60,6 +70,9 @@ if page == "Editor":
                           help="0 = Keep original text mostly intact, 3 = Apply guidelines very strictly")
     length_code = st.selectbox("Copy length", ["short", "medium", "long"], index=1)
 
+    # New text is shown here as it arrives, then replaced by "Latest output"
+    stream_area = st.empty()
+
     if st.button("Generate"):
         g_content, _, _ = get_guidelines(STATE)
         pd_content, _, _ = get_product_description(STATE)
@@ -71,7 +84,11 @@ if page == "Editor":
             tone_level=tone_level,
             length_code=length_code,
         )
-        resp = generate(spec.system, spec.user, params=spec.params, model="gpt-4o")
+        stream = generate_stream(spec.system, spec.user, params=spec.params, model="gpt-4o")
+        with stream_area.container():
+            st.write_stream(stream)
+        resp = stream.result
+        stream_area.empty()
         STATE = add_generation(
             STATE,
             source=source_text,
@@ -79,6 +96,7 @@ if page == "Editor":
             tone=tone_level,
             length=length_code,
             out=resp["text"],
+            project=cur_proj,
         )
         STATE = persist_and_return(STATE)
         st.session_state["last_output"] = resp["text"]
@@ -103,7 +121,11 @@ if page == "Editor":
                     tone_level=tone_level,
                     length_code=length_code,
                 )
-                resp = generate(spec.system, spec.user, params=spec.params, model="gpt-4o")
+                # A new take: skip the response cache
+                stream = generate_stream(spec.system, spec.user, params=spec.params, model="gpt-4o", use_cache=False)
+                with stream_area.container():
+                    st.write_stream(stream)
+                resp = stream.result
                 STATE = add_generation(
                     STATE,
                     source=source_text,
@@ -111,6 +133,7 @@ if page == "Editor":
                     tone=tone_level,
                     length=length_code,
                     out=resp["text"],
+                    project=cur_proj,
                 )
                 STATE = persist_and_return(STATE)
                 st.session_state["last_output"] = resp["text"]
@@ -118,38 +141,69 @@ if page == "Editor":
         with col3:
             if st.button("❤️ Like", key="like-btn"):
                 # Get the most recent generation and toggle its like status
-                gens = list_generations(STATE)
+                gens, _ = page_generations(STATE, cur_proj, limit=1)
                 if gens:
-                    latest_gen = gens[-1]  # Most recent generation
-                    STATE = toggle_like(STATE, latest_gen["id"])
+                    latest_gen = gens[0]  # Most recent generation
+                    STATE = toggle_like(STATE, latest_gen["id"], cur_proj)
                     STATE = persist_and_return(STATE)
                     st.success("Liked! ❤️")
                     st.rerun()
 
 # ---------------- History ----------------
 elif page == "History":
-    st.header(f"History — {get_current_project(STATE)}")
-    
-    # Show liked texts at the top
-    liked = list_liked(STATE)
-    if liked:
-        st.subheader("❤️ Liked texts")
-        for g in liked:
-            st.text_area(f"Liked: {g['ts']}", g["out"], height=100, key=f"liked-{g['id']}")
-        st.markdown("---")
-    
-    # Show all generations
-    gens = list_generations(STATE)
+    st.header(f"History — {cur_proj}")
+
+    @st.fragment(run_every=WATCH_INTERVAL_S)
+    def watch_store():
+        # Two stats per check; the page only reruns (and reloads) when someone saved
+        version = store_version()
+        if st.session_state.setdefault("history-store-version", version) != version:
+            st.session_state["history-store-version"] = version
+            st.rerun()
+
+    st.session_state["history-store-version"] = store_version()
+    watch_store()
+
+    liked_only = st.toggle("❤️ Liked only", key="history-liked-only")
+    total = count_generations(STATE, cur_proj, liked_only=liked_only)
+
+    # Cursors of the pages visited so far, newest first; reset when project or filter changes
+    view = (cur_proj, liked_only)
+    if st.session_state.get("history-view") != view:
+        st.session_state["history-view"] = view
+        st.session_state["history-cursors"] = [None]
+    cursors = st.session_state["history-cursors"]
+    gens, next_cursor = page_generations(
+        STATE, cur_proj, cursor=cursors[-1], limit=HISTORY_PAGE_SIZE, liked_only=liked_only
+    )
+
     if not gens:
-        st.info("No generations yet.")
+        st.info("No liked texts yet." if liked_only else "No generations yet.")
     else:
-        for g in reversed(gens):
+        for g in gens:
+            if g.get("liked"):
+                st.text_area(f"Liked: {g['ts']}", g["out"], height=100, key=f"liked-{g['id']}")
             st.markdown(f"**{g['ts']}** — Tone {g['tone']} — {g['length']}")
             with st.expander("View"):
                 st.text_area("Output", g["out"], height=150, key=f"output-{g['id']}")
                 if st.button("Toggle like", key=f"like-{g['id']}"):
-                    STATE = toggle_like(STATE, g["id"])
+                    STATE = toggle_like(STATE, g["id"], cur_proj)
                     STATE = persist_and_return(STATE)
+                    st.rerun()
+
+        st.markdown("---")
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("← Newer", disabled=len(cursors) == 1, key="history-newer"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+            st.caption(f"Page {len(cursors)} of {pages} — {total} generations")
+        with col3:
+            if st.button("Older →", disabled=next_cursor is None, key="history-older"):
+                cursors.append(next_cursor)
+                st.rerun()
 
 # ---------------- Tone Admin ----------------
 elif page == "Tone Admin":
@@ -158,17 +212,38 @@ elif page == "Tone Admin":
     # Guidelines section
     st.subheader("Tone of Voice Guidelines")
     content, ver, updated = get_guidelines(STATE)
-    guidelines_txt = st.text_area("Edit guidelines", content, height=300, key="guidelines-text")
+    # Seed the editors with the saved text, together with the version it is; saving
+    # fails if someone saved since. Streamlit drops the text when the page is left,
+    # so coming back starts over from the latest version.
+    if "guidelines-text" not in st.session_state:
+        st.session_state["guidelines-text"] = content
+        st.session_state["guidelines-base"] = ver
+    guidelines_txt = st.text_area("Edit guidelines", height=300, key="guidelines-text")
     
     # Product Description section
     st.subheader("Product Description")
     pd_content, pd_ver, pd_updated = get_product_description(STATE)
-    product_txt = st.text_area("Edit product description", pd_content, height=200, key="product-text")
+    if "product-text" not in st.session_state:
+        st.session_state["product-text"] = pd_content
+        st.session_state["product-base"] = pd_ver
+    product_txt = st.text_area("Edit product description", height=200, key="product-text")
     
     # Save button for both
     if st.button("Save Guidelines & Product Description"):
-        STATE = update_guidelines(STATE, guidelines_txt)
-        STATE = update_product_description(STATE, product_txt)
-        STATE = persist_and_return(STATE)
-        st.success("Guidelines and Product Description updated.")
+        try:
+            STATE = update_guidelines_and_product_description(
+                STATE, guidelines_txt, product_txt,
+                st.session_state["guidelines-base"], st.session_state["product-base"],
+            )
+            STATE = persist_and_return(STATE)
+        except ConflictError as e:
+            st.error(f"{e}. Reload to see the latest version, then reapply your edits.")
+        else:
+            st.session_state["guidelines-base"] = get_guidelines(STATE)[1]
+            st.session_state["product-base"] = get_product_description(STATE)[1]
+            st.success("Guidelines and Product Description updated.")
+    if st.button("Reload latest", key="reload-tone"):
+        for key in ("guidelines-text", "product-text", "guidelines-base", "product-base"):
+            st.session_state.pop(key, None)
+        st.rerun()
 
@@ -3,19 +3,27 @@ llm.py — minimal, provider-agnostic wrapper around an OpenAI-compatible Chat C
 
 Goals for POC:
 - One sync function: generate(system, user, *, model=None, params=None)
+- generate_stream(...) with the same arguments yields the text as it arrives
+  (server-sent events), for showing the first words without waiting for the rest.
 - Uses environment variables: OPENAI_API_KEY (required), OPENAI_BASE_URL (optional), LLM_MODEL (optional default)
 - Targets the /v1/chat/completions endpoint; works with OpenAI and compatible providers.
 - Simple retry (1) and timeout.
+- Responses are cached by request (see llm_cache.py); LLM_CACHE=0 turns that off.
+  LLM_DETERMINISTIC=1 sends temperature 0 and a fixed seed, so a cached response is
+  what the model would have returned anyway.
 """
 from __future__ import annotations
 
 import os
 import time
 import json
-from typing import Dict, Any, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
 import requests
 from dotenv import load_dotenv
 
+from llm_cache import ResponseCache, request_key
+
 # Try to load environment variables from .env file (for local development)
 try:
     load_dotenv()
@@ -39,6 +47,15 @@ DEFAULT_MODEL = _get_secret("LLM_MODEL", "gpt-4o")
 BASE_URL = _get_secret("OPENAI_BASE_URL", "https://api.openai.com/v1")
 API_KEY = _get_secret("OPENAI_API_KEY")
 TIMEOUT_SECONDS = float(_get_secret("LLM_TIMEOUT", "20"))
+CACHE_ENABLED = str(_get_secret("LLM_CACHE", "1")).lower() not in ("0", "false", "no", "off")
+DETERMINISTIC = str(_get_secret("LLM_DETERMINISTIC", "0")).lower() in ("1", "true", "yes", "on")
+DETERMINISTIC_SEED = 0
+
+RESPONSE_CACHE = ResponseCache(
+    Path(_get_secret("LLM_CACHE_DIR", "llm_cache")),
+    ttl_s=float(_get_secret("LLM_CACHE_TTL", "86400")),
+    max_entries=int(_get_secret("LLM_CACHE_MAX_ENTRIES", "256")),
+)
 
 
 def _estimate_tokens(text: str) -> int:
@@ -91,11 +108,42 @@ def _request(payload: Dict[str, Any]) -> Dict[str, Any]:
     return resp.json()
 
 
-def generate(system: str, user: str, *, model: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Return dict with keys: text, model, usage, latency_s.
+def _open_stream(payload: Dict[str, Any]) -> requests.Response:
+    url = f"{BASE_URL.rstrip('/')}/chat/completions"
+    resp = requests.post(url, headers=_headers(), json=dict(payload, stream=True), timeout=TIMEOUT_SECONDS, stream=True)
+    if resp.status_code >= 400:
+        try:
+            detail = resp.json()
+        except Exception:
+            detail = resp.text
+        resp.close()
+        raise LLMError(f"LLM HTTP {resp.status_code}: {detail}")
+    return resp
 
-    Params may include: temperature, max_tokens, frequency_penalty, presence_penalty, top_p (optional).
-    """
+
+def _sse_events(resp: requests.Response) -> Iterator[Dict[str, Any]]:
+    """JSON payloads of the "data:" events of a chat-completions stream, up to [DONE]."""
+    # chunk_size=None: hand over whatever arrived instead of waiting for 512 bytes
+    for line in resp.iter_lines(chunk_size=None, decode_unicode=False):
+        line = line.decode("utf-8").strip() if line else ""
+        if not line.startswith("data:"):
+            continue  # blank separators, comments (": keep-alive"), other fields
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except ValueError:
+            raise LLMError(f"Malformed LLM stream event: {data}")
+
+
+def _build_payload(
+    system: str,
+    user: str,
+    model: Optional[str],
+    params: Optional[Dict[str, Any]],
+    deterministic: Optional[bool],
+) -> Dict[str, Any]:
     # Get max_tokens from params or use default
     max_tokens = 400
     if params and "max_tokens" in params:
@@ -134,14 +182,60 @@ def generate(system: str, user: str, *, model: Optional[str] = None, params: Opt
         for k in ("temperature", "max_tokens", "top_p", "frequency_penalty", "presence_penalty"):
             if k in params:
                 payload[k] = params[k]
+    if DETERMINISTIC if deterministic is None else deterministic:
+        payload["temperature"] = 0
+        payload["seed"] = DETERMINISTIC_SEED
+    return payload
+
+
+def _result(data: Dict[str, Any], payload: Dict[str, Any], text: str, latency: float, entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    usage = dict(data.get("usage", {}))
+    usage["cached"] = entry is not None
+    if entry is not None:
+        usage["original_latency_s"] = entry.get("latency_s")
+    model_used = data.get("model", payload["model"]) or payload["model"]
+
+    return {
+        "text": text,
+        "model": model_used,
+        "usage": usage,
+        "latency_s": round(latency, 3),
+        "cached": entry is not None,
+        "raw": data,
+    }
+
+
+def generate(
+    system: str,
+    user: str,
+    *,
+    model: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+    deterministic: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Return dict with keys: text, model, usage, latency_s, cached.
+
+    Params may include: temperature, max_tokens, frequency_penalty, presence_penalty, top_p (optional).
+    use_cache=False always calls the API (e.g. Regenerate); the new response still
+    replaces the cached one. deterministic defaults to LLM_DETERMINISTIC.
+    latency_s is the time this call took (the cache lookup on a hit); usage gets
+    "cached" and, on a hit, the "original_latency_s" of the API call it replays.
+    """
+    payload = _build_payload(system, user, model, params, deterministic)
 
-    # One retry with simple backoff
     t0 = time.time()
-    try:
-        data = _request(payload)
-    except Exception as e:
-        time.sleep(0.8)
-        data = _request(payload)
+    key = request_key(payload) if CACHE_ENABLED else None
+    entry = RESPONSE_CACHE.get(key) if key and use_cache else None
+    if entry is not None:
+        data = entry["data"]
+    else:
+        # One retry with simple backoff
+        try:
+            data = _request(payload)
+        except Exception as e:
+            time.sleep(0.8)
+            data = _request(payload)
     latency = time.time() - t0
 
     # Extract first choice
@@ -151,13 +245,85 @@ def generate(system: str, user: str, *, model: Optional[str] = None, params: Opt
     except Exception as e:
         raise LLMError(f"Malformed LLM response: {data}")
 
-    usage = data.get("usage", {})
-    model_used = data.get("model", payload["model"]) or payload["model"]
+    if key and entry is None:
+        RESPONSE_CACHE.put(key, data, round(latency, 3))
 
-    return {
-        "text": text,
-        "model": model_used,
-        "usage": usage,
-        "latency_s": round(latency, 3),
-        "raw": data,
-    }
+    return _result(data, payload, text, latency, entry)
+
+
+class GenerationStream:
+    """Iterate for the text of a completion as it arrives; then .result holds what
+    generate() would have returned (plus first_token_s, the time to the first text).
+
+    A cached response is yielded in one piece. The complete response is cached like
+    generate()'s, so either function can replay it.
+    """
+
+    def __init__(self, payload: Dict[str, Any], use_cache: bool = True):
+        self.payload = payload
+        self.use_cache = use_cache
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        payload = self.payload
+        t0 = time.time()
+        key = request_key(payload) if CACHE_ENABLED else None
+        entry = RESPONSE_CACHE.get(key) if key and self.use_cache else None
+        if entry is not None:
+            data = entry["data"]
+            try:
+                text = data["choices"][0]["message"]["content"].strip()
+            except Exception:
+                raise LLMError(f"Malformed LLM response: {data}")
+            first_token = time.time() - t0
+            yield text
+        else:
+            # One retry with simple backoff, as long as nothing was received yet
+            try:
+                resp = _open_stream(payload)
+            except Exception:
+                time.sleep(0.8)
+                resp = _open_stream(payload)
+            parts, model_used, usage, first_token = [], None, {}, None
+            with resp:
+                for event in _sse_events(resp):
+                    model_used = event.get("model") or model_used
+                    usage = event.get("usage") or usage
+                    for choice in event.get("choices") or []:
+                        token = (choice.get("delta") or {}).get("content")
+                        if not token:
+                            continue
+                        if not parts:
+                            first_token = time.time() - t0
+                            # Leading whitespace is dropped, as generate() strips it
+                            token = token.lstrip()
+                            if not token:
+                                continue
+                        parts.append(token)
+                        yield token
+            text = "".join(parts).strip()
+            data = {
+                "model": model_used or payload["model"],
+                "choices": [{"message": {"role": "assistant", "content": text}}],
+                "usage": usage,
+            }
+        latency = time.time() - t0
+
+        if key and entry is None:
+            RESPONSE_CACHE.put(key, data, round(latency, 3))
+        self.result = _result(data, payload, text, latency, entry)
+        self.result["first_token_s"] = round(first_token if first_token is not None else latency, 3)
+
+
+def generate_stream(
+    system: str,
+    user: str,
+    *,
+    model: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+    deterministic: Optional[bool] = None,
+) -> GenerationStream:
+    """Like generate(), but returns a GenerationStream to iterate over the text as it
+    arrives (e.g. with st.write_stream); its .result is set once it is exhausted."""
+    return GenerationStream(_build_payload(system, user, model, params, deterministic), use_cache=use_cache)
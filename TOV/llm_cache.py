@@ -0,0 +1,96 @@
+"""
+llm_cache.py — content-addressed cache of chat-completion responses for llm.generate.
+
+A response is stored under the sha256 of its normalized request (model, messages,
+sampling params), one JSON file per entry in the cache directory:
+
+  <dir>/<sha256>.json   {"created": epoch, "latency_s": float, "data": <API response>}
+
+Entries expire after ttl_s seconds. Beyond max_entries the least recently used ones
+are deleted; a hit touches the file, so the order survives restarts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    """sha256 of the request; whitespace around messages and line endings do not matter."""
+    messages = [
+        {"role": m.get("role"), "content": str(m.get("content", "")).replace("\r\n", "\n").strip()}
+        for m in payload.get("messages", [])
+    ]
+    params = {k: v for k, v in payload.items() if k not in ("messages", "stream")}
+    text = json.dumps({"messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Responses by request key, on disk, with a TTL and an LRU bound on the entry count."""
+
+    def __init__(self, directory: Path, ttl_s: float = 86400, max_entries: int = 256):
+        self.directory = Path(directory)
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._order: Optional[OrderedDict] = None  # key -> None, least recently used first
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _entries(self) -> OrderedDict:
+        # Read the directory once; afterwards the order is kept in memory
+        if self._order is None:
+            files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime_ns) if self.directory.is_dir() else []
+            self._order = OrderedDict((p.stem, None) for p in files)
+        return self._order
+
+    def _drop(self, key: str) -> None:
+        self._entries().pop(key, None)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored entry for key, or None if missing or expired."""
+        with self._lock:
+            if key not in self._entries():
+                return None
+            path = self._path(key)
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._drop(key)
+                return None
+            if time.time() - entry.get("created", 0) > self.ttl_s:
+                self._drop(key)
+                return None
+            self._entries().move_to_end(key)
+            os.utime(path)
+            return entry
+
+    def put(self, key: str, data: Dict[str, Any], latency_s: float) -> None:
+        entry = {"created": time.time(), "latency_s": latency_s, "data": data}
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self._path(key))
+            order = self._entries()
+            order[key] = None
+            order.move_to_end(key)
+            while len(order) > self.max_entries:
+                self._drop(next(iter(order)))
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries()):
+                self._drop(key)
@@ -1,7 +1,23 @@
 """
 storage.py — lightweight JSON storage with export/import for the Streamlit LLM Copy POC.
 
-No external deps. Single file persistence with a clear, documented schema.
+No external deps. A JSON snapshot plus an append-only journal, with a clear, documented schema.
+
+Files:
+  data.json             snapshot of the state below; rewritten only on compaction
+  data.journal.jsonl    one change per line, appended on every save and replayed on
+                        top of the snapshot when loading. The first line names the
+                        snapshot it belongs to ({"op": "journal", "id": journal_id}).
+
+Saving a generation or a like appends one line, so its cost does not grow with the
+history. Once the journal holds COMPACT_AFTER changes it is folded into a new
+snapshot. Loaded states are kept per process and only read the lines appended since.
+
+Several processes may share the files. Appends and compactions hold an exclusive
+lock on data.lock, and a save first applies whatever others appended since, so no
+change is lost. Guidelines and product description updates can name the version
+they were made from; if someone else saved one in between, ConflictError is raised
+instead of overwriting it. store_version() tells cheaply whether anything changed.
 
 Schema (v1):
 {
@@ -23,9 +39,20 @@ Schema (v1):
           ]
       }
   },
-  "current_project": str
+  "current_project": str,
+  "journal_id": str|null        # id of the journal holding the changes since
 }
 
+Journal entries (each can be applied twice without changing the result):
+  {"op": "set", "key": "guidelines"|"product_description"|"current_project", "value": ...,
+   "expected": int}                                         optional: version it replaces
+  {"op": "project", "name": str}                            create if missing
+  {"op": "put_project", "name": str, "project": {...}}      import
+  {"op": "rename", "old": str, "new": str}
+  {"op": "delete", "name": str}
+  {"op": "add", "project": str, "gen": {...}}
+  {"op": "like", "project": str, "id": str, "liked": bool}
+
 Export format (v1):
 {
   "type": "project_export",
@@ -38,14 +65,24 @@ Export format (v1):
 """
 from __future__ import annotations
 
+import bisect
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 import uuid
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; only this process' writers are serialized
+    fcntl = None
+
 DATA_PATH = Path("data.json")
 SCHEMA_VERSION = 1
+# Journal entries after which persist() folds the journal into a new snapshot
+COMPACT_AFTER = 500
 
 # -------------------------
 # Helpers
@@ -55,62 +92,417 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _default_state() -> Dict[str, Any]:
+class ConflictError(RuntimeError):
+    """A versioned value was saved by someone else since it was read."""
+
+    def __init__(self, key: str, expected: int, actual: int):
+        super().__init__(f"{key} was changed by someone else (version {expected} -> {actual})")
+        self.key = key
+        self.expected = expected
+        self.actual = actual
+
+
+class State(dict):
+    """The state dict, plus the bookkeeping of the journal it was loaded from.
+
+    pending: changes made since it was loaded or persisted
+    index:   project -> _ProjectIndex of its generations
+    offset:  bytes of the journal applied; entries: journal entries since the snapshot
+    stale_journal: the journal belongs to an older snapshot; the next save compacts
+    """
+
+    def __init__(self, data=()):
+        super().__init__(data)
+        self.pending: List[Dict[str, Any]] = []
+        self.offset = 0
+        self.entries = 0
+        self.stale_journal = False
+        self.snapshot: Optional[Tuple[int, int, int]] = None
+        self.index = _build_index(self)
+
+
+class _ProjectIndex:
+    """One project's generations by id and by position, plus the positions of the
+    liked ones in ascending order. Appends and likes keep it up to date."""
+
+    def __init__(self, generations: List[Dict[str, Any]]):
+        self.generations = generations
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.position: Dict[str, int] = {}
+        self.liked: List[int] = []
+        for i, g in enumerate(generations):
+            self.by_id[g.get("id")] = g
+            self.position[g.get("id")] = i
+            if g.get("liked"):
+                self.liked.append(i)
+
+    def append(self, gen: Dict[str, Any]) -> None:
+        self.generations.append(gen)
+        i = len(self.generations) - 1
+        self.by_id[gen["id"]] = gen
+        self.position[gen["id"]] = i
+        if gen.get("liked"):
+            self.liked.append(i)
+
+    def set_liked(self, gen_id: str, liked: bool) -> None:
+        gen = self.by_id.get(gen_id)
+        if gen is None:
+            return
+        gen["liked"] = liked
+        i = self.position[gen_id]
+        k = bisect.bisect_left(self.liked, i)
+        present = k < len(self.liked) and self.liked[k] == i
+        if liked and not present:
+            self.liked.insert(k, i)
+        elif not liked and present:
+            del self.liked[k]
+
+
+def _build_index(state: Dict[str, Any]) -> Dict[str, _ProjectIndex]:
     return {
+        name: _ProjectIndex(project.setdefault("generations", []))
+        for name, project in state.get("projects", {}).items()
+    }
+
+
+def _index(state: Dict[str, Any]) -> Dict[str, _ProjectIndex]:
+    # Plain dicts (not loaded through this module) get a throwaway index
+    return state.index if isinstance(state, State) else _build_index(state)
+
+
+def _default_state() -> Dict[str, Any]:
+    return State({
         "schema_version": SCHEMA_VERSION,
         "guidelines": {"content": "", "version": 0, "updated_at": _now_iso()},
         "product_description": {"content": "", "version": 0, "updated_at": _now_iso()},
         "projects": {"Default": {"generations": []}},
         "current_project": "Default",
-    }
+    })
+
+
+# -------------------------
+# Journal
+# -------------------------
+
+def _apply(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Apply one journal entry to state; applying it twice gives the same result."""
+    op = entry.get("op")
+    projects = state.setdefault("projects", {})
+    index = _index(state)
+    if op == "set":
+        state[entry["key"]] = entry["value"]
+    elif op == "project":
+        if entry["name"] not in projects:
+            projects[entry["name"]] = {"generations": []}
+            index[entry["name"]] = _ProjectIndex(projects[entry["name"]]["generations"])
+    elif op == "put_project":
+        projects[entry["name"]] = entry["project"]
+        index[entry["name"]] = _ProjectIndex(entry["project"].setdefault("generations", []))
+    elif op == "rename":
+        old, new = entry["old"], entry["new"]
+        if old in projects and new not in projects:
+            projects[new] = projects.pop(old)
+            index[new] = index.pop(old)
+            if state.get("current_project") == old:
+                state["current_project"] = new
+    elif op == "delete":
+        name = entry["name"]
+        if name in projects and len(projects) > 1:
+            projects.pop(name)
+            index.pop(name, None)
+            if state.get("current_project") == name:
+                state["current_project"] = next(iter(projects.keys()))
+    elif op == "add":
+        project, gen = entry["project"], entry["gen"]
+        if project not in projects:
+            projects[project] = {"generations": []}
+            index[project] = _ProjectIndex(projects[project]["generations"])
+        if gen["id"] not in index[project].by_id:
+            index[project].append(gen)
+    elif op == "like":
+        if entry["project"] in index:
+            index[entry["project"]].set_liked(entry["id"], bool(entry["liked"]))
+
+
+def _record(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Apply a change and queue it for the journal."""
+    with _LOCK:
+        _apply(state, entry)
+        if isinstance(state, State):
+            state.pending.append(entry)
+
+
+def journal_path(path: Path = DATA_PATH) -> Path:
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
+def _signature(path: Path) -> Tuple[int, int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _read_journal(state: State, path: Path, changed: Optional[set] = None) -> bool:
+    """Apply the journal lines appended since state.offset, adding the keys they set to
+    changed. False if the journal was replaced since (state must be reloaded)."""
+    journal = journal_path(path)
+    try:
+        size = journal.stat().st_size
+    except FileNotFoundError:
+        return state.offset == 0
+    if size < state.offset:
+        return False
+    if size == state.offset:
+        return True
+    with journal.open("rb") as f:
+        f.seek(state.offset)
+        data = f.read(size - state.offset)
+    # A line still being written is left for the next read
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if entry.get("op") == "journal":
+            if entry.get("id") != state.get("journal_id"):
+                # Left over from a compaction that did not finish; the snapshot has it all
+                state.offset = size
+                state.stale_journal = True
+                return True
+            continue
+        _apply(state, entry)
+        if changed is not None and entry.get("op") == "set":
+            changed.add(entry["key"])
+        state.entries += 1
+    state.offset += end
+    return True
 
 
 # -------------------------
 # Core load/save
 # -------------------------
 
+# Loaded states by resolved path; load_state only reads what was appended since
+_LOADED: Dict[str, State] = {}
+# Loaded states are shared by every session of the process
+_LOCK = threading.RLock()
+# Lock files this process holds, with how many times; flock would deadlock re-locking
+_HELD: Dict[str, int] = {}
+
+
+def lock_path(path: Path = DATA_PATH) -> Path:
+    return path.with_name(f"{path.stem}.lock")
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive lock on the store at path, across processes. Re-entrant."""
+    with _LOCK:
+        lock = lock_path(path)
+        key = str(lock.resolve())
+        held = _HELD.get(key, 0)
+        f = None
+        if fcntl is not None and not held:
+            f = lock.open("a")
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        _HELD[key] = held + 1
+        try:
+            yield
+        finally:
+            if held:
+                _HELD[key] = held
+            else:
+                del _HELD[key]
+            if f is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                f.close()
+
+
+def store_version(path: Path = DATA_PATH) -> Tuple[Any, ...]:
+    """Changes whenever anything is saved to the store at path; two stats, no reads."""
+    stamps = []
+    for p in (path, journal_path(path)):
+        try:
+            st = p.stat()
+            stamps.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        except FileNotFoundError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
 def ensure_store(path: Path = DATA_PATH) -> None:
     if not path.exists():
-        save_state(_default_state(), path)
+        with _file_lock(path):
+            if not path.exists():
+                save_state(_default_state(), path)
 
 
-def load_state(path: Path = DATA_PATH) -> Dict[str, Any]:
-    ensure_store(path)
+def _load(path: Path) -> State:
+    signature = _signature(path)
     with path.open("r", encoding="utf-8") as f:
-        state = json.load(f)
-    if state.get("schema_version") != SCHEMA_VERSION:
+        data = json.load(f)
+    if data.get("schema_version") != SCHEMA_VERSION:
         # For POC: naive forward-only handling — reset if incompatible
         # In production, add real migrations.
-        return _default_state()
+        state = _default_state()
+        state.snapshot = signature
+        return state
+    state = State(data)
+    state.snapshot = signature
+    _read_journal(state, path)
     return state
 
 
+def load_state(path: Path = DATA_PATH) -> Dict[str, Any]:
+    """Snapshot plus journal. The state is kept per process and shared by every caller;
+    later calls only apply the journal lines appended since, unless the snapshot was
+    replaced or the state has changes that were never persisted."""
+    with _LOCK:
+        ensure_store(path)
+        key = str(path.resolve())
+        state = _LOADED.get(key)
+        if (
+            state is None
+            or state.pending
+            or state.snapshot != _signature(path)
+            or not _read_journal(state, path)
+        ):
+            # Not while another process is compacting, or the two files may not match
+            with _file_lock(path):
+                state = _LOADED[key] = _load(path)
+        return state
+
+
 def save_state(state: Dict[str, Any], path: Path = DATA_PATH) -> None:
-    tmp = path.with_suffix(".tmp")
-    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp.replace(path)
+    """Write the full snapshot and start a new, empty journal for it (compaction)."""
+    with _file_lock(path):
+        journal_id = uuid.uuid4().hex
+        state["journal_id"] = journal_id
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(path)
+        # Until the journal is replaced too, its header names the old snapshot and is ignored
+        header = (json.dumps({"op": "journal", "id": journal_id}) + "\n").encode("utf-8")
+        journal = journal_path(path)
+        tmp = journal.with_suffix(".tmp")
+        tmp.write_bytes(header)
+        tmp.replace(journal)
+        if isinstance(state, State):
+            state.pending.clear()
+            state.offset = len(header)
+            state.entries = 0
+            state.stale_journal = False
+            state.snapshot = _signature(path)
+
+
+def _catch_up(state: State, path: Path) -> List[Dict[str, Any]]:
+    """Apply what others saved since state was read, then re-apply its pending changes
+    on top. Returns the pending updates dropped because their versioned value changed."""
+    pending, state.pending = state.pending, []
+    offset = state.offset
+    changed: Optional[set] = set()
+    if state.snapshot != _signature(path) or not _read_journal(state, path, changed):
+        # Compacted by someone else: start over from the files, checking versions
+        fresh = _load(path)
+        state.clear()
+        state.update(fresh)
+        state.__dict__.update(fresh.__dict__)
+        changed = None
+    elif state.offset == offset:
+        state.pending = pending
+        return []
+
+    conflicts = []
+    lost = set()
+    for entry in pending:
+        if "expected" in entry:
+            key = entry["key"]
+            if changed is None:
+                stale = int(state.get(key, {}).get("version", 0)) != entry["expected"]
+            else:
+                stale = key in changed
+            if stale or key in lost:
+                # Later updates of the key were based on this one
+                lost.add(key)
+                conflicts.append(entry)
+                continue
+        _apply(state, entry)
+        state.pending.append(entry)
+    return conflicts
+
+
+def persist(state: Dict[str, Any], path: Path = DATA_PATH) -> Dict[str, Any]:
+    """Save the changes made to state since it was loaded or last persisted.
+
+    Changes others saved in the meantime are applied to state first. The pending ones
+    are then appended to the journal as one write; the journal is compacted into a new
+    snapshot once it holds COMPACT_AFTER entries. Raises ConflictError (after saving
+    the rest) if a versioned update lost to one saved by someone else.
+    """
+    with _file_lock(path):
+        if not isinstance(state, State):
+            save_state(state, path)
+            return state
+        conflicts = _catch_up(state, path)
+        if state.stale_journal or not journal_path(path).exists():
+            save_state(state, path)
+        if state.pending:
+            lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in state.pending)
+            with journal_path(path).open("ab") as f:
+                start = f.tell()
+                f.write(lines.encode("utf-8"))
+                end = f.tell()
+            if state.offset == start:
+                # Nothing else was appended in between; no need to read our own lines back
+                state.offset = end
+            state.entries += len(state.pending)
+            state.pending.clear()
+        if state.entries >= COMPACT_AFTER:
+            save_state(state, path)
+    if conflicts:
+        key = conflicts[0]["key"]
+        raise ConflictError(key, conflicts[0]["expected"], int(state.get(key, {}).get("version", 0)))
+    return state
 
 
 # -------------------------
 # Guidelines
 # -------------------------
 
+def _update_versioned(state: Dict[str, Any], updates: Dict[str, Tuple[str, Optional[int]]]) -> Dict[str, Any]:
+    """Set each key to its (content, expected_version), bumping versions that change.
+    Every expected version is checked before anything is recorded, so a ConflictError
+    leaves state and its pending changes as they were."""
+    with _LOCK:
+        for key, (content, expected_version) in updates.items():
+            version = int(state.get(key, {}).get("version", 0))
+            if expected_version is not None and int(expected_version) != version:
+                raise ConflictError(key, int(expected_version), version)
+        for key, (content, expected_version) in updates.items():
+            cur = state.get(key, {})
+            if content.strip() == cur.get("content", "").strip():
+                continue
+            version = int(cur.get("version", 0))
+            entry = {"op": "set", "key": key, "value": {
+                "content": content,
+                "version": version + 1,
+                "updated_at": _now_iso(),
+            }}
+            if expected_version is not None:
+                entry["expected"] = version
+            _record(state, entry)
+    return state
+
+
 def get_guidelines(state: Dict[str, Any]) -> Tuple[str, int, str]:
     g = state.get("guidelines", {})
     return g.get("content", ""), int(g.get("version", 0)), g.get("updated_at", _now_iso())
 
 
-def update_guidelines(state: Dict[str, Any], content: str) -> Dict[str, Any]:
-    # Bump version if content changes
-    cur = state.get("guidelines", {})
-    if content.strip() != cur.get("content", "").strip():
-        new_version = int(cur.get("version", 0)) + 1
-        state["guidelines"] = {
-            "content": content,
-            "version": new_version,
-            "updated_at": _now_iso(),
-        }
-    return state
+def update_guidelines(state: Dict[str, Any], content: str, expected_version: Optional[int] = None) -> Dict[str, Any]:
+    """Set the content, bumping the version if it changes. With expected_version (the
+    version the edit started from), raises ConflictError here or on persist if someone
+    else saved a newer one."""
+    return _update_versioned(state, {"guidelines": (content, expected_version)})
 
 
 def get_product_description(state: Dict[str, Any]) -> Tuple[str, int, str]:
@@ -118,17 +510,24 @@ def get_product_description(state: Dict[str, Any]) -> Tuple[str, int, str]:
     return pd.get("content", ""), int(pd.get("version", 0)), pd.get("updated_at", _now_iso())
 
 
-def update_product_description(state: Dict[str, Any], content: str) -> Dict[str, Any]:
-    # Bump version if content changes
-    cur = state.get("product_description", {})
-    if content.strip() != cur.get("content", "").strip():
-        new_version = int(cur.get("version", 0)) + 1
-        state["product_description"] = {
-            "content": content,
-            "version": new_version,
-            "updated_at": _now_iso(),
-        }
-    return state
+def update_product_description(state: Dict[str, Any], content: str, expected_version: Optional[int] = None) -> Dict[str, Any]:
+    """Like update_guidelines, for the product description."""
+    return _update_versioned(state, {"product_description": (content, expected_version)})
+
+
+def update_guidelines_and_product_description(
+    state: Dict[str, Any],
+    guidelines: str,
+    product_description: str,
+    guidelines_version: Optional[int] = None,
+    product_description_version: Optional[int] = None,
+) -> Dict[str, Any]:
+    """update_guidelines and update_product_description in one step: if either expected
+    version is stale, ConflictError is raised before anything changes."""
+    return _update_versioned(state, {
+        "guidelines": (guidelines, guidelines_version),
+        "product_description": (product_description, product_description_version),
+    })
 
 
 # -------------------------
@@ -140,9 +539,8 @@ def list_projects(state: Dict[str, Any]) -> List[str]:
 
 
 def ensure_project(state: Dict[str, Any], name: str) -> Dict[str, Any]:
-    state.setdefault("projects", {})
-    if name not in state["projects"]:
-        state["projects"][name] = {"generations": []}
+    if name not in state.get("projects", {}):
+        _record(state, {"op": "project", "name": name})
     return state
 
 
@@ -150,7 +548,7 @@ def create_project(state: Dict[str, Any], name: str, switch: bool = True) -> Dic
     name = name.strip() or "Untitled"
     ensure_project(state, name)
     if switch:
-        state["current_project"] = name
+        set_current_project(state, name)
     return state
 
 
@@ -161,18 +559,14 @@ def rename_project(state: Dict[str, Any], old: str, new: str) -> Dict[str, Any]:
     if new in state["projects"]:
         # refuse overwrite for POC
         return state
-    state["projects"][new] = state["projects"].pop(old)
-    if state.get("current_project") == old:
-        state["current_project"] = new
+    _record(state, {"op": "rename", "old": old, "new": new})
     return state
 
 
 def delete_project(state: Dict[str, Any], name: str) -> Dict[str, Any]:
     # POC safety: do not allow deleting the last project
     if name in state.get("projects", {}) and len(state["projects"]) > 1:
-        state["projects"].pop(name, None)
-        if state.get("current_project") == name:
-            state["current_project"] = next(iter(state["projects"].keys()))
+        _record(state, {"op": "delete", "name": name})
     return state
 
 
@@ -186,8 +580,8 @@ def get_current_project(state: Dict[str, Any]) -> str:
 
 
 def set_current_project(state: Dict[str, Any], name: str) -> Dict[str, Any]:
-    if name in state.get("projects", {}):
-        state["current_project"] = name
+    if name in state.get("projects", {}) and name != state.get("current_project"):
+        _record(state, {"op": "set", "key": "current_project", "value": name})
     return state
 
 
@@ -213,7 +607,6 @@ def add_generation(
 ) -> Dict[str, Any]:
     if project is None:
         project = get_current_project(state)
-    ensure_project(state, project)
     gen = {
         "id": str(uuid.uuid4()),
         "source": source or "",
@@ -224,44 +617,84 @@ def add_generation(
         "liked": False,
         "ts": _now_iso(),
     }
-    _project_ref(state, project).setdefault("generations", []).append(gen)
+    _record(state, {"op": "add", "project": project, "gen": gen})
     return state
 
 
+def _project_index(state: Dict[str, Any], project: Optional[str]) -> Optional[_ProjectIndex]:
+    if project is None:
+        project = get_current_project(state)
+    return _index(state).get(project)
+
+
 def list_generations(state: Dict[str, Any], project: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Copy of every generation, oldest first; page_generations reads one page instead."""
     if project is None:
         project = get_current_project(state)
     return list(_project_ref(state, project).get("generations", []))
 
 
+def count_generations(state: Dict[str, Any], project: Optional[str] = None, *, liked_only: bool = False) -> int:
+    idx = _project_index(state, project)
+    if idx is None:
+        return 0
+    return len(idx.liked) if liked_only else len(idx.generations)
+
+
+def page_generations(
+    state: Dict[str, Any],
+    project: Optional[str] = None,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    liked_only: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of generations, newest first.
+
+    cursor is the id of the last generation of the previous page (None, or an id that
+    no longer exists, gives the first page). Returns (generations, next_cursor), where
+    next_cursor is None on the last page.
+    """
+    idx = _project_index(state, project)
+    if idx is None:
+        return [], None
+    # Page taken from positions [start, end) of the generations, or of the liked positions
+    end = len(idx.liked) if liked_only else len(idx.generations)
+    if cursor in idx.position:
+        pos = idx.position[cursor]
+        end = bisect.bisect_left(idx.liked, pos) if liked_only else pos
+    start = max(0, end - limit)
+    if liked_only:
+        page = [idx.generations[i] for i in reversed(idx.liked[start:end])]
+    else:
+        page = idx.generations[start:end][::-1]
+    next_cursor = page[-1].get("id") if start > 0 and page else None
+    return page, next_cursor
+
+
 def get_generation(state: Dict[str, Any], gen_id: str, project: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    gens = list_generations(state, project)
-    for g in gens:
-        if g.get("id") == gen_id:
-            return g
-    return None
+    idx = _project_index(state, project)
+    return idx.by_id.get(gen_id) if idx is not None else None
 
 
 def set_like(state: Dict[str, Any], gen_id: str, liked: bool, project: Optional[str] = None) -> Dict[str, Any]:
     if project is None:
         project = get_current_project(state)
-    gens = _project_ref(state, project).get("generations", [])
-    for g in gens:
-        if g.get("id") == gen_id:
-            g["liked"] = bool(liked)
-            break
+    if get_generation(state, gen_id, project) is not None:
+        _record(state, {"op": "like", "project": project, "id": gen_id, "liked": bool(liked)})
     return state
 
 
 def toggle_like(state: Dict[str, Any], gen_id: str, project: Optional[str] = None) -> Dict[str, Any]:
     g = get_generation(state, gen_id, project)
     if g is not None:
-        g["liked"] = not bool(g.get("liked", False))
+        set_like(state, gen_id, not bool(g.get("liked", False)), project)
     return state
 
 
 def list_liked(state: Dict[str, Any], project: Optional[str] = None) -> List[Dict[str, Any]]:
-    return [g for g in list_generations(state, project) if g.get("liked")]
+    idx = _project_index(state, project)
+    return [idx.generations[i] for i in idx.liked] if idx is not None else []
 
 
 # -------------------------
@@ -328,8 +761,7 @@ def import_project_from_dict(state: Dict[str, Any], data: Dict[str, Any], *, ren
             "liked": bool(g.get("liked", False)),
             "ts": g.get("ts", _now_iso()),
         })
-    ensure_project(state, name)
-    state["projects"][name] = project_block
+    _record(state, {"op": "put_project", "name": name, "project": project_block})
     return state, name
 
 
@@ -343,5 +775,5 @@ def import_project_from_file(state: Dict[str, Any], filepath: Path, *, rename_on
 # -------------------------
 
 def persist_and_return(state: Dict[str, Any], path: Path = DATA_PATH) -> Dict[str, Any]:
-    save_state(state, path)
-    return load_state(path)
+    # state is already up to date, so it is returned as is instead of being read back
+    return persist(state, path)
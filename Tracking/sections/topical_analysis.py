@@ -3,8 +3,7 @@ import pandas as pd
 from utils.file_io import load_agility_data
 from utils.date_utils import get_selected_date_range
 from utils.config import BRANDS
-
-TOPIC_COLUMNS = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
+from utils.topics import TOPIC_COLUMNS, count_topics, top_topics
 
 def render() -> None:
     """
@@ -44,11 +43,13 @@ def render() -> None:
         [f"🏢 {brand} ({brand_counts.get(brand, 0)})" for brand in BRANDS]
     )
 
+    # Top 5 per brand and overall in one pass over the Topic x brand matrix
+    top = top_topics(count_topics(company_data), k=5)
+
     # Tab 0: Combined
     with tabs[0]:
         st.markdown("**Top topics across all brands.**")
-        combined_counts = extract_topics(company_data)
-        display_top_topics(combined_counts)
+        display_top_topics(top["All"])
 
     # Per-brand tabs
     for i, brand in enumerate(BRANDS, start=1):
@@ -57,35 +58,21 @@ def render() -> None:
                 st.info(f"No topic data for {brand}.")
                 continue
             st.markdown(f"**Top topics for {brand}**")
-            brand_counts = extract_topics({brand: company_data[brand]})
-            display_top_topics(brand_counts)
+            display_top_topics(top[brand])
 
 
-def extract_topics(dataframes_dict: dict) -> dict:
-    """
-    Extract and count topic mentions from cluster columns.
-    """
-    topic_counts = {}
-    for df in dataframes_dict.values():
-        for col in TOPIC_COLUMNS:
-            for topic in df[col].dropna():
-                topic = str(topic).strip()
-                if topic:
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
-    return topic_counts
-
-def display_top_topics(topic_counts: dict) -> None:
+def display_top_topics(topic_summary: dict) -> None:
     """
     Show the top 5 topics in a block format.
+    topic_summary: one entry of utils.topics.top_topics()
     """
-    if not topic_counts:
+    if not topic_summary["top"]:
         st.info("No topics found.")
         return
 
-    total = sum(topic_counts.values())
-    top_5 = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    total = topic_summary["total"]
 
-    for topic, count in top_5:
+    for topic, count in topic_summary["top"]:
         pct = (count / total) * 100 if total > 0 else 0
         st.markdown(
             f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; '
@@ -1,13 +1,14 @@
 import os
 import pandas as pd
 import streamlit as st
+from utils.frame_cache import cached_frames
 
 DATA_ROOT = "Tracking/data"
 
 # ------------------------
 # 📄 Load Agility (News)
 # ------------------------
-@st.cache_data
+@cached_frames
 def load_agility_data(company_name: str):
     path = os.path.join(DATA_ROOT, "agility", f"{company_name.lower()}_agility.xlsx")
     if not os.path.exists(path):
@@ -22,7 +23,7 @@ def load_agility_data(company_name: str):
 # 📱 Load Social Media Data
 # ------------------------
 
-@st.cache_data
+@cached_frames
 def load_social_data(company_name: str, platform: str):
     """Load Facebook or LinkedIn file for a company, normalize date format."""
     platform = platform.lower()
@@ -0,0 +1,129 @@
+# utils/frame_cache.py
+import functools
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# How loaders decorated with cached_frames keep their results (read-only in both):
+# - "data":     st.cache_data; every call unpickles a private copy (default)
+# - "resource": st.cache_resource; one copy per process shared by every session,
+#               callers get shallow copies so adding columns stays local
+FRAME_CACHE_MODE = os.environ.get("FRAME_CACHE_MODE", "data")
+
+# In "resource" mode, hash the shared frames on every cache hit and reload them
+# if a section changed them in place. Costs a full pass over the data; debug only.
+FRAME_CACHE_GUARD = os.environ.get("FRAME_CACHE_GUARD", "0") == "1"
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with its columns marked read-only.
+
+    Cached frames are shared across sections; an in-place write (``df.loc[...] = x``)
+    must not change what the next section sees. Adding or replacing whole columns,
+    filtering and ``.assign`` still work as usual.
+
+    numpy columns and extension arrays kept in numpy buffers (python-backed ``str``,
+    nullable ints, categoricals, tz-aware datetimes) get read-only buffers, so writes
+    raise. Arrow-backed arrays (``str`` in pandas 3 with pyarrow) cannot be marked
+    read-only: pandas writes to them by swapping the array's data, so the frozen frame
+    gets its own array around the same buffers and a write only changes that frame.
+    In "resource" mode, FRAME_CACHE_GUARD catches anything else.
+    """
+    if df is None:
+        return None
+    columns = {}
+    for i, c in enumerate(df.columns):
+        values = df.iloc[:, i]
+        if isinstance(values.dtype, np.dtype):
+            arr = values.to_numpy()
+            arr.flags.writeable = False
+            columns[i] = arr
+            continue
+        array = values.array
+        if hasattr(array, "_pa_array"):
+            # Shallow: the Arrow buffers are shared, the array object is not
+            array = array.copy()
+        else:
+            for name in ("_ndarray", "_data", "_mask", "_codes"):
+                buffer = getattr(array, name, None)
+                if isinstance(buffer, np.ndarray):
+                    buffer.flags.writeable = False
+        columns[i] = array
+    frozen = pd.DataFrame(columns, index=df.index, copy=False)
+    frozen.columns = df.columns
+    frozen.attrs = dict(df.attrs)
+    return frozen
+
+
+def _map_frames(value, func):
+    """Apply func to every DataFrame in value (a frame, or a dict/tuple/list holding frames)."""
+    if isinstance(value, pd.DataFrame):
+        return func(value)
+    if isinstance(value, dict):
+        return {k: _map_frames(v, func) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(_map_frames(v, func) for v in value)
+    return value
+
+
+def _fingerprint(value) -> tuple:
+    parts = []
+
+    def add(df):
+        hashes = []
+        for i in range(df.shape[1]):
+            try:
+                hashes.append(int(pd.util.hash_pandas_object(df.iloc[:, i], index=False).sum()))
+            except TypeError:
+                # Unhashable cells (lists, dicts); only shape and columns are checked
+                hashes.append(None)
+        parts.append((df.shape, tuple(str(c) for c in df.columns), tuple(hashes)))
+        return df
+
+    _map_frames(value, add)
+    return tuple(parts)
+
+
+def cached_frames(func=None, *, ttl=None, max_entries=None, show_spinner=True):
+    """Cache a loader that returns DataFrames, honouring FRAME_CACHE_MODE.
+
+    Use like ``@st.cache_data``. The loader may return a DataFrame, None, or a
+    dict/tuple/list containing DataFrames, which callers get read-only (see freeze).
+    ``.clear()`` is available in both modes.
+    """
+    if func is None:
+        return lambda f: cached_frames(f, ttl=ttl, max_entries=max_entries, show_spinner=show_spinner)
+
+    if FRAME_CACHE_MODE != "resource":
+        cached_data = st.cache_data(func, ttl=ttl, max_entries=max_entries, show_spinner=show_spinner)
+
+        @functools.wraps(func)
+        def frozen(*args, **kwargs):
+            # The unpickled copy is this caller's own; freezing it only flips flags
+            return _map_frames(cached_data(*args, **kwargs), freeze)
+
+        frozen.clear = cached_data.clear
+        return frozen
+
+    @functools.wraps(func)
+    def load(*args, **kwargs):
+        value = _map_frames(func(*args, **kwargs), freeze)
+        return value, (_fingerprint(value) if FRAME_CACHE_GUARD else None)
+
+    def validate(entry) -> bool:
+        value, fingerprint = entry
+        if fingerprint is None or _fingerprint(value) == fingerprint:
+            return True
+        st.warning(f"[Cache] Cached result of {func.__name__} was modified in place by a section; reloading it.")
+        return False
+
+    cached = st.cache_resource(load, ttl=ttl, max_entries=max_entries, show_spinner=show_spinner, validate=validate)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        value, _ = cached(*args, **kwargs)
+        return _map_frames(value, lambda df: df.copy(deep=False))
+
+    wrapper.clear = cached.clear
+    return wrapper
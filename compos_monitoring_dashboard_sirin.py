@@ -8,6 +8,37 @@ import re
 from datetime import datetime, timedelta
 
 
+def lazy_tabs(labels, key, render):
+    """st.tabs where only the selected tab runs render(index, label).
+
+    Selecting a tab reruns the script; Streamlit versions without tab state render every tab.
+    """
+    labels = list(labels)
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        tabs = st.tabs(labels)
+    for i, (tab, label) in enumerate(zip(tabs, labels)):
+        if getattr(tab, "open", True) is False:
+            continue
+        with tab:
+            render(i, label)
+
+
+def place_labels(y, height, offset=0.0):
+    """y position of each label, at least height apart from every other one.
+
+    Labels are swept from the top down; each sits offset below its point, or just
+    below the previous label if that is lower. A NaN y stays NaN.
+    """
+    positions = np.asarray(y, dtype=float) - offset
+    lowest = np.inf
+    valid = np.flatnonzero(~np.isnan(positions))
+    for i in valid[np.argsort(-positions[valid], kind="stable")]:
+        positions[i] = lowest = min(positions[i], lowest - height)
+    return positions
+
+
 
 
 # Folder containing data files
@@ -157,23 +188,15 @@ fig.update_traces(
     marker=dict(size=10, color="blue")
 )
 
-# Avoid text overlap: Calculate dynamic Y-positions
-y_positions = []
+# Avoid text overlap: place every label below its point, then add them in one batch
 min_y_distance = 0.03 * summary_df["Quality"].max()  # Dynamic adjustment factor
+y_positions = place_labels(summary_df["Quality"], min_y_distance, offset=min_y_distance)
 
-for i, row in summary_df.iterrows():
-    y_pos = row["Quality"] - min_y_distance  # Default position (below point)
-    
-    # If another label is too close, shift the new one further down
-    while any(abs(y_pos - prev_y) < min_y_distance for prev_y in y_positions):
-        y_pos -= min_y_distance  # Move text further down
-
-    y_positions.append(y_pos)  # Store adjusted position
-
-    fig.add_annotation(
-        x=row["Volume"],
+fig.update_layout(annotations=[
+    dict(
+        x=volume,
         y=y_pos,
-        text=f"<b>{row['Company']}</b><br>{row['Archetypes']}",  # ✅ Add company name
+        text=f"<b>{company}</b><br>{archetypes}",  # ✅ Add company name
         showarrow=False,
         font=dict(size=8, color="black"),
         align="center",
@@ -184,6 +207,10 @@ for i, row in summary_df.iterrows():
         borderpad=2,
         bgcolor="white",
     )
+    for volume, y_pos, company, archetypes in zip(
+        summary_df["Volume"], y_positions, summary_df["Company"], summary_df["Archetypes"]
+    )
+])
 
 
 # Improve layout to prevent overlapping text
@@ -256,37 +283,29 @@ st.subheader("Key Topics")
 st.markdown("Key topics reflect main themes across all of the communicating companies:")
 
 # Function to compute topic counts and return top 5 topics
+TOPIC_COLUMNS = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
+
 def get_top_topics(dataframes_dict):
-    topic_counts = {
-        "Cluster_Topic1": {},
-        "Cluster_Topic2": {},
-        "Cluster_Topic3": {}
-    }
-
-    for company, df in dataframes_dict.items():
-        if all(col in df.columns for col in topic_counts.keys()):
-            for column in topic_counts:
-                for topic in df[column].dropna():
-                    topic_counts[column][topic] = topic_counts[column].get(topic, 0) + 1
-
-    all_topic_counts = {}
-    for column in topic_counts:
-        for topic, count in topic_counts[column].items():
-            all_topic_counts[topic] = all_topic_counts.get(topic, 0) + count
-
-    total_count = sum(all_topic_counts.values())
-    sorted_topics = sorted(all_topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-
-    topics_data = []
-    for topic, count in sorted_topics:
-        percentage = (count / total_count) * 100
-        topics_data.append({
-            "Topic Cluster": topic,
-            "Count": count,
-            "Percentage": round(percentage, 2)
-        })
-
-    return pd.DataFrame(topics_data)
+    frames = [
+        df[TOPIC_COLUMNS] for df in dataframes_dict.values()
+        if all(col in df.columns for col in TOPIC_COLUMNS)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=["Topic Cluster", "Count", "Percentage"])
+
+    # Stack every Cluster_Topic1, then every Cluster_Topic2, ... and count in one pass
+    stacked = pd.Series(pd.concat(frames, ignore_index=True).to_numpy(dtype=object).ravel(order="F")).dropna()
+    codes, uniques = pd.factorize(stacked)
+    counts = np.bincount(codes, minlength=len(uniques))
+
+    total_count = counts.sum()
+    top = np.argsort(-counts, kind="stable")[:5]
+
+    return pd.DataFrame({
+        "Topic Cluster": uniques.take(top),
+        "Count": counts[top],
+        "Percentage": [round((count / total_count) * 100, 2) for count in counts[top]]
+    })
 
 # Load all company data
 all_company_data = {}
@@ -299,14 +318,14 @@ for company, filename in keys_data.items():
     else:
         st.warning(f"File for {company} not found.")
 
-# Create tabs
+# Create tabs; topics are counted for the selected tab only
 tab_titles = ["🌍 Total"] + [f"🏢 {company}" for company in all_company_data.keys()]
-tabs = st.tabs(tab_titles)
+tab_companies = [None] + list(all_company_data.keys())
 
-# Render Total tab
-with tabs[0]:
-    total_df = get_top_topics(all_company_data)
-    for _, row in total_df.iterrows():
+def render_topics_tab(i, label):
+    company = tab_companies[i]
+    topics_df = get_top_topics(all_company_data if company is None else {company: all_company_data[company]})
+    for _, row in topics_df.iterrows():
         st.markdown(
             f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; padding: 5px; border-radius: 5px; margin-bottom: 5px;">'
             f'<div style="background-color: white; padding: 5px; border-radius: 5px; flex: 1;">{row["Topic Cluster"]}</div>'
@@ -315,18 +334,7 @@ with tabs[0]:
             unsafe_allow_html=True
         )
 
-# Render individual company tabs
-for idx, company in enumerate(all_company_data.keys(), start=1):
-    with tabs[idx]:
-        company_df = get_top_topics({company: all_company_data[company]})
-        for _, row in company_df.iterrows():
-            st.markdown(
-                f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; padding: 5px; border-radius: 5px; margin-bottom: 5px;">'
-                f'<div style="background-color: white; padding: 5px; border-radius: 5px; flex: 1;">{row["Topic Cluster"]}</div>'
-                f'<div style="background-color: lightgray; padding: 5px; border-radius: 5px; margin-left: 10px;">{row["Percentage"]}%</div>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
+lazy_tabs(tab_titles, "topics_tabs", render_topics_tab)
 
 
 st.subheader("📰 Media Mentions Coverage Share Last 6 Months")
@@ -353,12 +361,17 @@ for company, filename in keys_data.items():
 if non_organic_data:
     full_df = pd.concat(non_organic_data, ignore_index=True)
 
-    # Create tabs
-    tab_total, tab_lt, tab_lv, tab_ee = st.tabs(["🌍 Total", "🇱🇹 Lithuania", "🇱🇻 Latvia", "🇪🇪 Estonia"])
+    # Changes whenever one of the files is replaced; keys the memoized pies
+    mentions_version = tuple(
+        (filename, os.path.getmtime(os.path.join(DATA_FOLDER, filename)))
+        for filename in keys_data.values()
+        if os.path.exists(os.path.join(DATA_FOLDER, filename))
+    )
 
-    # Function to filter data and generate pie chart
-    def plot_mention_share(dataframe, title):
-        count_df = dataframe.groupby("Company").size().reset_index(name="Volume")
+    # Function to filter data and generate pie chart; built once per tab and data version
+    @st.cache_data(show_spinner=False)
+    def mention_share_figure(_dataframe, title, version):
+        count_df = _dataframe.groupby("Company").size().reset_index(name="Volume")
         total_mentions = count_df["Volume"].sum()
         count_df["Percentage"] = (count_df["Volume"] / total_mentions) * 100
 
@@ -380,20 +393,22 @@ if non_organic_data:
             textinfo="label+percent",
             hovertemplate="%{label}: %{value} articles (%{customdata[0]:.1f}%)"
         )
-        st.plotly_chart(fig_pie, use_container_width=True)
-
-
-    with tab_total:
-        plot_mention_share(full_df, "Total Share of Media Mentions Coverage")
-
-    with tab_lt:
-        plot_mention_share(full_df[full_df["Country"] == "Lithuania"], "Lithuania Media Mentions Coverage")
-
-    with tab_lv:
-        plot_mention_share(full_df[full_df["Country"] == "Latvia"], "Latvia Media Mentions Coverage")
-
-    with tab_ee:
-        plot_mention_share(full_df[full_df["Country"] == "Estonia"], "Estonia Media Mentions Coverage")
+        return fig_pie
+
+    # (tab label, country filter, chart title); only the selected tab is built
+    mention_tabs = [
+        ("🌍 Total", None, "Total Share of Media Mentions Coverage"),
+        ("🇱🇹 Lithuania", "Lithuania", "Lithuania Media Mentions Coverage"),
+        ("🇱🇻 Latvia", "Latvia", "Latvia Media Mentions Coverage"),
+        ("🇪🇪 Estonia", "Estonia", "Estonia Media Mentions Coverage"),
+    ]
+
+    def render_mentions_tab(i, label):
+        _, country, title = mention_tabs[i]
+        dataframe = full_df if country is None else full_df[full_df["Country"] == country]
+        st.plotly_chart(mention_share_figure(dataframe, title, mentions_version), use_container_width=True)
+
+    lazy_tabs([label for label, _, _ in mention_tabs], "mentions_tabs", render_mentions_tab)
 else:
     st.warning("No data loaded.")
 